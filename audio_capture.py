@@ -0,0 +1,157 @@
+"""
+Streaming Microphone Capture for Caroline's Voice Agent
+Records until the speaker pauses instead of for a fixed number of seconds.
+
+Audio arrives from a ``sounddevice.InputStream`` callback in short blocks.
+An energy-based voice activity detector decides which blocks contain
+speech: blocks before the first word go into a small ring buffer (the
+pre-roll, so the start of the first word isn't clipped), and the utterance
+ends once enough trailing silence has been seen. Blocks are handed to the
+caller as they arrive, so transcription can start the moment speech ends.
+"""
+
+import queue
+from collections import deque
+
+import numpy as np
+
+
+class EnergyVAD:
+    """
+    Voice activity detector based on block RMS energy.
+
+    The noise floor is learned from the first ``calibration_blocks`` and then
+    tracked on every non-speech block, so the detector adapts to the room.
+    A block is speech when its RMS exceeds both ``min_rms`` and
+    ``ratio`` times the noise floor.
+    """
+
+    def __init__(self, ratio: float = 3.0, min_rms: float = 0.01, calibration_blocks: int = 5,
+                 adaptation: float = 0.05):
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.calibration_blocks = calibration_blocks
+        self.adaptation = adaptation
+        self.noise_floor = None
+        self._calibration = []
+
+    @staticmethod
+    def rms(block: np.ndarray) -> float:
+        return float(np.sqrt(np.mean(np.square(block, dtype=np.float64))))
+
+    def is_speech(self, block: np.ndarray) -> bool:
+        energy = self.rms(block)
+        if self.noise_floor is None:
+            self._calibration.append(energy)
+            if len(self._calibration) >= self.calibration_blocks:
+                self.noise_floor = float(np.median(self._calibration))
+            return energy > self.min_rms * self.ratio
+
+        speech = energy > max(self.min_rms, self.noise_floor * self.ratio)
+        if not speech:
+            self.noise_floor += self.adaptation * (energy - self.noise_floor)
+        return speech
+
+
+def segment_utterance(blocks, vad, block_seconds: float, silence_seconds: float = 0.5,
+                      pre_roll_seconds: float = 0.3, max_seconds: float = 15.0,
+                      no_speech_timeout: float = 8.0, on_speech_start=None):
+    """
+    Yield the blocks of one utterance from an endless stream of blocks.
+
+    Nothing is yielded until speech starts; then the pre-roll and every
+    following block are yielded until ``silence_seconds`` of silence or
+    ``max_seconds`` of utterance. Gives up after ``no_speech_timeout``
+    seconds without speech.
+    """
+    pre_roll_blocks = round(pre_roll_seconds / block_seconds)
+    # No pre-roll at all keeps no buffer (a zero-length deque would still be a buffer to fill)
+    pre_roll = deque(maxlen=pre_roll_blocks) if pre_roll_blocks > 0 else None
+    silence_blocks = max(1, round(silence_seconds / block_seconds))
+    max_blocks = max(1, round(max_seconds / block_seconds))
+    timeout_blocks = max(1, round(no_speech_timeout / block_seconds))
+
+    waited = 0
+    for block in blocks:
+        if vad.is_speech(block):
+            break
+        if pre_roll is not None:
+            pre_roll.append(block)
+        waited += 1
+        if waited >= timeout_blocks:
+            return
+    else:
+        return
+
+    if on_speech_start is not None:
+        on_speech_start()
+    if pre_roll is not None:
+        yield from pre_roll
+    yield block
+
+    spoken = 1
+    trailing_silence = 0
+    for block in blocks:
+        yield block
+        spoken += 1
+        trailing_silence = 0 if vad.is_speech(block) else trailing_silence + 1
+        if trailing_silence >= silence_blocks or spoken >= max_blocks:
+            return
+
+
+class StreamingRecorder:
+    """Microphone capture that ends each utterance on silence."""
+
+    def __init__(self, sample_rate: int = 16000, block_ms: int = 30, silence_ms: int = 500,
+                 pre_roll_ms: int = 300, max_seconds: float = 15.0, no_speech_timeout: float = 8.0,
+                 vad_factory=EnergyVAD, device=None):
+        self.sample_rate = sample_rate
+        self.block_frames = sample_rate * block_ms // 1000
+        self.silence_seconds = silence_ms / 1000
+        self.pre_roll_seconds = pre_roll_ms / 1000
+        self.max_seconds = max_seconds
+        self.no_speech_timeout = no_speech_timeout
+        self.vad_factory = vad_factory
+        self.device = device
+
+    @property
+    def block_seconds(self) -> float:
+        return self.block_frames / self.sample_rate
+
+    def _blocks(self, stop=None):
+        """Yield mono float32 blocks from the microphone until closed or ``stop`` is set."""
+        import sounddevice as sd
+
+        blocks = queue.Queue()
+
+        def callback(indata, frames, time_info, status):
+            # indata is reused by PortAudio once the callback returns
+            blocks.put(indata[:, 0].copy())
+
+        with sd.InputStream(samplerate=self.sample_rate, channels=1, dtype="float32",
+                            blocksize=self.block_frames, device=self.device, callback=callback):
+            while stop is None or not stop.is_set():
+                yield blocks.get()
+
+    def chunks(self, on_speech_start=None, stop=None):
+        """Yield one utterance block by block, as the microphone delivers it (until ``stop`` is set)."""
+        source = self._blocks(stop)
+        try:
+            yield from segment_utterance(
+                source, self.vad_factory(), self.block_seconds,
+                silence_seconds=self.silence_seconds,
+                pre_roll_seconds=self.pre_roll_seconds,
+                max_seconds=self.max_seconds,
+                no_speech_timeout=self.no_speech_timeout,
+                on_speech_start=on_speech_start,
+            )
+        finally:
+            # Closes the InputStream as soon as the utterance is over
+            source.close()
+
+    def listen(self, on_speech_start=None) -> np.ndarray:
+        """Record one utterance and return it as a flat float32 array (empty if nobody spoke)."""
+        blocks = list(self.chunks(on_speech_start))
+        if not blocks:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(blocks)
@@ -0,0 +1,230 @@
+"""
+In-Process Audio Player for Caroline's Voice Agent
+Plays audio through sounddevice without spawning a shell per file.
+
+Files are decoded once into float32 PCM and kept in a small LRU cache, so
+replaying a pre-rendered answer costs no decoding at all. Playback runs on
+PortAudio's callback thread; ``play`` returns a handle immediately and the
+caller decides whether to wait, stop, or start listening for the next turn
+while Caroline is still talking (barge-in).
+"""
+
+import os
+import subprocess
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import sounddevice as sd
+import soundfile as sf
+
+# Sample rate used when ffmpeg has to decode a format libsndfile can't read
+FFMPEG_SAMPLE_RATE = 24000
+
+
+def decode_audio(path: str):
+    """Decode an audio file to a float32 ``(frames, channels)`` array and its sample rate."""
+    try:
+        data, sample_rate = sf.read(path, dtype="float32", always_2d=True)
+        return data, sample_rate
+    except RuntimeError:
+        # Older libsndfile builds can't read MP3; fall back to ffmpeg once per file
+        result = subprocess.run(
+            ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", path,
+             "-f", "f32le", "-ac", "1", "-ar", str(FFMPEG_SAMPLE_RATE), "-"],
+            capture_output=True, check=True,
+        )
+        data = np.frombuffer(result.stdout, dtype=np.float32).reshape(-1, 1)
+        return data, FFMPEG_SAMPLE_RATE
+
+
+class PlaybackHandle:
+    """One sound playing on an output stream."""
+
+    def __init__(self, data: np.ndarray, sample_rate: int, device=None):
+        self.data = data
+        self.sample_rate = sample_rate
+        self._position = 0
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stream = sd.OutputStream(
+            samplerate=sample_rate,
+            channels=data.shape[1],
+            dtype="float32",
+            device=device,
+            callback=self._callback,
+            finished_callback=self._finished,
+        )
+        self._stream.start()
+
+    def _callback(self, outdata, frames, time_info, status):
+        chunk = self.data[self._position:self._position + frames]
+        count = len(chunk)
+        outdata[:count] = chunk
+        self._position += count
+        if count < frames:
+            outdata[count:] = 0
+            raise sd.CallbackStop
+
+    def _finished(self):
+        self._done.set()
+        # PortAudio can't close a stream from its own callback thread, so hand the close
+        # off; this way a handle nobody waits on or stops still releases its stream
+        threading.Thread(target=self._close, name="audio-close", daemon=True).start()
+
+    def _close(self):
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._stream.close()
+
+    @property
+    def is_playing(self) -> bool:
+        return not self._done.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds of audio played so far."""
+        return self._position / self.sample_rate
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until playback ends; returns False if the timeout expired first."""
+        finished = self._done.wait(timeout)
+        if finished:
+            self._close()
+        return finished
+
+    def stop(self):
+        """Cut playback off immediately (barge-in)."""
+        with self._lock:
+            if not self._closed and not self._done.is_set():
+                self._stream.abort()
+        self._done.set()
+        self._close()
+
+
+class SequenceHandle:
+    """Several sounds played back to back on a background thread."""
+
+    def __init__(self, player, sources):
+        self._player = player
+        self._current = None
+        # Held from the stop check until the new sound is current, so stop() never misses it
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._done = threading.Event()
+        self.played = []
+        self.error = None
+        self._thread = threading.Thread(target=self._run, args=(sources,), name="audio-sequence", daemon=True)
+        self._thread.start()
+
+    def _run(self, sources):
+        try:
+            for source in sources:
+                with self._lock:
+                    if self._stopped.is_set():
+                        break
+                    current = self._current = self._player.play(source)
+                    self.played.append(source)
+                current.wait()
+        except Exception as e:
+            self.error = e
+            print(f"⚠️ Playback failed: {e}")
+        finally:
+            self._done.set()
+
+    @property
+    def is_playing(self) -> bool:
+        return not self._done.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until every sound has played; returns False on timeout."""
+        return self._done.wait(timeout)
+
+    def stop(self):
+        """Stop the current sound and skip the rest."""
+        with self._lock:
+            self._stopped.set()
+            current = self._current
+        if current is not None:
+            current.stop()
+
+
+class AudioPlayer:
+    """Decodes files once and plays them without blocking the caller."""
+
+    def __init__(self, device=None, cache_bytes: int = 64 * 1024 * 1024):
+        self.device = device
+        self.cache_bytes = cache_bytes
+        self._decoded = OrderedDict()
+        self._decoded_bytes = 0
+        self._lock = threading.Lock()
+        self._active = []
+
+    def load(self, path: str):
+        """Return ``(pcm, sample_rate)`` for a file, decoding it only on first use."""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._decoded.get(key)
+            if cached is not None:
+                self._decoded.move_to_end(key)
+                return cached
+
+        data, sample_rate = decode_audio(path)
+        with self._lock:
+            self._decoded[key] = (data, sample_rate)
+            self._decoded_bytes += data.nbytes
+            while self._decoded_bytes > self.cache_bytes and len(self._decoded) > 1:
+                _, (old, _) = self._decoded.popitem(last=False)
+                self._decoded_bytes -= old.nbytes
+        return data, sample_rate
+
+    def play(self, source, sample_rate: int = None) -> PlaybackHandle:
+        """
+        Start playing a file path or a PCM array and return at once.
+
+        Arrays may be 1-D (mono) or ``(frames, channels)``; they need
+        ``sample_rate``.
+        """
+        if isinstance(source, str):
+            data, sample_rate = self.load(source)
+        else:
+            data = np.asarray(source, dtype=np.float32)
+            if data.ndim == 1:
+                data = data.reshape(-1, 1)
+        handle = PlaybackHandle(data, sample_rate, device=self.device)
+        with self._lock:
+            self._active = [h for h in self._active if h.is_playing] + [handle]
+        return handle
+
+    def play_sequence(self, sources) -> SequenceHandle:
+        """Play an iterable of files back to back; items may still be arriving."""
+        handle = SequenceHandle(self, sources)
+        with self._lock:
+            self._active = [h for h in self._active if h.is_playing] + [handle]
+        return handle
+
+    def stop(self):
+        """Stop everything this player is playing."""
+        with self._lock:
+            active, self._active = self._active, []
+        for handle in active:
+            handle.stop()
+
+    @property
+    def is_playing(self) -> bool:
+        return any(handle.is_playing for handle in self._active)
+
+
+def timed(sources, label: str = "First audio ready"):
+    """Pass items through, printing how long the first one took to arrive."""
+    start = time.perf_counter()
+    first = True
+    for source in sources:
+        if first:
+            print(f"⏱️ {label} after {time.perf_counter() - start:.2f}s")
+            first = False
+        yield source
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Batch Transcription for Caroline's Voice Agent
+Transcribes a backlog of recorded questions offline.
+
+Input is a directory (searched recursively) or a manifest: a text file
+with one path per line, or a JSONL file whose records have a ``path``
+field. Decoding and log-mel preprocessing run in a process pool. Clips of
+up to 30 seconds are stacked and sent through one batched Whisper decode,
+and longer clips fall back to ``transcribe``. Results are appended to a
+JSONL file after every batch, and that file is also the checkpoint: a
+rerun skips every clip that already has a transcript.
+
+Usage: python batch_transcribe.py SOURCE [-o transcripts.jsonl] [--model base]
+                                  [--batch-size 8] [--workers N] [--language en]
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".flac", ".ogg", ".webm"}
+SAMPLE_RATE = 16000
+# Whisper's encoder window; anything longer needs transcribe()'s sliding window
+CHUNK_SECONDS = 30
+
+
+def find_audio(source: str) -> list:
+    """List the audio files in a directory tree or manifest, in a stable order."""
+    if os.path.isdir(source):
+        found = []
+        for root, _, files in os.walk(source):
+            for name in files:
+                if os.path.splitext(name)[1].lower() in AUDIO_EXTENSIONS:
+                    found.append(os.path.join(root, name))
+        return sorted(found)
+
+    base = os.path.dirname(source)
+    paths = []
+    with open(source) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = json.loads(line)["path"] if line.startswith("{") else line
+            # Relative manifest entries are relative to the manifest
+            paths.append(path if os.path.isabs(path) else os.path.join(base, path))
+    return paths
+
+
+def load_done(output: str) -> set:
+    """Paths that already have a transcript in ``output`` (the resume checkpoint)."""
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Half-written line from an interrupted run; that clip is redone
+                continue
+            if "text" in record:
+                done.add(record["path"])
+    return done
+
+
+def _init_worker():
+    # One torch thread per process; the pool provides the parallelism
+    import torch
+    torch.set_num_threads(1)
+
+
+def prepare_clip(path: str, n_mels: int = 80) -> dict:
+    """Decode one file to 16 kHz PCM and, if it fits one window, its log-mel spectrogram."""
+    import whisper
+
+    try:
+        audio = whisper.load_audio(path)
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+    seconds = len(audio) / SAMPLE_RATE
+    if seconds > CHUNK_SECONDS:
+        return {"path": path, "seconds": seconds, "audio": audio}
+    mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels=n_mels)
+    return {"path": path, "seconds": seconds, "mel": mel.numpy()}
+
+
+def decode_batch(model, mels: list, language: str = "en", beam_size: int = None) -> list:
+    """Decode a list of single-window spectrograms in one forward pass."""
+    import numpy as np
+    import torch
+    import whisper
+
+    batch = torch.from_numpy(np.stack(mels)).to(model.device)
+    options = whisper.DecodingOptions(language=language, without_timestamps=True, beam_size=beam_size,
+                                      fp16=model.device.type == "cuda")
+    return [result.text.strip() for result in whisper.decode(model, batch, options)]
+
+
+def transcribe_long(model, audio, language: str = "en") -> str:
+    return model.transcribe(audio, language=language)["text"].strip()
+
+
+def _prepared(paths, n_mels: int, workers: int, lookahead: int):
+    """Yield prepared clips in input order, keeping at most ``lookahead`` in flight."""
+    if workers == 0:
+        for path in paths:
+            yield prepare_clip(path, n_mels)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for path in paths:
+            pending.append(pool.submit(prepare_clip, path, n_mels))
+            if len(pending) >= lookahead:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def transcribe_files(paths, model, output: str = "transcripts.jsonl", batch_size: int = 8,
+                     workers: int = None, language: str = "en", model_name: str = None) -> dict:
+    """
+    Transcribe ``paths`` into ``output`` and return a throughput summary.
+
+    ``workers`` decoding processes (default: CPU count, 0 = in this process)
+    prepare clips ahead of the model. Clips already in ``output`` are skipped.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    done = load_done(output)
+    todo = [path for path in paths if path not in done]
+    n_mels = getattr(getattr(model, "dims", None), "n_mels", 80)
+    print(f"🎧 {len(todo)} clips to transcribe ({len(paths) - len(todo)} already done), "
+          f"batch size {batch_size}, {workers} decoding workers")
+
+    summary = {"files": 0, "failed": 0, "skipped": len(paths) - len(todo), "audio_seconds": 0.0}
+    start = time.perf_counter()
+
+    if os.path.exists(output) and os.path.getsize(output):
+        with open(output, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                # Terminate the line an interrupted run left half-written
+                f.write(b"\n")
+
+    with open(output, "a", encoding="utf-8") as out:
+        def write(records):
+            for record in records:
+                if model_name:
+                    record["model"] = model_name
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                if "text" in record:
+                    summary["files"] += 1
+                    summary["audio_seconds"] += record["seconds"]
+                else:
+                    summary["failed"] += 1
+            # Every flushed batch is a checkpoint
+            out.flush()
+
+        def flush_batch(batch):
+            texts = decode_batch(model, [clip["mel"] for clip in batch], language)
+            write([{"path": clip["path"], "seconds": round(clip["seconds"], 3), "text": text}
+                   for clip, text in zip(batch, texts)])
+            elapsed = time.perf_counter() - start
+            print(f"   {summary['files']}/{len(todo)} clips, "
+                  f"{summary['audio_seconds'] / elapsed:.1f} audio-s per wall-s")
+
+        batch = []
+        for clip in _prepared(todo, n_mels, workers, lookahead=max(batch_size * 2, workers * 2)):
+            if "error" in clip:
+                print(f"⚠️ Could not decode {clip['path']}: {clip['error']}")
+                write([{"path": clip["path"], "error": clip["error"]}])
+            elif "audio" in clip:
+                text = transcribe_long(model, clip["audio"], language)
+                write([{"path": clip["path"], "seconds": round(clip["seconds"], 3), "text": text}])
+            else:
+                batch.append(clip)
+                if len(batch) >= batch_size:
+                    flush_batch(batch)
+                    batch = []
+        if batch:
+            flush_batch(batch)
+
+    summary["wall_seconds"] = time.perf_counter() - start
+    summary["realtime_factor"] = summary["audio_seconds"] / summary["wall_seconds"] if summary["wall_seconds"] else 0.0
+    print(f"✓ Transcribed {summary['files']} clips ({summary['audio_seconds']:.1f}s of audio) "
+          f"in {summary['wall_seconds']:.1f}s: {summary['realtime_factor']:.1f} audio-seconds per wall-second")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe a directory or manifest of recordings")
+    parser.add_argument("source", help="directory of audio files, or a .txt/.jsonl manifest")
+    parser.add_argument("-o", "--output", default="transcripts.jsonl", help="JSONL results (also the checkpoint)")
+    parser.add_argument("--model", default="base", help="Whisper model size")
+    parser.add_argument("--device", default=None, help="torch device, e.g. cpu or cuda")
+    parser.add_argument("--batch-size", type=int, default=8, help="clips per batched decode")
+    parser.add_argument("--workers", type=int, default=None, help="decoding processes (0 = in-process)")
+    parser.add_argument("--language", default="en")
+    args = parser.parse_args()
+
+    import speech_models
+
+    model = speech_models.get_whisper_model(args.model, args.device)
+    transcribe_files(find_audio(args.source), model, args.output, batch_size=args.batch_size,
+                     workers=args.workers, language=args.language, model_name=args.model)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Routing Benchmark for Caroline's Interactive Agent
+Compares the original if/elif substring chain with the compiled intent router,
+both raw and behind the shared LRU-cached route(), on synthetic questions.
+
+Usage: python bench_routing.py [--questions 100000] [--seed 7]
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+import intent_router
+
+# Keyword lists exactly as the original respond_to_question checked them
+LEGACY_CHAIN = [
+    ('education', ['education', 'school', 'study', 'degree', 'harvard', 'sydney']),
+    ('research', ['research', 'thesis', 'cardiovascular', 'transcriptomics', 'modeling']),
+    ('industry', ['tencent', 'industry', 'work', 'internship', 'healthcare']),
+    ('technical', ['programming', 'technical', 'skills', 'python', 'tensorflow', 'tools']),
+    ('leadership', ['leadership', 'club', 'organize', 'impact', 'students']),
+    ('background', ['background', 'about', 'yourself', 'who', 'multicultural', 'global']),
+    ('future', ['future', 'goals', 'plans', 'career', 'vision']),
+    ('ai', ['ai', 'machine learning', 'deep learning', 'llm', 'artificial intelligence']),
+]
+
+TEMPLATES = [
+    "Can you tell me a bit more about your {} and how it shaped you?",
+    "What has your experience with {} been like so far?",
+    "I was wondering how {} fits together with {} in your day to day",
+    "Honestly, what do people usually get wrong about {}?",
+    "Could you walk me through a typical week, including {}?",
+]
+
+# Off-topic questions make up a quarter of the traffic and hit the fallback
+OFF_TOPIC = [
+    "What is your favourite coffee place near campus?",
+    "How are you finding the boston winters this year?",
+    "Do you have any recommendations for weekend hikes?",
+    "Which music have you been listening to lately?",
+]
+
+
+def legacy_route(question):
+    """The original branch-ordered substring scan."""
+    question_lower = question.lower()
+    for intent, words in LEGACY_CHAIN:
+        if any(word in question_lower for word in words):
+            return intent
+    return None
+
+
+def synthetic_questions(count, seed):
+    """Build ``count`` reproducible questions, mostly on-topic with some small talk."""
+    rng = random.Random(seed)
+    vocabulary = [word for _, words in LEGACY_CHAIN for word in words]
+    questions = []
+    for _ in range(count):
+        if rng.random() < 0.25:
+            questions.append(rng.choice(OFF_TOPIC))
+            continue
+        template = rng.choice(TEMPLATES)
+        slots = template.count("{}")
+        questions.append(template.format(*(rng.choice(vocabulary) for _ in range(slots))))
+    return questions
+
+
+def time_router(name, route, questions):
+    """Route every question once and print throughput."""
+    start = time.perf_counter()
+    for question in questions:
+        route(question)
+    elapsed = time.perf_counter() - start
+    rate = len(questions) / elapsed
+    print(f"{name:<22} {elapsed:8.3f} s   {rate:12,.0f} questions/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--questions", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    questions = synthetic_questions(args.questions, args.seed)
+    router = intent_router.ROUTER
+
+    print(f"📊 Routing {len(questions):,} synthetic questions")
+    print("-" * 60)
+    before = time_router("if/elif substring", legacy_route, questions)
+    after = time_router("compiled router", router.route, questions)
+    intent_router.route.cache_clear()
+    cached = time_router("route() with LRU", intent_router.route, questions)
+    print("-" * 60)
+    print(f"Speedup: {before / after:.2f}x uncached, {before / cached:.2f}x cached")
+
+    # Intended: specific keywords beat "about", whole words only, a few new keywords
+    changes = Counter((legacy_route(q), router.route(q)) for q in questions if legacy_route(q) != router.route(q))
+    changed = sum(changes.values())
+    print(f"Questions routed differently: {changed:,} ({changed / len(questions):.1%})")
+    for (old, new), count in changes.most_common(5):
+        print(f"   {old or 'fallback'} → {new or 'fallback'}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
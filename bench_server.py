@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Load Benchmark for Caroline's Server
+Drives N concurrent kiosk sessions and reports turn latency percentiles.
+
+Each simulated session sends its turns one after another (a kiosk never
+asks a new question before the answer arrives) and all sessions run at
+once. ``--mode chat`` posts text questions, ``--mode voice`` uploads a WAV
+recording and ``--mode ws`` streams the recording (or, without one, the
+text) over the WebSocket endpoint. Without ``--url`` a text-only server is
+started in this process first.
+
+Usage: python bench_server.py --sessions 50 --turns 10 [--mode chat|voice|ws] [--audio question.wav]
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+from caroline_server import CarolineServer, percentiles
+
+QUESTIONS = [
+    "Hi Caroline!",
+    "Tell me about your education",
+    "What did you research at Harvard?",
+    "What did you do at Tencent?",
+    "What are your technical skills?",
+    "How do you lead a team?",
+    "Where did you grow up?",
+    "What do you do for fun?",
+]
+
+# One WebSocket frame of 16-bit PCM per 100 ms, like a live microphone
+FRAME_BYTES = 3200
+
+
+def read_pcm16(path: str) -> bytes:
+    """A recording as 16 kHz mono 16-bit PCM, what the WebSocket endpoint takes."""
+    import numpy as np
+
+    from caroline_server import decode_wav
+
+    with open(path, "rb") as f:
+        audio = decode_wav(f.read())
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+async def chat_turn(http, url, session_id, number, audio):
+    question = QUESTIONS[number % len(QUESTIONS)]
+    async with http.post(f"{url}/chat", json={"session": session_id, "message": question}) as response:
+        body = await response.json()
+        return response.status, body.get("session", session_id)
+
+
+async def voice_turn(http, url, session_id, number, audio):
+    params = {"session": session_id} if session_id else {}
+    async with http.post(f"{url}/voice", params=params, data=audio,
+                         headers={"Content-Type": "audio/wav"}) as response:
+        body = await response.json()
+        if response.status == 200:
+            async with http.get(f"{url}{body['audio_url']}") as audio_response:
+                await audio_response.read()
+        return response.status, body.get("session", session_id)
+
+
+async def run_session(http, url, mode, turns, audio, results):
+    if mode == "ws":
+        return await run_ws_session(http, url, turns, audio, results)
+    session_id = None
+    turn = chat_turn if mode == "chat" else voice_turn
+    for number in range(turns):
+        started = time.perf_counter()
+        try:
+            status, session_id = await turn(http, url, session_id, number, audio)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            results["errors"].append(str(e))
+            continue
+        if status == 200:
+            results["latencies"].append(time.perf_counter() - started)
+        else:
+            results["status"][status] = results["status"].get(status, 0) + 1
+
+
+async def run_ws_session(http, url, turns, audio, results):
+    try:
+        async with http.ws_connect(f"{url}/ws") as ws:
+            await ws.receive_json()  # the session id
+            for number in range(turns):
+                started = time.perf_counter()
+                if audio:
+                    for start in range(0, len(audio), FRAME_BYTES):
+                        await ws.send_bytes(audio[start:start + FRAME_BYTES])
+                    await ws.send_json({"type": "end"})
+                else:
+                    await ws.send_json({"type": "text", "message": QUESTIONS[number % len(QUESTIONS)]})
+                while True:
+                    message = await ws.receive()
+                    if message.type != aiohttp.WSMsgType.TEXT:
+                        if message.type == aiohttp.WSMsgType.BINARY:
+                            continue
+                        raise aiohttp.ClientError(f"WebSocket closed ({message.type.name})")
+                    data = message.json()
+                    if data["type"] == "error":
+                        raise aiohttp.ClientError(data["error"])
+                    if data["type"] == "done":
+                        break
+                results["latencies"].append(time.perf_counter() - started)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        results["errors"].append(str(e))
+
+
+async def load_test(url: str, sessions: int, turns: int, mode: str = "chat", audio: bytes = None) -> dict:
+    """Run ``sessions`` concurrent sessions of ``turns`` turns each; returns latency stats."""
+    results = {"latencies": [], "status": {}, "errors": []}
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=300)) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(run_session(http, url, mode, turns, audio, results) for _ in range(sessions)))
+        elapsed = time.perf_counter() - started
+        async with http.get(f"{url}/metrics") as response:
+            server = await response.json()
+    latencies = results["latencies"]
+    return {"mode": mode, "sessions": sessions, "turns": len(latencies), "elapsed": elapsed,
+            "throughput": len(latencies) / elapsed if elapsed else 0.0,
+            "latency": {**percentiles(latencies), "max": max(latencies, default=0.0)},
+            "status": results["status"], "errors": len(results["errors"]), "server": server}
+
+
+def print_report(report: dict):
+    latency = report["latency"]
+    print(f"\n📈 {report['sessions']} concurrent {report['mode']} sessions: {report['turns']} turns "
+          f"in {report['elapsed']:.2f}s ({report['throughput']:.1f} turns/s)")
+    if report["turns"]:
+        print(f"   latency p50 {latency['p50'] * 1000:.1f}ms  p99 {latency['p99'] * 1000:.1f}ms  "
+              f"max {latency['max'] * 1000:.1f}ms")
+    for status, count in sorted(report["status"].items()):
+        print(f"   ⚠️ {count} turns answered with HTTP {status}")
+    if report["errors"]:
+        print(f"   ❌ {report['errors']} connection errors")
+    server = report["server"]
+    print(f"   server: {server['sessions']} sessions, {server['rejected']} rejected, "
+          f"max queue depth {server['max_queue_depth']}")
+
+
+async def run_local(args, audio):
+    """Start a text-only server on a free port, run the test against it and stop it."""
+    from aiohttp import web
+
+    server = CarolineServer(voice=False, max_sessions=max(args.sessions, 1),
+                            conversation_log="caroline_bench_server.jsonl")
+    runner = web.AppRunner(server.app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        return await load_test(f"http://127.0.0.1:{port}", args.sessions, args.turns, args.mode, audio)
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test Caroline's server with concurrent sessions")
+    parser.add_argument("--url", default=None, help="server to test (default: start a text-only one here)")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=10, help="turns per session")
+    parser.add_argument("--mode", choices=["chat", "voice", "ws"], default="chat")
+    parser.add_argument("--audio", default=None, help="WAV question for voice and ws modes")
+    args = parser.parse_args()
+
+    audio = None
+    if args.mode == "voice":
+        if not args.audio:
+            parser.error("--mode voice needs --audio")
+        with open(args.audio, "rb") as f:
+            audio = f.read()
+    elif args.mode == "ws" and args.audio:
+        audio = read_pcm16(args.audio)
+    if args.url is None and audio is not None:
+        parser.error("voice turns need a server with voice enabled; pass --url")
+
+    if args.url:
+        report = asyncio.run(load_test(args.url.rstrip("/"), args.sessions, args.turns, args.mode, audio))
+    else:
+        report = asyncio.run(run_local(args, audio))
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
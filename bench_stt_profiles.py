@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Speech Recognition Benchmark for Caroline's Voice Agent
+Measures real-time factor and word error rate of every decoding profile.
+
+The clip set is Caroline's demo questions rendered once with a TTS backend
+into ``bench_clips/`` (with a ``manifest.jsonl`` of reference texts), then
+padded with silence like a press-to-talk recording. Point ``--clips`` at a
+directory with your own ``manifest.jsonl`` ({"path": ..., "text": ...} per
+line) to benchmark real recordings instead.
+
+Real-time factor is processing seconds per second of audio (below 1.0 is
+faster than real time); word error rate is word-level edit distance over
+reference words.
+
+Usage: python bench_stt_profiles.py [--profiles fast,fastest] [--backend gtts]
+                                    [--max-wer 0.1] [--threads 4]
+"""
+
+import argparse
+import copy
+import json
+import os
+import re
+import time
+
+from decoding_profiles import PROFILES, get_profile, trim_silence
+
+SAMPLE_RATE = 16000
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+QUESTIONS = [
+    "Tell me about your research",
+    "What was your experience at Tencent?",
+    "What are your leadership activities?",
+    "Tell me about your cardiovascular research at Harvard",
+    "What are your technical skills in machine learning?",
+    "Where did you study before Harvard?",
+    "What are your career goals after graduation?",
+    "How do you use artificial intelligence in healthcare?",
+    "Can you tell me about yourself?",
+    "Hello, how are you?",
+]
+
+
+def words(text: str) -> list:
+    return WORD_PATTERN.findall(text.lower())
+
+
+def word_errors(reference: str, hypothesis: str) -> int:
+    """Substitutions + insertions + deletions between two texts, word by word."""
+    ref, hyp = words(reference), words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1]
+
+
+def word_error_rate(pairs) -> float:
+    """Corpus WER over ``(reference, hypothesis)`` pairs."""
+    pairs = list(pairs)
+    total = sum(len(words(reference)) for reference, _ in pairs)
+    errors = sum(word_errors(reference, hypothesis) for reference, hypothesis in pairs)
+    return errors / total if total else 0.0
+
+
+def build_clip_set(directory: str, backend_name: str) -> list:
+    """Render the benchmark questions once; returns manifest records."""
+    manifest_path = os.path.join(directory, "manifest.jsonl")
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    from tts_backends import get_backend
+
+    backend = get_backend(backend_name)
+    os.makedirs(directory, exist_ok=True)
+    print(f"🔊 Rendering {len(QUESTIONS)} benchmark clips with {backend_name}...")
+    records = []
+    for i, text in enumerate(QUESTIONS):
+        path = os.path.join(directory, f"q{i:02d}{backend.extension}")
+        backend.synthesize(text, path)
+        records.append({"path": os.path.basename(path), "text": text})
+    with open(manifest_path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    return records
+
+
+def load_clips(directory: str, records: list, pad_seconds: float) -> list:
+    """Decode every clip to 16 kHz float32 with ``pad_seconds`` of silence on each side."""
+    import numpy as np
+    import whisper
+
+    pad = np.zeros(int(pad_seconds * SAMPLE_RATE), dtype=np.float32)
+    clips = []
+    for record in records:
+        path = record["path"] if os.path.isabs(record["path"]) else os.path.join(directory, record["path"])
+        audio = np.concatenate([pad, whisper.load_audio(path), pad])
+        clips.append((audio, record["text"]))
+    return clips
+
+
+def bench_profile(profile, clips: list) -> dict:
+    """Transcribe every clip with one profile; model loading is not timed."""
+    model = profile.load_model()
+    options = profile.transcribe_options(device=model.device)
+    model.transcribe(clips[0][0], **options)  # warm-up
+
+    audio_seconds = 0.0
+    busy = 0.0
+    pairs = []
+    for audio, reference in clips:
+        audio_seconds += len(audio) / SAMPLE_RATE
+        start = time.perf_counter()
+        if profile.vad_trim:
+            audio = trim_silence(audio, SAMPLE_RATE)
+        text = model.transcribe(audio, **options)["text"]
+        busy += time.perf_counter() - start
+        pairs.append((reference, text))
+
+    return {
+        "profile": profile.name,
+        "model": profile.model_name,
+        "rtf": busy / audio_seconds,
+        "wer": word_error_rate(pairs),
+        "latency": busy / len(clips),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profiles", default=",".join(PROFILES), help="comma-separated profile names")
+    parser.add_argument("--clips", default="bench_clips", help="clip directory with manifest.jsonl")
+    parser.add_argument("--backend", default="gtts", help="TTS backend used to render missing clips")
+    parser.add_argument("--pad-seconds", type=float, default=1.0, help="silence added around each clip")
+    parser.add_argument("--threads", type=int, default=None, help="override every profile's thread count")
+    parser.add_argument("--max-wer", type=float, default=0.1, help="accuracy bar for the recommendation")
+    args = parser.parse_args()
+
+    profiles = [get_profile(name.strip()) for name in args.profiles.split(",")]
+    records = build_clip_set(args.clips, args.backend)
+    clips = load_clips(args.clips, records, args.pad_seconds)
+    total = sum(len(audio) for audio, _ in clips) / SAMPLE_RATE
+    print(f"📊 {len(clips)} clips, {total:.1f}s of audio")
+    print("-" * 60)
+    print(f"{'profile':<10}{'model':<12}{'RTF':>8}{'WER':>8}{'per clip':>12}")
+
+    results = []
+    for profile in profiles:
+        if args.threads:
+            # A copy, so the shared PROFILES keep their own thread counts
+            profile = copy.copy(profile)
+            profile.threads = args.threads
+        result = bench_profile(profile, clips)
+        results.append(result)
+        print(f"{result['profile']:<10}{result['model']:<12}{result['rtf']:>8.3f}"
+              f"{result['wer']:>8.1%}{result['latency']:>11.2f}s")
+    print("-" * 60)
+
+    good_enough = [r for r in results if r["wer"] <= args.max_wer]
+    if good_enough:
+        best = min(good_enough, key=lambda r: r["rtf"])
+        print(f"Fastest profile within {args.max_wer:.0%} WER: {best['profile']} "
+              f"(CAROLINE_STT_PROFILE={best['profile']})")
+    else:
+        print(f"No profile reached {args.max_wer:.0%} WER on this clip set")
+
+
+if __name__ == "__main__":
+    main()
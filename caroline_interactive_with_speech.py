@@ -1,16 +1,36 @@
 """
 Caroline's Interactive Demo with Speech Capabilities
 Enhanced version using gTTS (more reliable alternative to Kokoro)
+
+Set CAROLINE_TTS_BACKEND=pyttsx3 (offline system voice) or tone
+(deterministic stand-in) to run without network access,
+CAROLINE_STT_PROFILE=fast or fastest for quicker recognition on CPU, and
+CAROLINE_ARCHIVE_DIR to keep a WAV copy of every recorded question.
 """
 
-import whisper
-from gtts import gTTS
 import soundfile as sf
 import sounddevice as sd
 import numpy as np
 from datetime import datetime
-import json
+import asyncio
 import os
+import queue
+import shutil
+import threading
+import time
+
+from audio_capture import StreamingRecorder
+from audio_player import AudioPlayer, timed
+import batch_transcribe
+from conversation_log import ConversationLog
+from decoding_profiles import get_profile, trim_silence
+from intent_router import route
+from persona_store import load_persona
+from tts_backends import TTSBackend, get_backend, split_sentences
+from transcription_cache import TranscriptionCache
+from tts_cache import TTSCache
+from voice_bank import VoiceBank
+from voice_pipeline import VoicePipeline
 
 class CarolineVoiceDemo:
     """
@@ -18,132 +38,399 @@ class CarolineVoiceDemo:
     Works without API keys using pre-defined responses
     """
     
-    def __init__(self):
-        """Initialize speech models"""
+    SAMPLE_RATE = 16000  # Whisper's native rate, so recordings need no resampling
+    
+    def __init__(self, model_size: str = None, device: str = None, warm_up: bool = False,
+                 archive_dir: str = None, tts_cache_dir: str = "tts_cache",
+                 tts_cache_bytes: int = 64 * 1024 * 1024, voice_bank_dir: str = "voice_bank",
+                 tts_backend="gtts", barge_in: bool = True,
+                 conversation_log: str = "caroline_conversation.jsonl", history_window: int = 50,
+                 stt_cache_dir: str = "stt_cache", decoding_profile="balanced",
+                 knowledge_index_dir: str = "knowledge_index"):
+        """
+        Set up the agent without blocking on Whisper.
+        
+        The STT model is fetched from the shared registry on the first
+        speech_to_text call. Pass warm_up=True to start loading it on a
+        background thread right away. Recordings stay in memory; pass
+        archive_dir to also keep a WAV copy of each one on disk.
+        Synthesized responses are cached in tts_cache_dir, and canned
+        answers can be pre-rendered into voice_bank_dir. tts_backend is a
+        backend name ("gtts", "pyttsx3", "tone") or a TTSBackend instance.
+        With barge_in, starting a recording cuts off any answer still playing.
+        Turns are appended to the conversation_log JSONL file as they happen;
+        only the last history_window turns stay in memory. Transcripts are
+        cached in stt_cache_dir by audio fingerprint. decoding_profile
+        ("accurate", "balanced", "fast", "fastest" or a DecodingProfile)
+        sets the Whisper model and decoding options; model_size overrides
+        the profile's model. Questions the router can't place are answered
+        from the closest passage in the knowledge index in knowledge_index_dir.
+        """
         print("Initializing Caroline's Voice Agent...")
         
-        # Load Whisper for STT
-        print("Loading speech recognition (Whisper)...")
-        self.whisper_model = whisper.load_model("base")
-        
-        # Caroline's knowledge base (from your demo_main.py)
-        self.knowledge_base = {
-            "research": """I focus on cardiovascular risk modeling using cooperative 
-            learning and survival analysis. My thesis involves developing polygenic 
-            hazard scores using multi-view data integration across genomic, cardiac MRI, 
-            and clinical data. I'm also working on spatial transcriptomics to understand 
-            neuroimmune stress response in the brain.""",
-            
-            "tencent": """As a Solution Architecture Intern at Tencent Healthcare, I 
-            designed multimodal AI medical LLM solutions and contributed to POC deals 
-            worth over 20 million yuan. I also developed point-of-care diagnostic devices 
-            that reduced testing time by 80 percent, which taught me how to translate complex 
-            AI into practical clinical workflows.""",
-            
-            "skills": """I'm proficient in Python, R, TensorFlow, and SQL for machine 
-            learning. I specialize in survival analysis, cooperative learning, and 
-            clinical trial design. I also have experience with Docker, Kubernetes, and 
-            MLOps for deploying healthcare AI solutions.""",
-            
-            "leadership": """As Chair of the Harvard Chan Biotechnology Club, I organize 
-            workshops and career panels for over 200 students. I also mentor undergraduates 
-            in biostatistics research and help them navigate career paths in healthcare AI.""",
-            
-            "background": """I'm a Harvard Master's student in Biostatistics with a 
-            perfect 4.0 GPA from University of Sydney. I bring a multicultural perspective 
-            from my experiences in Boston, Sydney, and Shenzhen. This diversity helps me 
-            bridge technical research with real-world healthcare needs."""
+        self.profile = get_profile(decoding_profile)
+        self.model_size = model_size or self.profile.model_size
+        self.device = device
+        self.archive_dir = archive_dir
+        self._archive_threads = []
+        
+        # The backend's language, voice and speed all feed the TTS cache key
+        if not isinstance(tts_backend, TTSBackend):
+            tts_backend = get_backend(tts_backend)
+        self.tts_backend = tts_backend
+        self.tts_cache = TTSCache(tts_cache_dir, max_bytes=tts_cache_bytes)
+        self.voice_bank = VoiceBank(voice_bank_dir)
+        self.stt_cache = TranscriptionCache(stt_cache_dir)
+        self.stt_options = self.profile.transcribe_options("en", device)
+        
+        self.player = AudioPlayer()
+        self.recorder = StreamingRecorder(sample_rate=self.SAMPLE_RATE)
+        self.playback = None
+        self.barge_in = barge_in
+        
+        if warm_up:
+            self.profile.warm_up(device, self.model_size)
+        
+        # Which knowledge_base entry answers each shared router intent
+        self.intent_topics = {
+            "education": "background",
+            "research": "research",
+            "industry": "tencent",
+            "ai": "tencent",
+            "technical": "skills",
+            "leadership": "leadership",
+            "background": "background",
         }
         
-        self.conversation_history = []
+        self.knowledge_index_dir = knowledge_index_dir
+        self._knowledge_index = None
+        
+        self.conversation_log = ConversationLog(conversation_log, window=history_window)
         print("✓ Caroline's voice agent ready!\n")
     
-    def speech_to_text(self, audio_path: str) -> str:
-        """Transcribe speech to text"""
-        print("🎤 Transcribing your voice...")
-        result = self.whisper_model.transcribe(audio_path, language="en")
-        text = result["text"].strip()
-        print(f"You said: {text}")
+    @property
+    def knowledge_base(self) -> dict:
+        """Caroline's spoken answers by topic, from the shared persona snapshot"""
+        return load_persona().section("voice")
+    
+    @property
+    def greeting_response(self) -> str:
+        return load_persona()["voice_prompts/greeting"]
+    
+    @property
+    def fallback_response(self) -> str:
+        return load_persona()["voice_prompts/fallback"]
+    
+    @property
+    def conversation_history(self):
+        """The most recent turns of this session (older ones are only on disk)"""
+        return self.conversation_log.recent
+    
+    def log_turn(self, entry: dict) -> dict:
+        """Append one turn to the conversation log"""
+        return self.conversation_log.append(entry)
+    
+    @property
+    def whisper_model(self):
+        """Shared Whisper model, loaded lazily and reused across instances"""
+        return self.profile.load_model(self.device, self.model_size)
+    
+    @property
+    def stt_model_name(self) -> str:
+        """Model size plus quantization, e.g. "base-int8" """
+        return self.model_size + ("-int8" if self.profile.int8 else "")
+    
+    def speech_to_text(self, audio, verbose: bool = True, cache: bool = True) -> str:
+        """
+        Transcribe speech to text from a file path or a 16 kHz float32 array
+        
+        Audio that was transcribed before (same samples, model and options)
+        is answered from the transcription cache without running Whisper.
+        """
+        if verbose:
+            print("🎤 Transcribing your voice...")
+        if isinstance(audio, str):
+            # Decode once: the PCM is both the cache key and Whisper's input
+            import whisper
+            audio = whisper.load_audio(audio)
+        if self.profile.vad_trim:
+            audio = trim_silence(audio, self.SAMPLE_RATE)
+        
+        key = TranscriptionCache.make_key(audio, self.stt_model_name, options=self.stt_options) if cache else None
+        text = self.stt_cache.get(key) if cache else None
+        if text is None:
+            result = self.whisper_model.transcribe(audio, **self.stt_options)
+            text = result["text"].strip()
+            if cache:
+                self.stt_cache.put(key, text)
+        if verbose:
+            print(f"You said: {text}")
         return text
     
-    def text_to_speech(self, text: str, output_path: str = "caroline_voice.mp3") -> str:
-        """Generate speech from text using gTTS"""
-        print("🔊 Generating Caroline's voice response...")
-        tts = gTTS(text=text, lang='en', slow=False)
-        tts.save(output_path)
-        print(f"✓ Audio saved to {output_path}")
-        return output_path
+    def transcribe_batch(self, source: str, output: str = "transcripts.jsonl", batch_size: int = 8,
+                         workers: int = None) -> dict:
+        """
+        Transcribe a directory or manifest of recordings into a JSONL file
+        
+        Uses this agent's Whisper model with batched decoding; audio decoding
+        runs on a process pool. Rerunning resumes where the last run stopped.
+        """
+        return batch_transcribe.transcribe_files(
+            batch_transcribe.find_audio(source), self.whisper_model, output,
+            batch_size=batch_size, workers=workers, model_name=self.stt_model_name)
     
-    def play_audio(self, audio_path: str):
-        """Play audio file"""
-        print("🔊 Playing response...")
+    def tts_key(self, text: str) -> str:
+        """Cache key for text under the current TTS backend and voice"""
+        backend = self.tts_backend
+        return TTSCache.make_key(text, backend.lang, backend.voice_id, backend.speed)
+    
+    def synthesize(self, text: str, output_path: str):
+        """Render text to an audio file with the configured TTS backend"""
+        self.tts_backend.synthesize(text, output_path)
+    
+    def _audio_for(self, text: str, announce: bool = True) -> str:
+        """Return audio for text from the voice bank, the TTS cache or a fresh synthesis"""
+        key = self.tts_key(text)
+        audio_path = self.voice_bank.lookup(key)
         
-        # For MP3 files, we need to convert or use a different player
-        if audio_path.endswith('.mp3'):
-            # Use system player for MP3
-            import platform
-            system = platform.system()
-            
-            if system == 'Darwin':  # macOS
-                os.system(f'afplay "{audio_path}"')
-            elif system == 'Linux':
-                os.system(f'mpg123 "{audio_path}" 2>/dev/null || ffplay -nodisp -autoexit "{audio_path}" 2>/dev/null')
-            elif system == 'Windows':
-                os.system(f'start "" "{audio_path}"')
-        else:
-            # For WAV files
-            data, sample_rate = sf.read(audio_path)
-            sd.play(data, sample_rate)
-            sd.wait()
+        if audio_path:
+            if announce:
+                print("✓ Using pre-rendered voice response")
+            return audio_path
+        
+        audio_path = self.tts_cache.get(key)
+        if audio_path:
+            if announce:
+                print("✓ Using cached voice response")
+            return audio_path
+        
+        if announce:
+            print("🔊 Generating Caroline's voice response...")
+        audio_path = self.tts_cache.put(key, lambda path: self.synthesize(text, path),
+                                        self.tts_backend.extension)
+        if announce:
+            print(f"✓ Audio cached at {audio_path}")
+        return audio_path
     
-    def get_response(self, user_input: str) -> str:
-        """Generate Caroline's response based on keywords"""
-        user_lower = user_input.lower()
+    def text_to_speech(self, text: str, output_path: str = None) -> str:
+        """
+        Generate speech from text, reusing pre-rendered or cached audio
         
-        # Match keywords to responses
-        if any(word in user_lower for word in ["research", "thesis", "cardiovascular", "genomic"]):
-            return self.knowledge_base["research"]
+        Checks the voice bank, then the TTS cache, and only then calls the
+        TTS backend. Returns the path of the audio file. If output_path is
+        given the audio is also copied there.
+        """
+        audio_path = self._audio_for(text)
         
-        elif any(word in user_lower for word in ["tencent", "internship", "industry", "healthcare ai"]):
-            return self.knowledge_base["tencent"]
+        if output_path:
+            shutil.copyfile(audio_path, output_path)
+            return output_path
+        return audio_path
+    
+    def speech_segments(self, text: str) -> list:
+        """
+        Pieces to synthesize for text, in playback order
         
-        elif any(word in user_lower for word in ["skills", "technical", "programming", "python"]):
-            return self.knowledge_base["skills"]
+        The whole answer if it is already pre-rendered or cached (or is a
+        single sentence), otherwise one piece per sentence.
+        """
+        key = self.tts_key(text)
+        if self.voice_bank.lookup(key) or self.tts_cache.get(key):
+            return [text]
+        return split_sentences(text) or [text]
+    
+    def speech_files(self, text: str) -> list:
+        """
+        Audio files that speak(text) plays, in order
+        
+        Known before synthesis: a piece is either in the voice bank or goes
+        to its TTS cache path, so turns can be logged while still playing.
+        """
+        files = []
+        for segment in self.speech_segments(text):
+            key = self.tts_key(segment)
+            files.append(self.voice_bank.lookup(key) or self.tts_cache.path_for(key, self.tts_backend.extension))
+        return files
+    
+    def stream_speech(self, text: str):
+        """
+        Yield audio files for text, one sentence at a time
         
-        elif any(word in user_lower for word in ["leadership", "club", "mentor", "harvard chan"]):
-            return self.knowledge_base["leadership"]
+        Whole answers already in the voice bank or cache come back as a
+        single file. Otherwise a background thread synthesizes sentence
+        after sentence, so the caller can play the first one while the rest
+        are still being rendered.
+        """
+        sentences = self.speech_segments(text)
+        if len(sentences) == 1:
+            yield self._audio_for(sentences[0], announce=False)
+            return
         
-        elif any(word in user_lower for word in ["background", "about", "who", "sydney", "boston"]):
-            return self.knowledge_base["background"]
+        ready = queue.Queue()
         
-        elif any(word in user_lower for word in ["hello", "hi", "hey"]):
-            return """Hi! I'm Caroline Song's AI assistant. I can tell you about my 
-            research in cardiovascular modeling, my experience at Tencent Healthcare, 
-            my technical skills, or my leadership at Harvard. What would you like to know?"""
+        def produce():
+            try:
+                for sentence in sentences:
+                    ready.put(self._audio_for(sentence, announce=False))
+            except Exception as e:
+                ready.put(e)
+            ready.put(None)
         
-        else:
-            return """That's an interesting question! I specialize in biostatistics, 
-            healthcare AI, and cardiovascular research. Feel free to ask me about my 
-            research, industry experience at Tencent, technical skills, or leadership 
-            activities at Harvard."""
+        threading.Thread(target=produce, name="tts-stream", daemon=True).start()
+        while True:
+            item = ready.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    
+    def speak(self, text: str, wait: bool = True):
+        """
+        Stream text to the speakers sentence by sentence
+        
+        Returns the playback handle; handle.played lists the audio files
+        played so far (speech_files lists all of them up front). With
+        wait=False Caroline keeps talking while the caller moves on, e.g.
+        to record the next question.
+        """
+        print("🔊 Generating Caroline's voice response...")
+        self.playback = self.player.play_sequence(timed(self.stream_speech(text)))
+        if wait:
+            self.playback.wait()
+        return self.playback
+    
+    def voice_bank_texts(self) -> dict:
+        """Every canned answer get_response can return, by voice bank entry name"""
+        texts = {f"kb_{topic}": text for topic, text in self.knowledge_base.items()}
+        texts["greeting"] = self.greeting_response
+        texts["fallback"] = self.fallback_response
+        return texts
+    
+    def build_voice_bank(self, workers: int = 4, force: bool = False, background: bool = False):
+        """
+        Pre-render every canned answer, skipping entries whose text is unchanged
+        
+        With background=True the build runs on a daemon thread and the
+        thread is returned; entries become available as they finish.
+        """
+        def build():
+            return self.voice_bank.build(self.voice_bank_texts(), self.tts_key, self.synthesize,
+                                         extension=self.tts_backend.extension,
+                                         workers=workers, force=force)
+        
+        if not background:
+            return build()
+        thread = threading.Thread(target=build, name="voice-bank-build", daemon=True)
+        thread.start()
+        return thread
+    
+    def play_audio(self, audio_path: str, wait: bool = True):
+        """
+        Play an audio file in-process and return its playback handle
+        
+        With wait=False the call returns immediately; use the handle (or
+        self.player.stop()) to wait for or interrupt playback.
+        """
+        print("🔊 Playing response...")
+        handle = self.player.play(audio_path)
+        if wait:
+            handle.wait()
+        return handle
+    
+    def get_response(self, user_input: str) -> str:
+        """Generate Caroline's response for the topic the shared router picks"""
+        intent = route(user_input)
+        if intent != "greeting" and intent not in self.intent_topics:
+            # Off-keyword: answer from the closest indexed passage if there is one
+            retrieved = self.retrieve(user_input)
+            if retrieved:
+                return retrieved
+        return self.response_for_intent(intent)
     
-    def record_audio(self, duration: int = 5, output_file: str = "user_input.wav") -> str:
-        """Record audio from microphone"""
+    @property
+    def knowledge_index(self):
+        """The knowledge index over every front end's answers, built on first use"""
+        if self._knowledge_index is None:
+            from knowledge_index import shared_index
+            
+            self._knowledge_index = shared_index(self.knowledge_index_dir)
+        return self._knowledge_index
+    
+    def retrieve(self, user_input: str):
+        """Closest knowledge index passage for an off-keyword question, or None"""
+        return self.knowledge_index.answer(user_input)
+    
+    def response_for_intent(self, intent: str) -> str:
+        """Caroline's answer for a router intent (None gets the fallback)"""
+        if intent == "greeting":
+            return self.greeting_response
+        topic = self.intent_topics.get(intent)
+        if topic is None:
+            return self.fallback_response
+        return load_persona()[f"voice/{topic}"]
+    
+    def record_audio(self, duration: float = None, archive_path: str = None) -> np.ndarray:
+        """
+        Record audio from microphone into memory
+        
+        By default recording stops when the speaker pauses (voice activity
+        detection); pass duration to record a fixed number of seconds
+        instead. Returns a mono float32 array at SAMPLE_RATE that Whisper
+        can take directly, empty if nobody spoke. If archive_path is given,
+        a WAV copy is written on a background thread so the turn doesn't
+        wait on the disk.
+        """
+        if duration is None:
+            print("\n🎤 Listening... (recording stops when you pause)")
+            # Barge-in: Caroline stops talking as soon as the user starts
+            on_speech_start = self.player.stop if self.barge_in else None
+            audio = self.recorder.listen(on_speech_start=on_speech_start)
+            if audio.size:
+                print(f"✓ Captured {audio.size / self.SAMPLE_RATE:.1f}s of speech")
+                if archive_path:
+                    self.archive_audio(audio, archive_path)
+            return audio
+        
+        if self.barge_in and self.player.is_playing:
+            self.player.stop()
+        
         print(f"\n🎤 Recording for {duration} seconds...")
         print("Speak now!")
         
-        sample_rate = 16000
         recording = sd.rec(
-            int(duration * sample_rate),
-            samplerate=sample_rate,
+            int(duration * self.SAMPLE_RATE),
+            samplerate=self.SAMPLE_RATE,
             channels=1,
             dtype=np.float32
         )
         sd.wait()
         
-        sf.write(output_file, recording, sample_rate)
-        print(f"✓ Recording saved")
-        return output_file
+        # (frames, 1) -> (frames,) is a view of the same buffer, not a copy
+        audio = recording.reshape(-1)
+        print(f"✓ Recording captured")
+        
+        if archive_path:
+            self.archive_audio(audio, archive_path)
+        return audio
+    
+    def archive_audio(self, audio: np.ndarray, path: str):
+        """Write a recording to disk on a background thread"""
+        def write():
+            try:
+                sf.write(path, audio, self.SAMPLE_RATE)
+            except Exception as e:
+                print(f"⚠️ Could not archive recording to {path}: {e}")
+        
+        thread = threading.Thread(target=write, name="audio-archive")
+        thread.start()
+        self._archive_threads = [t for t in self._archive_threads if t.is_alive()] + [thread]
+    
+    def wait_for_archives(self):
+        """Block until every pending archive write has finished"""
+        for thread in self._archive_threads:
+            thread.join()
+        self._archive_threads = []
     
     def voice_interaction(self):
         """Complete voice interaction"""
@@ -151,31 +438,42 @@ class CarolineVoiceDemo:
         print("CAROLINE'S VOICE INTERACTION")
         print("="*70)
         
-        # Record user speech
-        input("Press ENTER to start recording (you'll have 5 seconds to speak)...")
-        audio_file = self.record_audio(duration=5)
+        # Record user speech until they pause
+        input("Press ENTER, then speak (recording stops when you pause)...")
+        archive_path = None
+        if self.archive_dir:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            archive_path = os.path.join(
+                self.archive_dir, f"user_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.wav"
+            )
+        audio = self.record_audio(archive_path=archive_path)
+        if not audio.size:
+            print("🤔 I didn't hear anything. Please try again.")
+            return None
+        speech_ended = time.perf_counter() - self.recorder.silence_seconds
         
-        # Transcribe
-        user_text = self.speech_to_text(audio_file)
+        # Transcribe straight from the in-memory buffer
+        user_text = self.speech_to_text(audio)
         
         # Get response
         response = self.get_response(user_text)
+        print(f"⏱️ Response ready {time.perf_counter() - speech_ended:.2f}s after you stopped speaking")
         print(f"\n💭 Caroline: {response}\n")
         
-        # Generate and play speech
-        audio_output = "caroline_response.mp3"
-        self.text_to_speech(response, audio_output)
-        
+        # Stream Caroline's voice in the background; the next turn can start
+        # while she is still talking
+        audio_output = None
         play = input("Play Caroline's voice response? (y/n): ").lower()
         if play == 'y':
-            self.play_audio(audio_output)
+            audio_output = self.speech_files(response)
+            self.speak(response, wait=False)
         
         # Log conversation
-        self.conversation_history.append({
+        self.log_turn({
             "timestamp": datetime.now().isoformat(),
             "user": user_text,
             "caroline": response,
-            "user_audio": audio_file,
+            "user_audio": archive_path,
             "response_audio": audio_output
         })
         
@@ -191,15 +489,14 @@ class CarolineVoiceDemo:
         response = self.get_response(user_input)
         print(f"💭 Caroline: {response}")
         
-        # Generate TTS
-        audio_file = f"response_{len(self.conversation_history)}.mp3"
-        self.text_to_speech(response, audio_file)
-        
+        # Stream TTS only if the user wants to hear it
+        audio_file = None
         play = input("\nPlay audio response? (y/n): ").lower()
         if play == 'y':
-            self.play_audio(audio_file)
+            audio_file = self.speech_files(response)
+            self.speak(response, wait=False)
         
-        self.conversation_history.append({
+        self.log_turn({
             "timestamp": datetime.now().isoformat(),
             "user": user_input,
             "caroline": response,
@@ -208,15 +505,16 @@ class CarolineVoiceDemo:
         
         return {"user": user_input, "response": response}
     
-    def save_conversation(self, filename: str = "caroline_conversation.json"):
-        """Save conversation history"""
-        with open(filename, 'w') as f:
-            json.dump({
-                "session_start": self.conversation_history[0]["timestamp"] if self.conversation_history else None,
-                "total_interactions": len(self.conversation_history),
-                "history": self.conversation_history
-            }, f, indent=2)
-        print(f"\n✓ Conversation saved to {filename}")
+    def save_conversation(self):
+        """Flush the conversation log (every turn is already on disk as it happens)"""
+        self.wait_for_archives()
+        self.conversation_log.close()
+        self.stt_cache.flush()
+        print(f"\n✓ {len(self.conversation_log)} turns of session {self.conversation_log.session} "
+              f"saved to {self.conversation_log.path}")
+        stats = self.stt_cache.stats()
+        print(f"✓ Transcription cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate)")
 
 
 def main():
@@ -227,16 +525,25 @@ def main():
     print("\nHarvard Biostatistics | Healthcare AI | Research Innovation")
     print()
     
-    demo = CarolineVoiceDemo()
+    # Whisper loads in the background so text chat is usable immediately
+    demo = CarolineVoiceDemo(warm_up=True,
+                             tts_backend=os.environ.get("CAROLINE_TTS_BACKEND", "gtts"),
+                             decoding_profile=os.environ.get("CAROLINE_STT_PROFILE", "balanced"),
+                             archive_dir=os.environ.get("CAROLINE_ARCHIVE_DIR") or None)
+    
+    # First launch (or edited answers): render the canned answers in the background
+    if demo.voice_bank.stale(demo.voice_bank_texts(), demo.tts_key):
+        demo.build_voice_bank(background=True)
     
     print("\nSelect interaction mode:")
     print("1. Voice Interaction (speak with Caroline)")
     print("2. Text Chat (type with TTS responses)")
     print("3. Run Demo Sequence")
     print("4. Exit")
+    print("5. Hands-free Conversation (pipelined, say 'goodbye' to stop)")
     
     while True:
-        choice = input("\nYour choice (1-4): ").strip()
+        choice = input("\nYour choice (1-5): ").strip()
         
         if choice == "1":
             demo.voice_interaction()
@@ -259,12 +566,11 @@ def main():
                 response = demo.get_response(question)
                 print(f"💭 Caroline: {response}\n")
                 
-                audio_file = f"demo_{len(demo.conversation_history)}.mp3"
-                demo.text_to_speech(response, audio_file)
                 print("Playing audio...")
-                demo.play_audio(audio_file)
+                audio_file = demo.speech_files(response)
+                demo.speak(response, wait=False)
                 
-                demo.conversation_history.append({
+                demo.log_turn({
                     "timestamp": datetime.now().isoformat(),
                     "user": question,
                     "caroline": response,
@@ -272,14 +578,20 @@ def main():
                 })
                 
                 input("Press ENTER for next question...")
+                # Skip whatever is left of this answer
+                demo.player.stop()
         
         elif choice == "4":
+            demo.player.stop()
             demo.save_conversation()
             print("\nThank you for chatting with Caroline's AI!")
             break
         
+        elif choice == "5":
+            asyncio.run(VoicePipeline(demo).run())
+        
         else:
-            print("Invalid choice. Please select 1-4.")
+            print("Invalid choice. Please select 1-5.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+HTTP/WebSocket Server for Caroline's Agent
+Serves the digital twin to many kiosks at once instead of one input() loop.
+
+Endpoints:
+    POST /chat               {"session": id?, "message": text} -> answer as JSON
+    POST /voice?session=id   a recorded question (WAV body) -> transcript, answer and audio URL
+    GET  /audio/{key}        synthesized audio for an answer
+    GET  /ws?session=id      WebSocket: binary frames of 16 kHz mono 16-bit PCM followed by
+                             {"type": "end"}, or {"type": "text", "message": ...}; the reply is
+                             a "transcript"/"response" message, the answer's audio one sentence
+                             per binary frame (each announced by an "audio" message) and "done"
+    GET  /health, /metrics
+
+Every connection belongs to a session with its own bounded queue of turns
+and worker, so one kiosk's turns run in order and never see another's
+state. The Whisper model, TTS backend and caches (one ``CarolineVoiceDemo``)
+and the knowledge index are loaded once and shared. In-process
+transcription runs on one thread, since a Whisper model must not decode two
+clips at once; answering (routing plus the knowledge-index fallback) runs
+on the loop's default executor and synthesis on a small thread pool, and
+every turn is appended to one shared conversation log by a single writer
+thread, so the event loop only routes. Backpressure: an HTTP turn arriving at a full session queue
+gets 429, a new session beyond ``max_sessions`` gets 503, and a WebSocket
+whose queue is full simply stops being read until its turns drain.
+With ``--stt-workers N`` transcription moves off this process onto the
+micro-batching worker pool in stt_service.py, which is how to transcribe
+several utterances at once.
+
+Usage: python caroline_server.py [--port 8080] [--no-voice] [--profile fast] [--tts tone]
+       python bench_server.py --sessions 50
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from aiohttp import WSMsgType, web
+
+from conversation_log import ConversationLog
+from interactive_demo import InteractiveCarolineAgent
+
+SAMPLE_RATE = 16000
+
+
+def percentiles(samples, points=(50, 99)) -> dict:
+    """``{"p50": ..., "p99": ...}`` of ``samples`` (nearest rank), empty if there are none."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    return {f"p{point}": ordered[min(len(ordered) - 1, int(len(ordered) * point / 100))] for point in points}
+
+
+def decode_wav(data: bytes):
+    """A WAV/FLAC upload as 16 kHz mono float32, the way Whisper wants it."""
+    import numpy as np
+    import soundfile as sf
+
+    audio, rate = sf.read(io.BytesIO(data), dtype="float32", always_2d=True)
+    audio = audio.mean(axis=1)
+    if rate != SAMPLE_RATE and len(audio):
+        positions = np.arange(0, len(audio), rate / SAMPLE_RATE)
+        audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+
+def decode_pcm16(data: bytes):
+    import numpy as np
+
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+
+
+class Session:
+    """One kiosk conversation: its queue of turns and the worker that runs them."""
+
+    def __init__(self, session_id: str, queue_size: int):
+        self.id = session_id
+        self.inbox = asyncio.Queue(queue_size)
+        self.turns = 0
+        self.last_active = time.monotonic()
+        self.sockets = 0
+        self.worker = None
+
+    @property
+    def busy(self) -> bool:
+        return self.sockets > 0 or not self.inbox.empty()
+
+
+class CarolineServer:
+    """Session registry, shared models and the aiohttp handlers."""
+
+    def __init__(self, voice: bool = True, max_sessions: int = 256, queue_size: int = 4,
+                 tts_threads: int = 4, session_ttl: float = 600.0,
+                 conversation_log: str = "caroline_server_conversations.jsonl", history_window: int = 20,
+                 decoding_profile: str = "fast", tts_backend: str = "gtts", max_upload_seconds: float = 30.0,
+                 stt_workers: int = 0, stt_worker_threads: int = 1):
+        self.voice = voice
+        self.max_sessions = max_sessions
+        self.queue_size = queue_size
+        self.session_ttl = session_ttl
+        # One log for every session: a single file handle, fsyncs batched across kiosks
+        self.log = ConversationLog(conversation_log, window=history_window, session="server")
+        self.decoding_profile = decoding_profile
+        self.tts_backend = tts_backend
+        self.max_upload_bytes = int(max_upload_seconds * SAMPLE_RATE * 2)
+        self.sessions = {}
+        self.chat_agent = InteractiveCarolineAgent()
+        self.demo = None
+        self.latencies = {"chat": deque(maxlen=10000), "voice": deque(maxlen=10000)}
+        self.turns = 0
+        self.rejected = 0
+        # One thread: the shared Whisper model is not safe to call concurrently
+        self._stt_pool = ThreadPoolExecutor(1, thread_name_prefix="stt")
+        self._tts_pool = ThreadPoolExecutor(tts_threads, thread_name_prefix="tts")
+        # One thread keeps the log's appends (and their fsyncs) off the event loop, in order
+        self._log_pool = ThreadPoolExecutor(1, thread_name_prefix="log")
+        self._sweeper = None
+        # With stt_workers, transcription moves to a pool of worker processes (stt_service.py)
+        self.stt_workers = stt_workers
+        self.stt_worker_threads = stt_worker_threads
+        self.stt_service = None
+
+    # --- lifecycle -----------------------------------------------------
+
+    def app(self) -> web.Application:
+        # Room for the longest allowed WAV upload plus its header
+        app = web.Application(client_max_size=self.max_upload_bytes * 2 + 65536)
+        app.add_routes([
+            web.post("/chat", self.handle_chat),
+            web.post("/voice", self.handle_voice),
+            web.get("/audio/{key}", self.handle_audio),
+            web.get("/ws", self.handle_ws),
+            web.get("/health", self.handle_health),
+            web.get("/metrics", self.handle_metrics),
+        ])
+        app.on_startup.append(self._startup)
+        app.on_cleanup.append(self._cleanup)
+        return app
+
+    async def _startup(self, app):
+        loop = asyncio.get_running_loop()
+        # Load the shared knowledge index (and voice models) before the first kiosk connects
+        await loop.run_in_executor(None, self.chat_agent.retrieve, "warm up")
+        if self.voice:
+            self.demo = await loop.run_in_executor(None, self._load_voice)
+        self._sweeper = asyncio.create_task(self._sweep())
+        print(f"✓ Caroline's server ready ({'voice and text' if self.voice else 'text only'})")
+
+    def _load_voice(self):
+        from caroline_interactive_with_speech import CarolineVoiceDemo
+
+        demo = CarolineVoiceDemo(warm_up=not self.stt_workers, tts_backend=self.tts_backend,
+                                 decoding_profile=self.decoding_profile)
+        demo.knowledge_index  # the same shared index the chat agent uses
+        if self.stt_workers:
+            from stt_service import STTService
+
+            self.stt_service = STTService(self.stt_workers, self.stt_worker_threads, demo.profile,
+                                          cache=demo.stt_cache)
+        return demo
+
+    async def _cleanup(self, app):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        for session in list(self.sessions.values()):
+            self._close_session(session)
+        self._stt_pool.shutdown(wait=False, cancel_futures=True)
+        self._tts_pool.shutdown(wait=False, cancel_futures=True)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._log_pool.shutdown)
+        await loop.run_in_executor(None, self.log.close)
+        if self.stt_service is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.stt_service.close, 10.0)
+
+    async def _sweep(self):
+        """Drop sessions that have been idle for longer than session_ttl."""
+        while True:
+            await asyncio.sleep(min(30.0, self.session_ttl))
+            now = time.monotonic()
+            for session in list(self.sessions.values()):
+                if not session.busy and now - session.last_active > self.session_ttl:
+                    self._close_session(session)
+
+    # --- sessions and turns --------------------------------------------
+
+    def session_for(self, session_id: str = None) -> Session:
+        """The caller's session, or a new one; raises 503 when the server is full."""
+        session = self.sessions.get(session_id) if session_id else None
+        if session is None:
+            if len(self.sessions) >= self.max_sessions:
+                self.rejected += 1
+                raise web.HTTPServiceUnavailable(text=json.dumps({"error": "too many sessions"}),
+                                                 content_type="application/json", headers={"Retry-After": "5"})
+            session = Session(session_id or uuid.uuid4().hex[:12], self.queue_size)
+            session.worker = asyncio.create_task(self._run_session(session))
+            self.sessions[session.id] = session
+        session.last_active = time.monotonic()
+        return session
+
+    def _close_session(self, session: Session):
+        self.sessions.pop(session.id, None)
+        if session.worker is not None:
+            session.worker.cancel()
+
+    async def _run_session(self, session: Session):
+        """Run a session's turns one at a time, in the order they arrived."""
+        while True:
+            run, future = await session.inbox.get()
+            if future.cancelled():
+                continue
+            try:
+                result = await run(session)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            session.last_active = time.monotonic()
+
+    async def enqueue(self, session: Session, run, wait_for_room: bool = False) -> asyncio.Future:
+        """Queue ``run(session)`` on the session; the future resolves to its result.
+
+        Without ``wait_for_room`` a full queue is answered with 429 instead of waiting.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if wait_for_room:
+            await session.inbox.put((run, future))
+        else:
+            try:
+                session.inbox.put_nowait((run, future))
+            except asyncio.QueueFull:
+                self.rejected += 1
+                raise web.HTTPTooManyRequests(text=json.dumps({"error": "session busy", "session": session.id}),
+                                              content_type="application/json", headers={"Retry-After": "1"})
+        return future
+
+    def _finish(self, session: Session, kind: str, started: float, entry: dict) -> float:
+        latency = time.perf_counter() - started
+        self.latencies[kind].append(latency)
+        self.turns += 1
+        session.turns += 1
+        record = {"session": session.id, "turn": session.turns, "timestamp": datetime.now().isoformat(),
+                  "mode": kind, "latency_ms": round(latency * 1000, 1), **entry}
+        written = asyncio.get_running_loop().run_in_executor(self._log_pool, self.log.append, record)
+        written.add_done_callback(_report_log_failure)
+        return latency
+
+    async def answer_text(self, session: Session, message: str, started: float) -> dict:
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(None, self.chat_agent.respond_to_question, message)
+        latency = self._finish(session, "chat", started, {"user": message, "caroline": response})
+        return {"session": session.id, "response": response, "latency_ms": round(latency * 1000, 1)}
+
+    async def voice_response(self, transcript: str) -> str:
+        return await asyncio.get_running_loop().run_in_executor(None, self.demo.get_response, transcript)
+
+    async def transcribe(self, audio) -> str:
+        if self.stt_service is not None:
+            return await self.stt_service.transcribe_async(audio)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._stt_pool, lambda: self.demo.speech_to_text(audio, verbose=False))
+
+    def synthesize(self, text: str) -> asyncio.Future:
+        """Audio file for ``text`` from the voice bank, the TTS cache or the TTS backend."""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._tts_pool, self.demo._audio_for, text, False)
+
+    # --- handlers ------------------------------------------------------
+
+    def _require_voice(self):
+        if self.demo is None:
+            raise web.HTTPNotImplemented(text=json.dumps({"error": "voice is disabled on this server"}),
+                                         content_type="application/json")
+
+    async def handle_chat(self, request: web.Request) -> web.Response:
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        if not isinstance(body, dict):
+            raise web.HTTPBadRequest(text='{"error": "expected a JSON object"}', content_type="application/json")
+        message = str(body.get("message", "")).strip()
+        if not message:
+            raise web.HTTPBadRequest(text='{"error": "message is empty"}', content_type="application/json")
+        started = time.perf_counter()
+        session = self.session_for(body.get("session"))
+
+        async def run(session):
+            return await self.answer_text(session, message, started)
+
+        future = await self.enqueue(session, run)
+        return web.json_response(await future)
+
+    async def handle_voice(self, request: web.Request) -> web.Response:
+        self._require_voice()
+        data = await request.read()
+        if not data:
+            raise web.HTTPBadRequest(text='{"error": "empty upload"}', content_type="application/json")
+        started = time.perf_counter()
+        session = self.session_for(request.query.get("session"))
+
+        async def run(session):
+            decoding = asyncio.get_running_loop().run_in_executor(self._tts_pool, decode_wav, data)
+            try:
+                audio = await decoding
+            except (RuntimeError, ValueError) as e:
+                # soundfile's errors for data it can't read are RuntimeErrors
+                raise web.HTTPBadRequest(text=json.dumps({"error": f"unreadable audio: {e}"}),
+                                         content_type="application/json")
+            transcript = await self.transcribe(audio)
+            response = await self.voice_response(transcript)
+            await self.synthesize(response)
+            latency = self._finish(session, "voice", started, {"user": transcript, "caroline": response})
+            return {"session": session.id, "transcript": transcript, "response": response,
+                    "audio_url": f"/audio/{self.demo.tts_key(response)}", "latency_ms": round(latency * 1000, 1)}
+
+        future = await self.enqueue(session, run)
+        return web.json_response(await future)
+
+    async def handle_audio(self, request: web.Request) -> web.StreamResponse:
+        self._require_voice()
+        key = request.match_info["key"]
+        if not key.isalnum():
+            raise web.HTTPNotFound()
+        path = self.demo.voice_bank.lookup(key) or self.demo.tts_cache.get(key)
+        if path is None:
+            raise web.HTTPNotFound()
+        return web.FileResponse(path)
+
+    async def handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        session = self.session_for(request.query.get("session"))
+        ws = web.WebSocketResponse(heartbeat=30, max_msg_size=self.max_upload_bytes)
+        await ws.prepare(request)
+        await ws.send_json({"type": "session", "session": session.id})
+        session.sockets += 1
+        pcm = bytearray()
+        try:
+            async for message in ws:
+                if message.type == WSMsgType.BINARY:
+                    if len(pcm) + len(message.data) > self.max_upload_bytes:
+                        pcm.clear()
+                        await ws.send_json({"type": "error", "error": "utterance too long"})
+                    else:
+                        pcm.extend(message.data)
+                    continue
+                if message.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    command = json.loads(message.data)
+                except ValueError:
+                    await ws.send_json({"type": "error", "error": "expected JSON"})
+                    continue
+                started = time.perf_counter()
+                if command.get("type") == "text":
+                    run = self._ws_text_turn(ws, str(command.get("message", "")), started)
+                elif command.get("type") == "end":
+                    if self.demo is None or len(pcm) % 2:
+                        error = "voice is disabled on this server" if self.demo is None else "expected 16-bit PCM"
+                        await ws.send_json({"type": "error", "error": error})
+                        pcm.clear()
+                        continue
+                    run = self._ws_voice_turn(ws, bytes(pcm), started)
+                    pcm.clear()
+                else:
+                    await ws.send_json({"type": "error", "error": f"unknown message type {command.get('type')!r}"})
+                    continue
+                # A full queue stops this loop, and so the reads from this kiosk, until a turn finishes
+                future = await self.enqueue(session, run, wait_for_room=True)
+                future.add_done_callback(_report_failure)
+        finally:
+            session.sockets -= 1
+            session.last_active = time.monotonic()
+        return ws
+
+    def _ws_text_turn(self, ws, message: str, started: float):
+        async def run(session):
+            result = await self.answer_text(session, message, started)
+            await ws.send_json({"type": "response", "text": result["response"]})
+            await ws.send_json({"type": "done", "latency_ms": result["latency_ms"]})
+        return run
+
+    def _ws_voice_turn(self, ws, pcm: bytes, started: float):
+        async def run(session):
+            transcript = await self.transcribe(decode_pcm16(pcm))
+            await ws.send_json({"type": "transcript", "text": transcript})
+            response = await self.voice_response(transcript)
+            await ws.send_json({"type": "response", "text": response})
+            # Synthesize every sentence up front; send them in order as they finish
+            segments = [self.synthesize(segment) for segment in self.demo.speech_segments(response)]
+            for index, pending in enumerate(segments):
+                path = await pending
+                with open(path, "rb") as f:
+                    audio = f.read()
+                await ws.send_json({"type": "audio", "index": index, "format": path.rsplit(".", 1)[-1]})
+                await ws.send_bytes(audio)
+            latency = self._finish(session, "voice", started, {"user": transcript, "caroline": response})
+            await ws.send_json({"type": "done", "latency_ms": round(latency * 1000, 1)})
+        return run
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok", "voice": self.demo is not None, "sessions": len(self.sessions)})
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        return web.json_response(self.metrics())
+
+    def metrics(self) -> dict:
+        depths = [session.inbox.qsize() for session in self.sessions.values()]
+        latency = {kind: {name: round(value * 1000, 1) for name, value in percentiles(samples).items()}
+                   for kind, samples in self.latencies.items() if samples}
+        return {"sessions": len(self.sessions), "turns": self.turns, "rejected": self.rejected,
+                "queued": sum(depths), "max_queue_depth": max(depths, default=0),
+                "stt_backlog": self._stt_pool._work_queue.qsize(), "tts_backlog": self._tts_pool._work_queue.qsize(),
+                "latency_ms": latency, **({"stt": self.stt_service.metrics()} if self.stt_service else {})}
+
+
+def _report_failure(future: asyncio.Future):
+    if not future.cancelled() and future.exception() is not None:
+        print(f"⚠️ WebSocket turn failed: {future.exception()}")
+
+
+def _report_log_failure(future: asyncio.Future):
+    if not future.cancelled() and future.exception() is not None:
+        print(f"⚠️ Could not log a turn: {future.exception()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Caroline's agent over HTTP and WebSockets")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--no-voice", action="store_true", help="text chat only (no Whisper or TTS)")
+    parser.add_argument("--profile", default="fast", help="Whisper decoding profile")
+    parser.add_argument("--tts", default="gtts", help='TTS backend ("gtts", "pyttsx3" or "tone")')
+    parser.add_argument("--max-sessions", type=int, default=256)
+    parser.add_argument("--queue-size", type=int, default=4, help="turns a session may have waiting")
+    parser.add_argument("--tts-threads", type=int, default=4, help="concurrent syntheses")
+    parser.add_argument("--stt-workers", type=int, default=0,
+                        help="transcribe on this many worker processes, in micro-batches "
+                             "(0: in-process, one utterance at a time)")
+    parser.add_argument("--stt-worker-threads", type=int, default=1, help="torch threads per STT worker")
+    args = parser.parse_args()
+
+    server = CarolineServer(voice=not args.no_voice, max_sessions=args.max_sessions, queue_size=args.queue_size,
+                            tts_threads=args.tts_threads,
+                            decoding_profile=args.profile, tts_backend=args.tts,
+                            stt_workers=args.stt_workers, stt_worker_threads=args.stt_worker_threads)
+    web.run_app(server.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Append-Only Conversation Log for Caroline's Voice Agent
+Writes each turn to disk as it happens instead of dumping the whole session at exit.
+
+The log is a JSON Lines file: one turn per line, tagged with the session
+id and its turn number, appended by every session that uses the same file.
+Each append reaches the OS immediately (a crash of the demo loses nothing),
+while ``fsync`` is batched every ``sync_every`` turns or at most
+``sync_interval`` seconds after a turn, whether or not another turn follows
+(a power cut loses at most one batch). Only the last ``window`` turns are
+kept in memory. A log shared by several sessions (the server's) gets each
+record's ``session`` and ``turn`` in the entry itself.
+
+Past sessions are read back by streaming the file line by line, or by
+building a small byte-offset index and seeking straight to one session.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+
+
+class ConversationLog:
+    """JSONL log of one session's turns with a bounded in-memory window."""
+
+    def __init__(self, path: str = "caroline_conversation.jsonl", window: int = 50,
+                 sync_every: int = 8, sync_interval: float = 1.0, session: str = None):
+        self.path = path
+        self.session = session or datetime.now().strftime("%Y%m%dT%H%M%S-") + uuid.uuid4().hex[:6]
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.recent = deque(maxlen=window)
+        self.count = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = None
+        self._timer = None
+
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            if self._file.tell():
+                with open(self.path, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        # Terminate the line an interrupted writer left half-written,
+                        # so this session's first turn isn't glued onto it
+                        self._file.write("\n")
+        return self._file
+
+    def append(self, entry: dict) -> dict:
+        """Record one turn; returns the entry as written (with session and turn, unless the entry has them)."""
+        record = {"session": self.session, "turn": self.count + 1, **entry}
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            f = self._open()
+            f.write(line)
+            f.flush()
+            self.count += 1
+            self.recent.append(record)
+            self._unsynced += 1
+            if (self._unsynced >= self.sync_every
+                    or time.monotonic() - self._last_sync >= self.sync_interval):
+                self._sync()
+            elif self._timer is None:
+                # The last turns before a pause still reach the disk within sync_interval
+                self._timer = threading.Timer(self.sync_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return record
+
+    def _sync(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def flush(self):
+        """Force every recorded turn onto disk."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            self._sync()
+
+    def close(self):
+        """Flush and close the file; a later append reopens it."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def __len__(self):
+        return self.count
+
+
+def _lines(path: str, offset: int = 0):
+    """Yield ``(offset, record)`` for every complete line from ``offset`` on."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while True:
+            start = f.tell()
+            line = f.readline()
+            if not line:
+                return
+            if not line.endswith(b"\n"):
+                # Half-written last line from a crash mid-append
+                return
+            try:
+                yield start, json.loads(line)
+            except ValueError:
+                continue
+
+
+def read_log(path: str = "caroline_conversation.jsonl", session: str = None):
+    """Stream turns from a log, optionally only those of one session."""
+    if not os.path.exists(path):
+        return
+    for _, record in _lines(path):
+        if session is None or record.get("session") == session:
+            yield record
+
+
+def index_sessions(path: str = "caroline_conversation.jsonl") -> dict:
+    """
+    Summarize every session in a log without keeping its turns.
+
+    Returns ``{session: {"offsets": [...], "turns": n, "start": ts, "end": ts}}``
+    in first-seen order; the byte offsets let ``read_session`` seek directly.
+    """
+    index = {}
+    if not os.path.exists(path):
+        return index
+    for offset, record in _lines(path):
+        info = index.setdefault(record.get("session"), {"offsets": [], "turns": 0,
+                                                        "start": record.get("timestamp"), "end": None})
+        info["offsets"].append(offset)
+        info["turns"] += 1
+        info["end"] = record.get("timestamp")
+    return index
+
+
+def read_session(path: str, session: str, index: dict = None) -> list:
+    """Load the turns of one session, seeking by index instead of scanning."""
+    index = index if index is not None else index_sessions(path)
+    info = index.get(session)
+    if info is None:
+        return []
+    turns = []
+    with open(path, "rb") as f:
+        for offset in info["offsets"]:
+            f.seek(offset)
+            turns.append(json.loads(f.readline()))
+    return turns
+
+
+def main():
+    """List the sessions in a log: python conversation_log.py [path]"""
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "caroline_conversation.jsonl"
+    index = index_sessions(path)
+    if not index:
+        print(f"No conversations in {path}")
+        return
+    for session, info in index.items():
+        print(f"{session}  {info['turns']:4d} turns  {info['start']} → {info['end']}")
+
+
+if __name__ == "__main__":
+    main()
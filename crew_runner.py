@@ -0,0 +1,130 @@
+"""
+Parallel Crew Runner for Caroline's CrewAI Agent
+Runs independent showcase tasks at the same time instead of one after another.
+
+Each task is declared with the names of the tasks whose output it needs.
+Tasks whose dependencies are done run concurrently on a thread pool (at
+most ``max_workers`` at a time), each in a one-task ``Crew`` with its own
+agent, because CrewAI agents keep per-run state and are not safe to share
+between threads. A dependent task receives its dependencies' ``Task``
+objects as ``context``, exactly as a sequential crew would pass them.
+
+Results always come back in declaration order, whatever order the tasks
+finish in, so output is deterministic. With no dependencies the whole
+showcase takes about as long as its slowest task.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class CrewTask:
+    """A named task factory, the names of the tasks it depends on and the file it produces."""
+
+    def __init__(self, name: str, build, depends_on=(), output_file: str = None):
+        self.name = name
+        self.build = build
+        self.depends_on = tuple(depends_on)
+        self.output_file = output_file
+
+
+class TaskResult:
+    """Output of one task and how long it took."""
+
+    def __init__(self, name: str, output, seconds: float, task=None):
+        self.name = name
+        self.output = output
+        self.seconds = seconds
+        self.task = task
+
+    def __str__(self):
+        return str(self.output)
+
+
+def _check_graph(tasks: list):
+    """Reject unknown dependencies and cycles before anything runs."""
+    names = [task.name for task in tasks]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate task names: {names}")
+    known = set(names)
+    for task in tasks:
+        missing = [dep for dep in task.depends_on if dep not in known]
+        if missing:
+            raise ValueError(f"Task '{task.name}' depends on unknown tasks: {', '.join(missing)}")
+
+    done = set()
+    remaining = list(tasks)
+    while remaining:
+        ready = [task for task in remaining if set(task.depends_on) <= done]
+        if not ready:
+            raise ValueError(f"Dependency cycle among: {', '.join(task.name for task in remaining)}")
+        done.update(task.name for task in ready)
+        remaining = [task for task in remaining if task.name not in done]
+
+
+def run_graph(tasks: list, execute, max_workers: int = 4) -> list:
+    """
+    Run ``execute(task, dependency_results)`` for every task, respecting dependencies.
+
+    ``dependency_results`` maps each dependency's name to its TaskResult.
+    Returns TaskResults in the order ``tasks`` was given. The first failure
+    cancels everything not yet started and is re-raised.
+    """
+    _check_graph(tasks)
+    results = {}
+    pending = list(tasks)
+    running = {}
+
+    def timed(task, deps):
+        start = time.perf_counter()
+        output = execute(task, deps)
+        if isinstance(output, TaskResult):
+            output.seconds = time.perf_counter() - start
+            return output
+        return TaskResult(task.name, output, time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crew-task") as pool:
+        while pending or running:
+            for task in [t for t in pending if set(t.depends_on) <= results.keys()]:
+                pending.remove(task)
+                deps = {name: results[name] for name in task.depends_on}
+                running[pool.submit(timed, task, deps)] = task
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                task = running.pop(future)
+                try:
+                    results[task.name] = future.result()
+                except Exception:
+                    for other in running:
+                        other.cancel()
+                    raise
+
+    return [results[task.name] for task in tasks]
+
+
+def kickoff_task(task: CrewTask, deps: dict, make_agent, verbose: bool = False) -> TaskResult:
+    """Build a fresh agent and Task for ``task`` and run it in its own one-task crew."""
+    from crewai import Crew, Process
+
+    agent = make_agent(task.name)
+    crew_task = task.build(agent)
+    if deps:
+        crew_task.context = [result.task for result in deps.values()]
+    crew = Crew(agents=[agent], tasks=[crew_task], process=Process.sequential, verbose=verbose)
+    output = crew.kickoff()
+    return TaskResult(task.name, output, 0.0, task=crew_task)
+
+
+def run_parallel(tasks: list, make_agent, max_workers: int = 4, verbose: bool = False) -> list:
+    """Run CrewTasks concurrently, each with an agent from ``make_agent(task_name)``."""
+    start = time.perf_counter()
+    results = run_graph(tasks, lambda task, deps: kickoff_task(task, deps, make_agent, verbose), max_workers)
+    wall = time.perf_counter() - start
+
+    print("\n⏱️ Task timings")
+    for result in results:
+        print(f"   {result.name:<14}{result.seconds:7.1f}s")
+    total = sum(result.seconds for result in results)
+    print(f"   wall clock {wall:.1f}s for {total:.1f}s of task time ({total / wall if wall else 0:.1f}x)")
+    return results
@@ -0,0 +1,131 @@
+"""
+Whisper Decoding Profiles for Caroline's Voice Agent
+Named latency/accuracy trade-offs for speech recognition.
+
+A profile fixes everything that decides how long a transcription takes:
+
+- model size (tiny ... small)
+- greedy or beam-search decoding, with or without temperature fallback
+- fp32 or int8 dynamically quantized CPU inference
+- torch thread count
+- whether leading/trailing silence is trimmed off before decoding
+
+``python bench_stt_profiles.py`` measures the real-time factor and word
+error rate of every profile so the fastest one that is accurate enough can
+be picked for a machine.
+"""
+
+import speech_models
+
+# Whisper's own fallback schedule: retry hotter when a decode looks degenerate
+FALLBACK_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+
+
+class DecodingProfile:
+    """One named Whisper configuration."""
+
+    def __init__(self, name: str, model_size: str = "base", beam_size: int = None,
+                 temperature_fallback: bool = True, int8: bool = False, threads: int = None,
+                 vad_trim: bool = False, description: str = ""):
+        self.name = name
+        self.model_size = model_size
+        self.beam_size = beam_size
+        self.temperature_fallback = temperature_fallback
+        self.int8 = int8
+        self.threads = threads
+        self.vad_trim = vad_trim
+        self.description = description
+
+    @property
+    def model_name(self) -> str:
+        """Model identity for cache keys; int8 weights can change transcripts."""
+        return self.model_size + ("-int8" if self.int8 else "")
+
+    def uses_fp16(self, device=None) -> bool:
+        """Whisper's own default: fp16 on CUDA, fp32 on the CPU (where int8 always runs)."""
+        if self.int8:
+            return False
+        if device is None:
+            import torch
+            return torch.cuda.is_available()
+        return str(device).startswith("cuda")
+
+    def transcribe_options(self, language: str = "en", device=None) -> dict:
+        """Keyword arguments for ``model.transcribe`` on ``device`` (None: Whisper's default device)."""
+        options = {
+            "language": language,
+            "temperature": FALLBACK_TEMPERATURES if self.temperature_fallback else 0.0,
+            # Questions are short; conditioning on earlier windows only adds work
+            "condition_on_previous_text": self.temperature_fallback,
+            "fp16": self.uses_fp16(device),
+        }
+        if self.beam_size:
+            options["beam_size"] = self.beam_size
+        return options
+
+    def load_model(self, device: str = None, model_size: str = None):
+        """Return the shared model for this profile and apply its thread count."""
+        if self.threads:
+            import torch
+            torch.set_num_threads(self.threads)
+        # int8 dynamic quantization is a CPU-only path
+        device = "cpu" if self.int8 else device
+        return speech_models.get_whisper_model(model_size or self.model_size, device, self.int8)
+
+    def warm_up(self, device: str = None, model_size: str = None):
+        device = "cpu" if self.int8 else device
+        return speech_models.warm_up(model_size or self.model_size, device, self.int8)
+
+    def __repr__(self):
+        return f"DecodingProfile({self.name!r}, {self.model_name}, beam={self.beam_size or 'greedy'})"
+
+
+PROFILES = {
+    "accurate": DecodingProfile(
+        "accurate", "small", beam_size=5,
+        description="small model, beam search, temperature fallback"),
+    "balanced": DecodingProfile(
+        "balanced", "base",
+        description="base model, greedy with temperature fallback (Whisper's defaults)"),
+    "fast": DecodingProfile(
+        "fast", "base", temperature_fallback=False, int8=True, vad_trim=True,
+        description="base model, int8, single greedy pass, silence trimmed"),
+    "fastest": DecodingProfile(
+        "fastest", "tiny", temperature_fallback=False, int8=True, vad_trim=True,
+        description="tiny model, int8, single greedy pass, silence trimmed"),
+}
+
+DEFAULT_PROFILE = "balanced"
+
+
+def get_profile(profile) -> DecodingProfile:
+    """Look up a profile by name (profiles pass through unchanged)."""
+    if isinstance(profile, DecodingProfile):
+        return profile
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown decoding profile '{profile}'. Choose from: {', '.join(PROFILES)}") from None
+
+
+def trim_silence(audio, sample_rate: int = 16000, block_ms: int = 30, pad_ms: int = 150):
+    """
+    Cut leading and trailing silence off a float32 clip.
+
+    Uses the same energy VAD as live capture; ``pad_ms`` of audio is kept on
+    either side so word edges survive. Clips without detected speech are
+    returned unchanged.
+    """
+    import numpy as np
+
+    from audio_capture import EnergyVAD
+
+    block = sample_rate * block_ms // 1000
+    vad = EnergyVAD()
+    speech = [i for i in range(0, len(audio) - block + 1, block) if vad.is_speech(audio[i:i + block])]
+    if not speech:
+        return audio
+    pad = sample_rate * pad_ms // 1000
+    start = max(0, speech[0] - pad)
+    end = min(len(audio), speech[-1] + block + pad)
+    return np.ascontiguousarray(audio[start:end])
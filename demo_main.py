@@ -7,83 +7,40 @@ A demonstration version that shows what the agent would do without requiring Ope
 import os
 from datetime import datetime
 
+from file_writer import default_writer
+from persona_store import load_persona
+
 class MockCarolineAgent:
     """Mock version of Caroline's agent for demonstration purposes."""
     
-    def __init__(self):
-        self.role = 'Biostatistics AI Researcher & Healthcare Innovation Specialist'
-        self.responses = {
-            'introduction': """Hi everyone! I'm Caroline Song, a Harvard Master's in Biostatistics student with a perfect GPA, combining my biomedical engineering background from the University of Sydney with cutting-edge AI research. I'm currently working on cardiovascular risk modeling using cooperative learning to integrate genomic, cardiac MRI, and clinical data - it's fascinating how we can predict health outcomes by combining multiple data modalities! Having worked across Boston, Sydney, and Shenzhen, including at Tencent Healthcare on multimodal AI medical solutions, I'm passionate about making AI accessible globally and using it to solve healthcare's biggest challenges.""",
-            
-            'background': """I graduated top of my cohort from the University of Sydney with dual degrees in Biomedical Engineering and Medical Science, then came to Harvard where I maintain a 3.96 GPA while researching cardiovascular risk modeling and spatial transcriptomics. My technical expertise spans Python, R, TensorFlow, survival analysis, and cloud-native architectures, gained through research at Harvard and industry experience as a Solution Architecture Intern at Tencent Healthcare where I contributed to ¥20M+ POC deals. Currently, I'm developing polygenic hazard scores and multi-view cooperative learning frameworks while leading the Harvard Chan Biotechnology Club and mentoring students in career development.""",
-            
-            'research_capabilities': """As Caroline's digital representative, I can assist with a wide range of biostatistics and healthcare AI tasks:
-
-**Research Expertise:**
-- Cardiovascular risk modeling using cooperative learning and survival analysis
-- Spatial transcriptomics analysis for neuroimmune stress response studies  
-- Multi-view data integration combining genomic, cardiac MRI, and clinical data
-- Development of polygenic hazard scores from GWAS-derived SNPs
-- Time-dependent AUC and C-index model evaluation
-
-**Technical Skills:**
-- Statistical modeling: Cox regression, Negative Binomial regression, survival analysis
-- Machine Learning: Deep learning, cooperative learning, TensorFlow implementations
-- Programming: Python, R, SQL, cloud-native architecture (Docker, Kubernetes)
-- Data Analysis: Handling 10,000+ cell datasets, 100+ blood samples, clinical trial design
-
-**Healthcare AI Applications:**
-- Multimodal AI medical LLM solutions (from Tencent Healthcare experience)
-- Point-of-care device development (achieved 80% testing time reduction)
-- Clinical workflow integration and RAG implementations
-- Emergency room predictive coagulability assessment
-
-**Global Perspective:**
-- Cross-cultural healthcare implementation (Boston/Sydney/Shenzhen experience)
-- Executive-facing presentations for Southeast Asian healthcare executives
-- Industry-academic collaboration bridging research and practical applications
-
-I combine rigorous statistical methods with cutting-edge AI approaches, always focusing on interpretability vs. performance tradeoffs crucial for medical applications.""",
-            
-            'healthcare_ai': """Drawing from my unique experience spanning Harvard research and Tencent Healthcare industry work, I see multimodal AI medical LLMs as transformative for healthcare accessibility and precision. At Tencent, I learned that the biggest challenge isn't just building sophisticated AI models, but integrating them seamlessly into clinical workflows - healthcare professionals need tools that enhance rather than complicate their decision-making. My biostatistics background has taught me that in medical AI, interpretability often matters more than marginal performance gains; doctors need to understand why a model makes certain predictions, especially for life-critical decisions. The point-of-care devices I've worked on demonstrate this principle - by reducing testing time by 80% while maintaining accuracy, we enable faster emergency room decisions that can prevent heart attacks. Looking forward, I believe the future lies in globally accessible AI systems that can adapt to different healthcare contexts, which is why my multicultural experience across three continents helps me understand diverse implementation challenges and opportunities.""",
-            
-            'leadership_impact': """My leadership journey reflects a commitment to bridging technical excellence with meaningful community impact:
-
-**Harvard Chan Biotechnology Club Leadership:**
-As Chair of Marketing and Communication, I've organized workshops attended by 200+ participants, directly leading to 30 students securing internships in biotechnology and health policy. I increased student membership by 30% and strengthened partnerships with Analysis Group and Brigham and Women's Hospital, creating pathways for students to engage with industry leaders.
-
-**Industry Leadership at Tencent Healthcare:**
-I led 10 site visits for Southeast Asian industry and government executives, translating complex multimodal AI medical LLM capabilities into actionable business solutions. My work contributed to advancing 2 partnerships to POC stage, each valued at ~¥20M, demonstrating how technical expertise can drive substantial business impact.
-
-**Research Impact and Mentorship:**
-My research on platelet-neutrophil interactions has contributed to identifying novel drug targets that could reduce patient mortality rates in sepsis and cardiovascular disorders. I've co-authored peer-reviewed publications and presented at international conferences, fostering collaborations with Harvard Medical School. Through my point-of-care device development, I've helped create solutions that could save lives in emergency settings.
-
-**Cross-Cultural Bridge Building:**
-My multicultural perspective allows me to connect diverse stakeholders - from Harvard researchers to Chinese healthcare executives to Australian biomedical engineers. I've learned that the most impactful innovations happen when we combine technical depth with cultural sensitivity and global perspective.
-
-**Philosophy:** I believe in using technical excellence as a foundation for creating opportunities for others. Whether through organizing career workshops, leading international business delegations, or developing life-saving medical devices, my goal is always to amplify the impact beyond myself and create lasting positive change in healthcare accessibility worldwide."""
-        }
+    @property
+    def role(self):
+        return load_persona()["agent/role"]
+    
+    @property
+    def responses(self):
+        """Caroline's showcase answers, from the shared persona snapshot."""
+        return load_persona().section("showcase")
     
     def introduce_myself(self):
-        return self.responses['introduction']
+        return load_persona()['showcase/introduction']
     
     def explain_background(self):
-        return self.responses['background']
+        return load_persona()['showcase/background']
     
     def showcase_research(self):
-        return self.responses['research_capabilities']
+        return load_persona()['showcase/research_capabilities']
     
     def discuss_healthcare_ai(self):
-        return self.responses['healthcare_ai']
+        return load_persona()['showcase/healthcare_ai']
     
     def show_leadership_impact(self):
-        return self.responses['leadership_impact']
+        return load_persona()['showcase/leadership_impact']
 
 def save_to_file(filename, content):
-    """Save content to a file."""
-    with open(filename, 'w') as f:
-        f.write(content)
-    print(f"📄 Saved: {filename}")
+    """Save content to a file (written atomically in the background)."""
+    default_writer().write(filename, content)
+    print(f"📄 Saving: {filename}")
 
 def main():
     """Demo version of Caroline's CrewAI agent."""
@@ -133,6 +90,7 @@ def main():
     leadership = caroline.show_leadership_impact()
     print(leadership)
     save_to_file('caroline_leadership_impact.md', leadership)
+    default_writer().flush()
     
     # Summary
     print("\n" + "=" * 60)
@@ -147,7 +105,8 @@ def main():
     print(f"   📄 Generated files: caroline_research_capabilities.md, caroline_leadership_impact.md")
     
     print("\n🌟 Unique aspects demonstrated:")
-    print("   • Perfect academic record (3.96 Harvard GPA, 4.0 Sydney)")
+    print(f"   • Top academic record ({load_persona()['facts/harvard_gpa']} Harvard GPA, "
+          f"{load_persona()['facts/sydney_gpa']} Sydney)")
     print("   • Cutting-edge research (cooperative learning, survival analysis)")
     print("   • Industry impact (Tencent Healthcare, ¥20M+ deals)")
     print("   • Global perspective (Boston/Sydney/Shenzhen)")
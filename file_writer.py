@@ -0,0 +1,228 @@
+"""
+Background File Writer for Caroline's Agent
+Queues file writes to a writer thread so callers never wait on the disk.
+
+``write()`` only records the content and returns. A single background
+thread writes each file atomically (a temporary file in the same
+directory, then a rename), so a reader never sees a half-written file.
+Writes to a path that is still waiting in the queue are coalesced: only
+the newest content is written, once. ``flush()`` waits for queued writes
+(all of them, or one path's) and reports whether they all succeeded;
+failed paths and their errors are kept in ``errors``. The process-wide
+writer is flushed at exit.
+
+``create_async_file_writer_tool()`` puts the writer behind CrewAI's
+"File Writer Tool" interface, so an agent's tool call returns to the
+agent loop immediately instead of stalling on the write.
+"""
+
+import atexit
+import functools
+import os
+import tempfile
+import threading
+
+# Read once, while imports are still single-threaded; os.umask can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class AtomicFile:
+    """A file written under a temporary name and renamed over ``path`` by ``commit()``."""
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        try:
+            self.mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            self.mode = 0o666 & ~_UMASK
+        fd, self.tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+        self.file = os.fdopen(fd, "w", encoding="utf-8")
+
+    def write(self, text: str):
+        self.file.write(text)
+
+    def truncate(self):
+        self.file.seek(0)
+        self.file.truncate()
+
+    def commit(self):
+        """Replace ``path`` with what was written, keeping the file's mode."""
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+        self.file.close()
+        os.chmod(self.tmp_path, self.mode)
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self):
+        self.file.close()
+        try:
+            os.unlink(self.tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+def write_atomic(path: str, content: str, fsync: bool = True):
+    """Replace ``path`` with ``content`` in one rename, keeping the file's mode."""
+    f = AtomicFile(path, fsync)
+    try:
+        f.write(content)
+        f.commit()
+    except BaseException:
+        f.discard()
+        raise
+
+
+class BackgroundFileWriter:
+    """Writes files atomically on a background thread, newest content per path."""
+
+    def __init__(self, fsync: bool = True):
+        self.fsync = fsync
+        self.writes = 0
+        self.coalesced = 0
+        self.errors = {}
+        self._pending = {}  # path -> content, in the order paths were first queued
+        self._busy = None
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def write(self, path: str, content: str) -> str:
+        """Queue ``content`` for ``path`` and return the absolute path at once."""
+        path = os.path.abspath(path)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BackgroundFileWriter is closed")
+            if path in self._pending:
+                self.coalesced += 1
+            self._pending[path] = content
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="file-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        return path
+
+    def is_pending(self, path: str = None) -> bool:
+        """Whether ``path`` (or anything, if None) still has a write queued or in progress."""
+        with self._cond:
+            return self._is_pending(path and os.path.abspath(path))
+
+    def _is_pending(self, path) -> bool:
+        if path is None:
+            return bool(self._pending) or self._busy is not None
+        return path in self._pending or self._busy == path
+
+    def flush(self, path: str = None, timeout: float = None) -> bool:
+        """
+        Wait until ``path`` (or every queued file) is written.
+
+        False on timeout, or if the last write of a file failed (``errors``
+        maps each such path to its exception).
+        """
+        path = path and os.path.abspath(path)
+        with self._cond:
+            if not self._cond.wait_for(lambda: not self._is_pending(path), timeout):
+                return False
+            return path not in self.errors if path else not self.errors
+
+    def close(self, timeout: float = None):
+        """Write everything still queued and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                path = next(iter(self._pending))
+                content = self._pending.pop(path)
+                self._busy = path
+            error = None
+            try:
+                write_atomic(path, content, self.fsync)
+            except OSError as e:
+                error = e
+                print(f"⚠️ Could not write {path}: {e}")
+            with self._cond:
+                if error is None:
+                    self.errors.pop(path, None)
+                else:
+                    self.errors[path] = error
+                self._busy = None
+                self.writes += 1
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"writes": self.writes, "coalesced": self.coalesced,
+                    "pending": len(self._pending), "errors": len(self.errors)}
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_writer() -> BackgroundFileWriter:
+    """The process-wide writer; whatever it still holds is written at exit."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = BackgroundFileWriter()
+            atexit.register(_default.close)
+        return _default
+
+
+def queue_file_write(writer: BackgroundFileWriter, filename: str, content: str,
+                     directory: str = None, overwrite=False) -> str:
+    """What the file writer tool does; returns the message the agent sees."""
+    path = os.path.join(directory or "./", filename)
+    if str(overwrite).strip().lower() not in ("true", "1", "yes", "y", "on"):
+        if os.path.exists(path) or writer.is_pending(path):
+            return f"File {path} already exists and overwrite option was not passed."
+    writer.write(path, content)
+    return f"Content successfully written to {path}"
+
+
+@functools.lru_cache(maxsize=None)
+def _tool_class():
+    """Define the CrewAI tool on first use so the writer works without CrewAI."""
+    from typing import Any, Optional, Type, Union
+
+    from crewai.tools import BaseTool
+    from pydantic import BaseModel, Field
+
+    class AsyncFileWriterToolInput(BaseModel):
+        filename: str
+        directory: Optional[str] = "./"
+        overwrite: Union[str, bool] = False
+        content: str
+
+    class AsyncFileWriterTool(BaseTool):
+        """CrewAI's file writer tool, answering before the file is written."""
+
+        # Same name and arguments as crewai_tools.FileWriterTool, so prompts don't change
+        name: str = "File Writer Tool"
+        description: str = ("A tool to write content to a specified file. Accepts filename, content, "
+                            "and optionally a directory path and overwrite flag as input.")
+        args_schema: Type[BaseModel] = AsyncFileWriterToolInput
+        writer: Any = Field(default=None, exclude=True)
+
+        def _run(self, filename: str, content: str, directory: str = "./", overwrite=False, **kwargs) -> str:
+            return queue_file_write(self.writer or default_writer(), filename, content, directory, overwrite)
+
+    return AsyncFileWriterTool
+
+
+def create_async_file_writer_tool(writer: BackgroundFileWriter = None):
+    """A CrewAI tool that queues writes on ``writer`` (default: the process-wide one)."""
+    return _tool_class()(writer=writer)
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Knowledge Index for Caroline's Agents
+Answers off-keyword questions from the closest passage Caroline has written.
+
+Every front end has its own hand-written answers in the persona store (the
+showcase, chat and voice answers and the fact sheet) and the crew writes
+longer ``.md`` overviews. This
+module cuts all of them into paragraph-sized chunks, embeds each chunk with
+a small local model and keeps the vectors in a memory-mapped float32
+matrix. A query is one matrix-vector product and a partial sort, well
+under a millisecond for a few hundred chunks, so the questions the intent
+router can't place get a relevant passage instead of the generic fallback.
+
+Embeddings come from sentence-transformers (``all-MiniLM-L6-v2`` on CPU)
+when it is installed, otherwise from a deterministic hashing embedder of
+stemmed words and word pairs. ``update()`` only embeds chunks whose text
+changed; unchanged chunks keep their stored vectors.
+
+Usage: python knowledge_index.py [--query "..."] [--bench] [--embedder hashing]
+"""
+
+import argparse
+import functools
+import glob
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+
+import numpy as np
+
+from file_writer import write_atomic
+from intent_router import TOKEN_PATTERN, tokenize
+from persona_store import load_persona
+
+MANIFEST_NAME = "manifest.json"
+VECTORS_NAME = "vectors.f32"
+MANIFEST_VERSION = 1
+
+# Persona sections holding whole answers (the fact sheet is added line by line)
+ANSWER_SECTIONS = ("showcase", "chat", "voice")
+
+# Crew outputs picked up next to the hand-written sources
+GENERATED_PATTERN = "caroline_*.md"
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by can could did do does for from had has have how i in is it its me "
+    "my of on or our so that the their them there they this to was we were what when where which who "
+    "why will with would you your tell about she her he his caroline".split()
+)
+
+
+class HashingEmbedder:
+    """Signed feature hashing of stemmed words and adjacent word pairs; needs only numpy."""
+
+    # Short questions against paragraph-long chunks score low even when on topic
+    min_score = 0.12
+
+    def __init__(self, dim: int = 2048):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    @functools.lru_cache(maxsize=16384)
+    def _bucket(self, feature: str):
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        return digest % self.dim, 1.0 if digest >> 63 else -1.0
+
+    def embed(self, texts) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            # Single characters are mostly possessive "s" and stray digits
+            words = [word for word in TOKEN_PATTERN.findall(text.lower())
+                     if len(word) > 1 and word not in STOPWORDS]
+            tokens = tokenize(" ".join(words))
+            for token in tokens:
+                column, sign = self._bucket(token)
+                vectors[row, column] += sign
+            for pair in zip(tokens, tokens[1:]):
+                column, sign = self._bucket(" ".join(pair))
+                vectors[row, column] += 0.5 * sign
+        return _normalize(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """A sentence-transformers model on CPU, e.g. all-MiniLM-L6-v2 (384 dimensions)."""
+
+    min_score = 0.35
+
+    def __init__(self, model_name: str = DEFAULT_MODEL):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"st-{model_name}"
+
+    def embed(self, texts) -> np.ndarray:
+        vectors = self.model.encode(list(texts), batch_size=32, normalize_embeddings=True,
+                                    convert_to_numpy=True, show_progress_bar=False)
+        return vectors.astype(np.float32, copy=False).reshape(len(texts), self.dim)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def get_embedder(name: str = None):
+    """
+    ``"hashing"``, a sentence-transformers model name, or ``"auto"`` (the default,
+    or ``CAROLINE_EMBEDDER``): the small local model if it loads, else hashing.
+    """
+    name = name or os.environ.get("CAROLINE_EMBEDDER", "auto")
+    if name == "hashing":
+        return HashingEmbedder()
+    try:
+        return SentenceTransformerEmbedder(DEFAULT_MODEL if name == "auto" else name)
+    except Exception:
+        if name != "auto":
+            raise
+        # sentence-transformers is optional, and its model may not be downloadable offline
+        return HashingEmbedder()
+
+
+class Chunk:
+    """One passage of a source document and the digest of its text."""
+
+    def __init__(self, id: str, doc: str, text: str):
+        self.id = id
+        self.doc = doc
+        self.text = text
+        self.digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def to_json(self) -> dict:
+        return {"id": self.id, "doc": self.doc, "text": self.text, "digest": self.digest}
+
+
+def _clean_line(line: str) -> str:
+    line = re.sub(r"^\s*(?:#+|[-*•]|\d+\.)\s+", "", line)
+    return line.replace("**", "").strip()
+
+
+def chunk_text(text: str, max_chars: int = 500) -> list:
+    """Paragraphs with markdown markup and indentation removed; long ones split at sentences."""
+    chunks = []
+    heading = ""
+    for paragraph in re.split(r"\n\s*\n", text):
+        cleaned = " ".join(" ".join(_clean_line(line) for line in paragraph.splitlines()).split())
+        if not cleaned:
+            continue
+        if cleaned.endswith(":") and len(cleaned) < 80:
+            # A heading like "**Technical Skills:**" leads into the next paragraph
+            heading = f"{heading} {cleaned}".strip()
+            continue
+        cleaned = f"{heading} {cleaned}".strip()
+        heading = ""
+        if len(cleaned) <= max_chars:
+            chunks.append(cleaned)
+            continue
+        current = ""
+        for sentence in re.split(r"(?<=[.!?])\s+", cleaned):
+            if current and len(current) + len(sentence) + 1 > max_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}".strip()
+        if current:
+            chunks.append(current)
+    if heading:
+        chunks.append(heading)
+    return chunks
+
+
+def build_chunks(sources: dict, max_chars: int = 500) -> list:
+    """Chunks of every ``{doc name: text}`` source; a passage repeated elsewhere is kept once."""
+    chunks = []
+    seen = set()
+    for doc, text in sources.items():
+        for number, passage in enumerate(chunk_text(text, max_chars)):
+            chunk = Chunk(f"{doc}#{number}", doc, passage)
+            if chunk.digest not in seen:
+                seen.add(chunk.digest)
+                chunks.append(chunk)
+    return chunks
+
+
+def default_sources(extra: dict = None, generated_pattern: str = GENERATED_PATTERN) -> dict:
+    """Every front end's canned answers and fact sheet from the persona, ``extra`` and the crew's .md files."""
+    persona = load_persona()
+    sources = {}
+    for section in ANSWER_SECTIONS:
+        sources.update((f"{section}/{name}", text) for name, text in persona.section(section).items())
+    sources.pop("chat/default", None)
+    for key, fact in persona.section("profile").items():
+        topic, _, detail = key.partition("/")
+        label = f"{topic.title()} ({detail})" if detail else topic.title()
+        sources[f"profile/{key}"] = f"{label}: {fact}"
+    sources.update(extra or {})
+    for path in sorted(glob.glob(generated_pattern)):
+        with open(path, encoding="utf-8") as f:
+            sources[f"file/{os.path.basename(path)}"] = f.read()
+    return sources
+
+
+class KnowledgeIndex:
+    """Chunk vectors in a memory-mapped float32 matrix, searched by cosine similarity."""
+
+    def __init__(self, directory: str = "knowledge_index", embedder=None):
+        self.directory = directory
+        self.embedder = embedder or get_embedder()
+        self.chunks = []
+        self._vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self._embed_query = functools.lru_cache(maxsize=256)(self._embed_one)
+        self._load()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    @property
+    def vectors_path(self) -> str:
+        return os.path.join(self.directory, VECTORS_NAME)
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def _load(self):
+        """Open the stored index if it was built by this embedder and is complete."""
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable knowledge index manifest: {e}")
+            return
+        if (manifest.get("version") != MANIFEST_VERSION or manifest.get("embedder") != self.embedder.name
+                or manifest.get("dim") != self.embedder.dim):
+            return
+        rows = len(manifest["chunks"])
+        expected = rows * self.embedder.dim * 4
+        if not os.path.exists(self.vectors_path) or os.path.getsize(self.vectors_path) != expected:
+            # The vectors were replaced but the manifest wasn't; rebuild
+            return
+        self.chunks = [Chunk(c["id"], c["doc"], c["text"]) for c in manifest["chunks"]]
+        if rows:
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r",
+                                      shape=(rows, self.embedder.dim))
+
+    def update(self, sources: dict) -> dict:
+        """Re-index ``sources``, embedding only chunks whose text is new; returns counts."""
+        chunks = build_chunks(sources)
+        stored = {chunk.digest: row for row, chunk in enumerate(self.chunks)}
+        fresh = [chunk for chunk in chunks if chunk.digest not in stored]
+        stats = {"chunks": len(chunks), "embedded": len(fresh),
+                 "reused": len(chunks) - len(fresh), "removed": len(set(stored) - {c.digest for c in chunks})}
+        if not fresh and [c.id for c in chunks] == [c.id for c in self.chunks] and not stats["removed"]:
+            return stats
+
+        vectors = np.empty((len(chunks), self.embedder.dim), dtype=np.float32)
+        embedded = iter(self.embedder.embed([chunk.text for chunk in fresh]) if fresh else ())
+        for row, chunk in enumerate(chunks):
+            vectors[row] = self._vectors[stored[chunk.digest]] if chunk.digest in stored else next(embedded)
+        self._save(chunks, vectors)
+        return stats
+
+    def _save(self, chunks: list, vectors: np.ndarray):
+        os.makedirs(self.directory, exist_ok=True)
+        # Release the old mapping before its file is replaced
+        self._vectors = vectors
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".f32.tmp")
+        with os.fdopen(fd, "wb") as f:
+            vectors.tofile(f)
+        os.replace(temp_path, self.vectors_path)
+        manifest = {"version": MANIFEST_VERSION, "embedder": self.embedder.name, "dim": self.embedder.dim,
+                    "chunks": [chunk.to_json() for chunk in chunks]}
+        write_atomic(self.manifest_path, json.dumps(manifest, indent=1, ensure_ascii=False))
+        self.chunks = chunks
+        self._embed_query.cache_clear()
+        if chunks:
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r",
+                                      shape=(len(chunks), self.embedder.dim))
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        return self.embedder.embed([text])[0]
+
+    def search_vector(self, vector: np.ndarray, k: int = 3) -> list:
+        """``[(score, chunk)]`` for the ``k`` chunks most similar to a unit ``vector``."""
+        if not self.chunks:
+            return []
+        scores = self._vectors @ vector
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[row]), self.chunks[row]) for row in top]
+
+    def search(self, query: str, k: int = 3) -> list:
+        """``[(score, chunk)]`` for the ``k`` chunks closest to ``query``, best first."""
+        if not self.chunks:
+            return []
+        return self.search_vector(self._embed_query(query), k)
+
+    def answer(self, question: str, min_score: float = None):
+        """The best matching passage, or None if nothing is close enough to be an answer."""
+        hits = self.search(question, k=1)
+        threshold = self.embedder.min_score if min_score is None else min_score
+        if hits and hits[0][0] >= threshold:
+            return hits[0][1].text
+        return None
+
+
+def open_index(extra: dict = None, directory: str = "knowledge_index", embedder=None) -> KnowledgeIndex:
+    """The index over ``default_sources(extra)``, brought up to date."""
+    index = KnowledgeIndex(directory, embedder)
+    index.update(default_sources(extra))
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def shared_index(directory: str = "knowledge_index") -> KnowledgeIndex:
+    """One up-to-date default index per directory, shared by every front end in the process."""
+    return open_index(directory=directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the knowledge index")
+    parser.add_argument("--directory", default="knowledge_index")
+    parser.add_argument("--embedder", default=None, help='"hashing", a sentence-transformers model, or "auto"')
+    parser.add_argument("--query", action="append", default=[], help="question to look up (repeatable)")
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument("--bench", action="store_true", help="time top-k search over every chunk as a query")
+    args = parser.parse_args()
+
+    index = KnowledgeIndex(args.directory, get_embedder(args.embedder))
+    start = time.perf_counter()
+    stats = index.update(default_sources())
+    print(f"📚 {stats['chunks']} chunks ({index.embedder.name}): {stats['embedded']} embedded, "
+          f"{stats['reused']} reused, {stats['removed']} removed in {time.perf_counter() - start:.2f}s")
+
+    for query in args.query:
+        print(f"\n❓ {query}")
+        for score, chunk in index.search(query, args.k):
+            print(f"   {score:.3f}  {chunk.id}: {chunk.text[:100]}")
+
+    if args.bench and len(index):
+        vectors = [index._embed_query(chunk.text) for chunk in index.chunks]
+        timings = []
+        for _ in range(5):
+            for vector in vectors:
+                start = time.perf_counter()
+                index.search_vector(vector, args.k)
+                timings.append(time.perf_counter() - start)
+        timings.sort()
+        p50 = timings[len(timings) // 2] * 1e6
+        p99 = timings[int(len(timings) * 0.99)] * 1e6
+        print(f"\n⏱️ top-{args.k} search over {len(index)} chunks: p50 {p50:.0f} µs, p99 {p99:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
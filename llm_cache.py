@@ -0,0 +1,168 @@
+"""
+LLM Response Cache for Caroline's CrewAI Agent
+Persistent SQLite cache so reruns of unchanged crew tasks skip the LLM.
+
+Every completion is stored under a hash of what determines it: the model,
+the full message list (which carries the agent's role, goal and backstory,
+the task description, expected output and the tool descriptions), the tool
+schema, stop words and temperature. Entries expire after ``ttl_seconds``,
+and the database is kept under ``max_bytes`` by dropping the least
+recently used responses first.
+
+``create_cached_llm`` wraps a CrewAI LLM so an agent uses the cache
+transparently; calls that execute tools inside the LLM (native function
+calling) are never cached, so their side effects always happen.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+class LLMCache:
+    """SQLite-backed completion cache with a TTL and a size budget."""
+
+    def __init__(self, path: str = "llm_cache.sqlite", ttl_seconds: float = 7 * 24 * 3600,
+                 max_bytes: int = 32 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One connection shared by the crew's worker threads, serialized by the lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(SCHEMA)
+        self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, messages, tools=None, **params) -> str:
+        """Hash everything that shapes the completion."""
+        payload = json.dumps([model, messages, tools or [], params], sort_keys=True,
+                             ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached response for ``key``, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str):
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        if self.ttl_seconds is not None:
+            self._db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+        doomed = []
+        for key, size in rows[:-1]:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def stats(self) -> dict:
+        """Entry count, bytes used and hit/miss counters."""
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_llm_class():
+    """Define the CrewAI wrapper on first use so the cache works without CrewAI."""
+    from crewai import LLM
+    from crewai.llms.base_llm import BaseLLM
+
+    class CachedLLM(BaseLLM):
+        """A CrewAI LLM that answers repeated prompts from an LLMCache."""
+
+        def __init__(self, cache: LLMCache, model: str, inner=None, **llm_kwargs):
+            super().__init__(model=model, temperature=llm_kwargs.get("temperature"))
+            self.cache = cache
+            self.inner = inner if inner is not None else LLM(model=model, **llm_kwargs)
+
+        def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+            # CrewAI sets stop words on the agent's LLM; pass them through
+            self.inner.stop = self.stop
+            if available_functions:
+                # The LLM runs tools itself here; a cached answer would skip them
+                return self.inner.call(messages, tools=tools, callbacks=callbacks,
+                                       available_functions=available_functions, **kwargs)
+
+            key = LLMCache.make_key(self.model, messages, tools, stop=self.stop, temperature=self.temperature)
+            response = self.cache.get(key)
+            if response is None:
+                response = self.inner.call(messages, tools=tools, callbacks=callbacks, **kwargs)
+                if isinstance(response, str):
+                    self.cache.put(key, response)
+            return response
+
+        def supports_function_calling(self) -> bool:
+            return self.inner.supports_function_calling()
+
+        def supports_stop_words(self) -> bool:
+            return self.inner.supports_stop_words()
+
+        def get_context_window_size(self) -> int:
+            return self.inner.get_context_window_size()
+
+    return CachedLLM
+
+
+def create_cached_llm(cache: LLMCache, model: str, inner=None, **llm_kwargs):
+    """Wrap ``inner`` (default: ``crewai.LLM(model, **llm_kwargs)``) with ``cache``."""
+    return _cached_llm_class()(cache, model, inner=inner, **llm_kwargs)
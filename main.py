@@ -12,40 +12,49 @@ This demonstrates:
 Author: Caroline Haoran Song
 """
 
+import argparse
 import os
-from crewai import Agent, Task, Crew, Process
-from crewai_tools import FileWriterTool
+import time
+from crewai import Agent, Task, Crew, Process, LLM
+
+from crew_runner import CrewTask, run_parallel
+from file_writer import create_async_file_writer_tool, default_writer
+from llm_cache import LLMCache, create_cached_llm
+from prompt_assembly import backstory_for, goal, role, stable_prefix
+from prompt_assembly import full_backstory as full_backstory_text
+from offline_llm import MODEL_NAME as OFFLINE_MODEL_NAME, OfflineLLMServer, create_offline_llm
+from task_context import TaskContextRetriever, print_context_report, with_context
+from task_streaming import StreamRouter, TaskStream, with_stream
 
 # Set up environment variables
 # Note: You can run this without API keys for basic functionality
-os.environ["OPENAI_API_KEY"] = "gpt-5-nano-2025-08-07"
+# (an exported key is kept; --offline needs none)
+os.environ.setdefault("OPENAI_API_KEY", "gpt-5-nano-2025-08-07")
+
+# CrewAI's default model unless OPENAI_MODEL_NAME says otherwise
+MODEL_NAME = os.environ.get("OPENAI_MODEL_NAME", "gpt-4o-mini")
 
-def create_caroline_agent():
-    """Create Caroline's personal digital twin agent."""
+def create_caroline_agent(llm=None, task=None, full_backstory=False, backstory=None):
+    """
+    Create Caroline's personal digital twin agent (llm defaults to CrewAI's).
+    
+    The backstory holds only the sections the named showcase task needs,
+    after a prefix shared by every task; full_backstory sends all of it and
+    backstory replaces it (e.g. the bare prefix when facts are retrieved
+    per task). Files the agent saves are written in the background (see
+    file_writer).
+    """
+    options = {"llm": llm} if llm is not None else {}
+    if backstory is None:
+        backstory = full_backstory_text() if full_backstory else backstory_for(task)
     return Agent(
-        role='Biostatistics AI Researcher & Healthcare Innovation Specialist',
-        goal='To represent Caroline Song\'s expertise in biostatistics, machine learning, and healthcare AI while showcasing her unique multicultural perspective and leadership abilities',
-        backstory="""I am the digital representation of Caroline Haoran Song, a Harvard Master's in Biostatistics student with a perfect GPA and exceptional background spanning biomedical engineering, healthcare AI, and research leadership.
-        
-        My academic excellence: I'm currently pursuing my Master's in Biostatistics at Harvard with a 3.96 GPA, and I graduated top of my cohort from The University of Sydney with dual degrees in Biomedical Engineering and Medical Science. I've been on the Dean's List and won multiple prestigious scholarships.
-        
-        My research expertise: I specialize in cardiovascular risk modeling using cooperative learning and survival analysis. I'm working with multi-view data integration (genomic, cardiac MRI, clinical) and developing polygenic hazard scores. I also have experience in spatial transcriptomics and neuroimmune stress response research.
-        
-        My industry experience: I've worked as a Solution Architecture Intern at Tencent Healthcare, where I bridged technical teams and business development, leading site visits across Southeast Asia and contributing to ¥20M+ POC deals. I'm certified in cloud-native technologies and have deep expertise in multimodal AI medical LLM solutions.
-        
-        My research impact: I've co-authored peer-reviewed publications, presented at international conferences, and developed point-of-care devices that reduce testing time by 80%. My work contributes to reducing patient mortality rates in sepsis and cardiovascular disorders.
-        
-        My leadership: I'm Chair of Marketing and Communication at Harvard Chan Biotechnology & Affordability Club, where I've organized workshops for 200+ participants and increased membership by 30%. I'm passionate about making healthcare technology accessible.
-        
-        My multicultural advantage: I'm native in both English and Mandarin, with experience working across Boston, Sydney, and Shenzhen. This gives me unique insights into global healthcare challenges and AI implementation.
-        
-        My technical skills: Python, R, TensorFlow, SQL, Docker, Kubernetes, survival analysis, deep learning, cooperative learning, MLOps, and cloud-native architecture. I combine rigorous statistical methods with cutting-edge AI approaches.
-        
-        My personality: I'm analytical yet practical, always looking for ways to translate complex research into real-world impact. I believe in the power of interdisciplinary collaboration and am passionate about using AI to solve healthcare's biggest challenges.
-        """,
+        role=role(),
+        goal=goal(),
+        backstory=backstory,
         verbose=True,
         allow_delegation=False,
-        tools=[FileWriterTool()]
+        tools=[create_async_file_writer_tool()],
+        **options
     )
 
 def create_introduction_task(agent):
@@ -137,61 +146,164 @@ def create_leadership_impact_task(agent):
         agent=agent
     )
 
-def main():
+# Showcase tasks in presentation order, with the tasks each one builds on.
+# None of them needs another's output, so in parallel mode they all run at once.
+SHOWCASE_TASKS = [
+    CrewTask("introduction", create_introduction_task),
+    CrewTask("background", create_background_task),
+    CrewTask("research", create_research_showcase_task, output_file="caroline_research_capabilities.md"),
+    CrewTask("healthcare_ai", create_healthcare_ai_task),
+    CrewTask("leadership", create_leadership_impact_task, output_file="caroline_leadership_impact.md"),
+]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run Caroline's personal CrewAI agent showcase")
+    parser.add_argument("--mode", choices=["sequential", "parallel"], default="sequential",
+                        help="sequential: one crew, tasks in turn; parallel: independent tasks concurrently")
+    parser.add_argument("--max-workers", type=int, default=len(SHOWCASE_TASKS),
+                        help="concurrent tasks in parallel mode")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always call the LLM instead of reusing cached responses")
+    parser.add_argument("--cache-ttl-hours", type=float, default=24 * 7,
+                        help="how long cached LLM responses stay valid")
+    parser.add_argument("--offline", action="store_true",
+                        help="answer from the local deterministic LLM stand-in (no network or API key)")
+    parser.add_argument("--offline-latency", type=float, default=0.0,
+                        help="stand-in seconds before the first token")
+    parser.add_argument("--offline-tokens-per-second", type=float, default=None,
+                        help="stand-in generation speed (default: instant)")
+    parser.add_argument("--context", choices=["retrieved", "sections"], default="retrieved",
+                        help="retrieved: each task gets the persona facts its description matches; "
+                             "sections: each task gets its fixed backstory sections")
+    parser.add_argument("--context-k", type=int, default=4,
+                        help="persona facts retrieved per task")
+    parser.add_argument("--context-budget", type=int, default=200,
+                        help="prompt tokens of retrieved facts allowed per task")
+    parser.add_argument("--full-backstory", action="store_true",
+                        help="send the whole persona with every task (the baseline)")
+    parser.add_argument("--no-stream", action="store_true",
+                        help="print task output only when each task is done")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main function to run Caroline's personal CrewAI agent."""
-    print("🧬 Starting Caroline's Personal CrewAI Agent")
-    print("=" * 60)
-    print("🎓 Harvard Biostatistics Student | 🔬 AI Healthcare Researcher | 🌏 Global Perspective")
-    print("=" * 60)
+    args = parse_args(argv)
+    cache = None if args.no_cache else LLMCache(ttl_seconds=args.cache_ttl_hours * 3600)
     
-    # Create Caroline's personal agent
-    print("\n👋 Creating Caroline's digital twin...")
-    caroline_agent = create_caroline_agent()
+    server = None
+    if args.offline:
+        server = OfflineLLMServer(latency=args.offline_latency,
+                                  tokens_per_second=args.offline_tokens_per_second).start()
+        print(f"🤖 Using the offline LLM stand-in at {server.base_url}")
     
-    # Create tasks that showcase different aspects of Caroline's expertise
-    print("📋 Setting up showcase tasks...")
+    # Task output streams to stdout and its file as it is generated; each
+    # task's LLM is mapped to its writer, so tasks need their own LLM
+    stream = not args.no_stream
+    parallel = args.mode == "parallel"
+    router = StreamRouter()
+    writer = default_writer()
+    streams = {spec.name: TaskStream(spec.name, spec.output_file, prefix=f"[{spec.name}] " if parallel else None,
+                                     writer=writer)
+               for spec in SHOWCASE_TASKS}
+    tasks = SHOWCASE_TASKS
     
-    intro_task = create_introduction_task(caroline_agent)
-    background_task = create_background_task(caroline_agent)
-    research_task = create_research_showcase_task(caroline_agent)
-    healthcare_ai_task = create_healthcare_ai_task(caroline_agent)
-    leadership_task = create_leadership_impact_task(caroline_agent)
+    # Retrieve each task's persona facts just before its Task is built,
+    # leaving the agents only the stable prefix
+    retriever = None
+    if args.context == "retrieved" and not args.full_backstory:
+        retriever = TaskContextRetriever(args.context_k, args.context_budget)
+        tasks = [with_context(spec, retriever) for spec in tasks]
+    if stream:
+        tasks = [with_stream(spec, streams[spec.name]) for spec in tasks]
     
-    # Create crew with Caroline's agent and tasks
-    print("🎭 Assembling Caroline's expertise showcase crew...")
-    crew = Crew(
-        agents=[caroline_agent],
-        tasks=[intro_task, background_task, research_task, healthcare_ai_task, leadership_task],
-        process=Process.sequential,
-        verbose=True
-    )
+    def make_agent(task=None):
+        if server:
+            llm = create_offline_llm(server, stream=stream)
+        else:
+            llm = LLM(model=MODEL_NAME, stream=True) if stream else None
+        if cache is not None:
+            model = f"openai/{OFFLINE_MODEL_NAME}" if server else MODEL_NAME
+            llm = create_cached_llm(cache, model, inner=llm)
+        if stream and task in streams:
+            router.register(llm, streams[task])
+        backstory = stable_prefix() if retriever is not None else None
+        return create_caroline_agent(llm, task, full_backstory=args.full_backstory, backstory=backstory)
     
-    # Execute the showcase
-    print("\n🎯 Starting Caroline's personal agent showcase...")
+    print("🧬 Starting Caroline's Personal CrewAI Agent")
+    print("=" * 60)
+    print("🎓 Harvard Biostatistics Student | 🔬 AI Healthcare Researcher | 🌏 Global Perspective")
     print("=" * 60)
     
+    start = time.perf_counter()
     try:
-        result = crew.kickoff()
-        
-        print("\n✅ Caroline's agent showcase completed!")
-        print("=" * 60)
-        print("🎊 Here's what Caroline's digital twin accomplished:")
-        print(result)
-        
-        # Check if files were created
-        files_created = []
-        if os.path.exists('caroline_research_capabilities.md'):
-            files_created.append('caroline_research_capabilities.md')
-        if os.path.exists('caroline_leadership_impact.md'):
-            files_created.append('caroline_leadership_impact.md')
+        if stream:
+            router.start()
+        if parallel:
+            # One agent per task: agents are not safe to share across threads
+            print(f"\n🎯 Running {len(SHOWCASE_TASKS)} showcase tasks, up to {args.max_workers} at a time...")
+            print("=" * 60)
+            results = run_parallel(tasks, make_agent, max_workers=args.max_workers, verbose=not stream)
+            
+            print("\n✅ Caroline's agent showcase completed!")
+            print("=" * 60)
+            if not stream:
+                print("🎊 Here's what Caroline's digital twin accomplished:")
+                for task_result in results:
+                    print(f"\n📋 {task_result.name}:")
+                    print(task_result)
+        else:
+            # Create Caroline's personal agent: one per task, each with only
+            # the backstory sections that task needs and its own LLM
+            print("\n👋 Creating Caroline's digital twin...")
+            agents = {spec.name: make_agent(spec.name) for spec in tasks}
+            
+            # Create tasks that showcase different aspects of Caroline's expertise
+            print("📋 Setting up showcase tasks...")
+            crew_tasks = [spec.build(agents[spec.name]) for spec in tasks]
+            
+            # Create crew with Caroline's agent and tasks
+            print("🎭 Assembling Caroline's expertise showcase crew...")
+            crew = Crew(
+                agents=list(agents.values()),
+                tasks=crew_tasks,
+                process=Process.sequential,
+                verbose=not stream
+            )
             
+            # Execute the showcase
+            print("\n🎯 Starting Caroline's personal agent showcase...")
+            print("=" * 60)
+            result = crew.kickoff()
+            
+            print("\n✅ Caroline's agent showcase completed!")
+            print("=" * 60)
+            if not stream:
+                print("🎊 Here's what Caroline's digital twin accomplished:")
+                print(result)
+        
+        # Report the files the tasks produced (their content was already shown)
+        if not writer.flush():
+            for path, error in writer.errors.items():
+                print(f"⚠️ Not written: {path} ({error})")
+        failed = set(writer.errors)
+        files_created = [spec.output_file for spec in SHOWCASE_TASKS
+                         if spec.output_file and os.path.exists(spec.output_file)
+                         and os.path.abspath(spec.output_file) not in failed]
         if files_created:
-            print(f"\n📄 Files successfully created: {', '.join(files_created)}")
+            print("\n📄 Files successfully created:")
             for file in files_created:
-                with open(file, 'r') as f:
-                    content = f.read()
-                    print(f"\n📋 {file} ({len(content)} characters):")
-                    print(content[:300] + "..." if len(content) > 300 else content)
+                print(f"   {file} ({os.path.getsize(file)} bytes)")
+        
+        first = [s.first_chunk_at for s in streams.values() if s.first_chunk_at is not None]
+        if stream and first:
+            print(f"\n⏱️ First output after {min(first) - start:.2f}s")
+        print(f"⏱️ Showcase took {time.perf_counter() - start:.2f}s")
+        if retriever is not None:
+            print_context_report(retriever)
+        if cache is not None:
+            stats = cache.stats()
+            print(f"💾 LLM cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['entries']} responses stored; --no-cache to bypass)")
         
         print("\n🎯 Assignment Completed Successfully!")
         print("=" * 60)
@@ -206,14 +318,19 @@ def main():
         print("   • Spatial transcriptomics research")
         print("   • Tencent Healthcare industry experience")
         print("   • Multicultural perspective (Boston/Sydney/Shenzhen)")
-        print("   • Perfect academic record and research publications")
+        print("   • Top academic record and research publications")
         print("   • Leadership in biotechnology student organizations")
         
     except Exception as e:
         print(f"\n❌ An error occurred: {str(e)}")
         print("\n💡 Note: This agent can run without API keys for basic functionality.")
         print("For enhanced capabilities, set your OPENAI_API_KEY environment variable.")
-        print("\nTo run: python main.py")
+        print("\nTo run: python main.py  (or python main.py --offline without network access)")
+    finally:
+        if stream:
+            router.stop()
+        if server is not None:
+            server.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Offline LLM Stand-In for Caroline's CrewAI Agent
+A deterministic, OpenAI-compatible chat completions server for air-gapped runs.
+
+It answers ``POST /v1/chat/completions`` the way a model would answer the
+real crew: it finds the current task in the prompt and replies with
+Caroline's canned response for that task (from
+``demo_main.MockCarolineAgent``), and when a task asks for a file to be
+saved it first calls the file writer tool. When tools are sent natively
+the tool call is an OpenAI ``tool_calls`` entry and the answer plain
+content, as a function-calling model gives them; otherwise both use
+CrewAI's ReAct "Thought / Action / Final Answer" format. The same request always gets the same answer.
+
+Latency is configurable (time to first token plus a token rate) and
+``"stream": true`` is served as server-sent events, so the real
+Agent/Task/Crew pipeline can be load-tested and benchmarked end-to-end.
+
+Usage: python offline_llm.py [--port 8765] [--latency 0.3] [--tokens-per-second 80]
+       python main.py --offline
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from demo_main import MockCarolineAgent
+
+MODEL_NAME = "caroline-offline"
+
+# (canned response, phrases that identify the task), checked in order
+TASK_MATCHERS = [
+    ("introduction", ("introduce yourself", "introduction")),
+    ("background", ("background in exactly 3 sentences", "explain caroline's background")),
+    ("research_capabilities", ("research tasks", "research capabilities")),
+    ("healthcare_ai", ("ai in healthcare", "healthcare ai")),
+    ("leadership_impact", ("leadership experience", "leadership impact")),
+]
+
+SAVE_PATTERN = re.compile(r"save (?:this|this information|it)?\s*(?:to|as)\s+(?:a file called\s+)?'([^']+)'", re.I)
+ACTION_PATTERN = re.compile(r"^Action:", re.M)
+CURRENT_TASK_PATTERN = re.compile(r"Current Task:\s*(.*?)(?:\n\s*This is the expected criteria|\Z)", re.S)
+
+
+def _text(message: dict) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        # OpenAI content parts
+        content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content
+
+
+def current_task(messages: list) -> str:
+    """The task description CrewAI put in the prompt (or the last user message)."""
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            match = CURRENT_TASK_PATTERN.search(_text(message))
+            if match:
+                return match.group(1).strip()
+    users = [_text(m) for m in messages if m.get("role") == "user"]
+    return users[-1] if users else ""
+
+
+def answer_for(task: str, responses: dict) -> str:
+    lowered = task.lower()
+    for name, phrases in TASK_MATCHERS:
+        if any(phrase in lowered for phrase in phrases):
+            return responses[name]
+    first_line = task.strip().splitlines()[0] if task.strip() else "this request"
+    return (f"As Caroline Song, a Harvard biostatistics student working on healthcare AI, "
+            f"here is my response to \"{first_line}\": I would approach it by combining rigorous "
+            f"statistical methods with practical, accessible AI.")
+
+
+def _file_tool(tools: list):
+    """Name of the native file-writer tool in an OpenAI ``tools`` list, if any."""
+    for tool in tools or []:
+        name = tool.get("function", {}).get("name", "")
+        if "file" in name.lower() and "writ" in name.lower():
+            return name
+    return None
+
+
+def _tool_called(messages: list) -> bool:
+    """
+    Whether a tool was already called in this conversation.
+
+    Judged from the replies only: CrewAI's tool instructions in the prompt
+    contain "Observation: the result of the action" themselves.
+    """
+    for message in messages:
+        if message.get("role") == "tool" or message.get("tool_calls"):
+            return True
+        if message.get("role") == "assistant" and ACTION_PATTERN.search(_text(message)):
+            return True
+    return False
+
+
+def complete(messages: list, tools: list = None, responses: dict = None) -> dict:
+    """
+    Decide the stand-in's reply: ``{"content": ...}`` or ``{"tool_call": ...}``.
+
+    Pure function of the request, so replies are deterministic.
+    """
+    responses = responses or MockCarolineAgent().responses
+    task = current_task(messages)
+    answer = answer_for(task, responses)
+    save = SAVE_PATTERN.search(task)
+    if save and not _tool_called(messages):
+        arguments = {"filename": save.group(1), "content": answer, "overwrite": True}
+        native = _file_tool(tools)
+        if native:
+            return {"tool_call": {"name": native, "arguments": json.dumps(arguments)}}
+        # The tool list sits in the system prompt, or in the first user message without one
+        prompt = "\n".join(_text(m) for m in messages if m.get("role") in ("system", "user"))
+        if "File Writer Tool" in prompt:
+            return {"content": "Thought: I should save this to the requested file first.\n"
+                               "Action: File Writer Tool\n"
+                               f"Action Input: {json.dumps(arguments)}"}
+    if tools:
+        # Native tool calling: CrewAI takes the content as the answer, with no ReAct parsing
+        return {"content": answer}
+    return {"content": f"Thought: I now can give a great answer\nFinal Answer: {answer}"}
+
+
+def _tokens(text: str) -> int:
+    # Roughly what a BPE tokenizer gives for English prose
+    return max(1, len(text) // 4)
+
+
+class OfflineLLMServer:
+    """The stand-in as an in-process HTTP server on a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 tokens_per_second: float = None):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.requests = 0
+        self.responses = MockCarolineAgent().responses
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "OfflineLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="offline-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _json(self, status: int, payload: dict):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._json(200, {"object": "list", "data": [{"id": MODEL_NAME, "object": "model"}]})
+                else:
+                    self._json(404, {"error": {"message": "not found"}})
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._json(404, {"error": {"message": "not found"}})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._json(400, {"error": {"message": "invalid JSON"}})
+                    return
+                with server._lock:
+                    server.requests += 1
+                server.serve_completion(self, request)
+
+        return Handler
+
+    def serve_completion(self, handler, request: dict):
+        messages = request.get("messages", [])
+        reply = complete(messages, request.get("tools"), self.responses)
+        model = request.get("model", MODEL_NAME)
+        prompt_tokens = sum(_tokens(_text(m)) for m in messages)
+        content = reply.get("content")
+        completion_tokens = _tokens(content) if content else _tokens(reply["tool_call"]["arguments"])
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        created = int(time.time())
+        tool_calls = None
+        if "tool_call" in reply:
+            tool_calls = [{"index": 0, "id": "call_offline_0", "type": "function",
+                           "function": reply["tool_call"]}]
+        finish_reason = "tool_calls" if tool_calls else "stop"
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if not request.get("stream"):
+            if self.tokens_per_second:
+                time.sleep(completion_tokens / self.tokens_per_second)
+            message = {"role": "assistant", "content": content}
+            if tool_calls:
+                message["tool_calls"] = [{k: v for k, v in call.items() if k != "index"} for call in tool_calls]
+            handler._json(200, {
+                "id": "chatcmpl-offline", "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+                "usage": usage,
+            })
+            return
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        handler.close_connection = True
+
+        def send(delta: dict, finish=None, **extra):
+            chunk = {"id": "chatcmpl-offline", "object": "chat.completion.chunk", "created": created,
+                     "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish}], **extra}
+            handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            handler.wfile.flush()
+
+        send({"role": "assistant", "content": ""})
+        if tool_calls:
+            send({"tool_calls": tool_calls})
+        else:
+            pieces = re.findall(r"\S+\s*|\s+", content)
+            delay = 1 / self.tokens_per_second if self.tokens_per_second else 0
+            for piece in pieces:
+                if delay:
+                    time.sleep(delay)
+                send({"content": piece})
+        send({}, finish_reason)
+        if request.get("stream_options", {}).get("include_usage"):
+            chunk = {"id": "chatcmpl-offline", "object": "chat.completion.chunk", "created": created,
+                     "model": model, "choices": [], "usage": usage}
+            handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        handler.wfile.write(b"data: [DONE]\n\n")
+        handler.wfile.flush()
+
+
+def create_offline_llm(server: OfflineLLMServer, **llm_kwargs):
+    """A ``crewai.LLM`` pointed at the stand-in server."""
+    from crewai import LLM
+
+    return LLM(model=f"openai/{MODEL_NAME}", base_url=server.base_url, api_key="offline", **llm_kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the deterministic offline LLM stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=None, help="generation speed (default: instant)")
+    args = parser.parse_args()
+
+    server = OfflineLLMServer(args.host, args.port, args.latency, args.tokens_per_second)
+    print(f"🤖 Offline LLM stand-in serving {MODEL_NAME} at {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n✓ Served {server.requests} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Persona Store for Caroline's Agents
+One canonical copy of Caroline's facts and answers, compiled for fast loading.
+
+``persona.json`` is the single source: the agent's role and backstory
+sections, the fact sheet, and the canned answers of the showcase, chat and
+voice front ends. Facts that several answers repeat (the GPAs) live once
+under ``facts`` and are referenced as ``${harvard_gpa}``, so the answers
+cannot drift apart again.
+
+The source is compiled into ``persona.snapshot``, a versioned binary file:
+a table of interned (deduplicated) UTF-8 strings, an entry table of
+(key, value) string ids in source order and a key-sorted index for binary
+search. Loading maps the file read-only and decodes strings only when they
+are asked for, so startup does no parsing and every process that loads the
+snapshot shares the same pages. The snapshot is rebuilt automatically when
+``persona.json`` changes.
+
+Usage: python persona_store.py [--source persona.json] [--output persona.snapshot]
+"""
+
+import argparse
+import json
+import mmap
+import os
+import string
+import struct
+import tempfile
+import threading
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCE = os.path.join(HERE, "persona.json")
+DEFAULT_SNAPSHOT = os.path.join(HERE, "persona.snapshot")
+
+MAGIC = b"CPSN"
+FORMAT_VERSION = 1
+SOURCE_VERSION = 1
+
+# magic, format version, reserved, source size, source mtime (ns), strings, entries
+HEADER = struct.Struct("<4sHHqqII")
+STRING_REF = struct.Struct("<II")  # offset into the string data, length in bytes
+ENTRY = struct.Struct("<II")  # key string id, value string id
+INDEX = struct.Struct("<I")  # entry number, in key order
+
+
+def _flatten(prefix: str, value, out: dict):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(f"{prefix}/{key}" if prefix else key, item, out)
+    else:
+        out[prefix] = str(value)
+
+
+def load_source(source: str = DEFAULT_SOURCE) -> dict:
+    """``persona.json`` as flat ``{"section/key": text}`` with facts filled in, in source order."""
+    with open(source, encoding="utf-8") as f:
+        persona = json.load(f)
+    if persona.get("version") != SOURCE_VERSION:
+        raise ValueError(f"{source}: unsupported persona version {persona.get('version')!r}")
+
+    entries = {}
+    for section, value in persona.items():
+        if section != "version":
+            _flatten(section, value, entries)
+    facts = {key: str(value) for key, value in persona.get("facts", {}).items()}
+    for key, text in entries.items():
+        try:
+            entries[key] = string.Template(text).substitute(facts)
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"{source}: {key} refers to an unknown fact {e}") from None
+    return entries
+
+
+def compile_persona(source: str = DEFAULT_SOURCE, output: str = DEFAULT_SNAPSHOT) -> dict:
+    """Compile ``source`` into a snapshot at ``output`` (replaced atomically); returns sizes."""
+    stat = os.stat(source)
+    entries = load_source(source)
+
+    ids = {}
+    blobs = []
+    refs = []
+    offset = 0
+    for text in [part for item in entries.items() for part in item]:
+        if text not in ids:
+            data = text.encode("utf-8")
+            ids[text] = len(refs)
+            refs.append((offset, len(data)))
+            blobs.append(data)
+            offset += len(data)
+
+    keys = list(entries)
+    order = sorted(range(len(keys)), key=lambda n: keys[n].encode("utf-8"))
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, 0, stat.st_size, stat.st_mtime_ns, len(refs), len(keys))]
+    parts += [STRING_REF.pack(*ref) for ref in refs]
+    parts += [ENTRY.pack(ids[key], ids[value]) for key, value in entries.items()]
+    parts += [INDEX.pack(n) for n in order]
+    parts += blobs
+    data = b"".join(parts)
+
+    directory = os.path.dirname(os.path.abspath(output))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".snapshot.tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, output)
+    return {"entries": len(keys), "strings": len(refs), "bytes": len(data),
+            "text_bytes": sum(len(k.encode("utf-8")) + len(v.encode("utf-8")) for k, v in entries.items())}
+
+
+class PersonaSnapshot:
+    """Read-only, memory-mapped view of a compiled persona."""
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            raise ValueError(f"{path}: truncated persona snapshot")
+        magic, version, _, self.source_size, self.source_mtime_ns, strings, entries = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path}: not a version {FORMAT_VERSION} persona snapshot")
+        self._count = entries
+        self._refs = HEADER.size
+        self._entries = self._refs + strings * STRING_REF.size
+        self._index = self._entries + entries * ENTRY.size
+        self._data = self._index + entries * INDEX.size
+        self._decoded = {}
+
+    def _string(self, string_id: int) -> str:
+        text = self._decoded.get(string_id)
+        if text is None:
+            offset, length = STRING_REF.unpack_from(self._map, self._refs + string_id * STRING_REF.size)
+            start = self._data + offset
+            text = self._decoded[string_id] = self._map[start:start + length].decode("utf-8")
+        return text
+
+    def _entry(self, n: int):
+        return ENTRY.unpack_from(self._map, self._entries + n * ENTRY.size)
+
+    def _find(self, key: str):
+        """Entry number of ``key`` by binary search over the sorted index, or None."""
+        target = key.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            n = INDEX.unpack_from(self._map, self._index + middle * INDEX.size)[0]
+            found = self._string(self._entry(n)[0]).encode("utf-8")
+            if found == target:
+                return n
+            if found < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) is not None
+
+    def __getitem__(self, key: str) -> str:
+        n = self._find(key)
+        if n is None:
+            raise KeyError(key)
+        return self._string(self._entry(n)[1])
+
+    def get(self, key: str, default=None):
+        n = self._find(key)
+        return default if n is None else self._string(self._entry(n)[1])
+
+    def items(self, prefix: str = ""):
+        """``(key, text)`` pairs in source order, optionally only under ``prefix``."""
+        for n in range(self._count):
+            key_id, value_id = self._entry(n)
+            key = self._string(key_id)
+            if key.startswith(prefix):
+                yield key, self._string(value_id)
+
+    def section(self, name: str) -> dict:
+        """``{key: text}`` for every entry under ``name/``, keys relative to it."""
+        prefix = f"{name}/"
+        return {key[len(prefix):]: text for key, text in self.items(prefix)}
+
+    def tree(self, name: str) -> dict:
+        """A section with its nested keys turned back into nested dicts."""
+        tree = {}
+        for key, text in self.section(name).items():
+            *parents, leaf = key.split("/")
+            node = tree
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[leaf] = text
+        return tree
+
+    def is_stale(self, source: str) -> bool:
+        """Whether ``source`` changed since this snapshot was compiled from it."""
+        try:
+            stat = os.stat(source)
+        except FileNotFoundError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) != (self.source_size, self.source_mtime_ns)
+
+    def close(self):
+        self._map.close()
+
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def load_persona(source: str = DEFAULT_SOURCE, snapshot: str = None) -> PersonaSnapshot:
+    """The shared snapshot of ``source``, compiled first if it is missing or out of date."""
+    snapshot = snapshot or os.path.splitext(source)[0] + ".snapshot"
+    with _snapshots_lock:
+        loaded = _snapshots.get(snapshot)
+        if loaded is not None:
+            if not loaded.is_stale(source):
+                return loaded
+            # Values already read are plain strings and outlive the mapping
+            loaded.close()
+            del _snapshots[snapshot]
+        try:
+            loaded = PersonaSnapshot(snapshot)
+        except (OSError, ValueError):
+            loaded = None
+        if loaded is None or loaded.is_stale(source):
+            if loaded is not None:
+                loaded.close()
+            compile_persona(source, snapshot)
+            loaded = PersonaSnapshot(snapshot)
+        _snapshots[snapshot] = loaded
+        return loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile persona.json into a binary snapshot")
+    parser.add_argument("--source", default=DEFAULT_SOURCE)
+    parser.add_argument("--output", default=None, help="snapshot path (default: next to the source)")
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.source)[0] + ".snapshot"
+    stats = compile_persona(args.source, output)
+    print(f"🧬 Compiled {stats['entries']} entries ({stats['strings']} distinct strings, "
+          f"{stats['text_bytes']:,} bytes of text) into {output} ({stats['bytes']:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Prompt Assembly for Caroline's CrewAI Agent
+Builds compact, per-task backstories instead of re-sending the full persona.
+
+The backstory is split into named sections (kept in ``persona.json``, see
+persona_store, and read when first needed rather than at import). Every
+agent's backstory starts
+with the same stable prefix (who Caroline is and how she talks), so the
+start of every system prompt is byte-identical across tasks and runs and
+can be served from a provider's prompt-prefix cache. After the prefix
+each task gets only the sections it draws on - leadership facts for the
+leadership task, research facts for the research showcase - always in the
+same canonical order so a task's prompt never changes between runs.
+
+``python prompt_assembly.py`` prints the prompt tokens each showcase task
+costs with the full backstory and with the assembled one.
+"""
+
+import functools
+
+from persona_store import load_persona
+
+
+def role() -> str:
+    return load_persona()["agent/role"]
+
+
+def goal() -> str:
+    return load_persona()["agent/goal"]
+
+
+def identity_full() -> str:
+    """The opening sentence of the original backstory; the goal already covers the rest."""
+    return load_persona()["agent/identity_full"]
+
+
+def identity() -> str:
+    return load_persona()["agent/identity"]
+
+
+def sections() -> dict:
+    """Backstory sections in canonical order (as in persona.json); assembled backstories follow it."""
+    return load_persona().section("backstory")
+
+
+# Sent to every task, ahead of everything task-specific
+PREFIX_SECTIONS = ("personality",)
+
+# Sections each showcase task draws on (names match main.SHOWCASE_TASKS)
+TASK_SECTIONS = {
+    "introduction": ("academic", "research", "multicultural"),
+    "background": ("academic", "research", "industry", "skills"),
+    "research": ("research", "skills", "impact"),
+    "healthcare_ai": ("industry", "impact", "research", "multicultural"),
+    "leadership": ("leadership", "industry", "impact"),
+}
+
+def full_backstory() -> str:
+    """The whole persona laid out the way main.py used to send it, indentation included."""
+    return "\n        \n        ".join([identity_full()] + list(sections().values())) + "\n        "
+
+
+def stable_prefix() -> str:
+    """The part of every assembled backstory that never varies."""
+    backstory = sections()
+    return "\n\n".join([identity()] + [backstory[name] for name in PREFIX_SECTIONS])
+
+
+def build_backstory(names=()) -> str:
+    """Stable prefix plus the ``names`` sections in canonical order (duplicates and prefix sections dropped)."""
+    backstory = sections()
+    unknown = [name for name in names if name not in backstory]
+    if unknown:
+        raise ValueError(f"Unknown backstory sections: {', '.join(unknown)}")
+    wanted = [name for name in backstory if name in names and name not in PREFIX_SECTIONS]
+    return "\n\n".join([stable_prefix()] + [backstory[name] for name in wanted])
+
+
+def backstory_for(task: str = None) -> str:
+    """The compact backstory for a showcase task; every section if the task is unknown."""
+    if task is None or task not in TASK_SECTIONS:
+        return build_backstory(tuple(sections()))
+    return build_backstory(TASK_SECTIONS[task])
+
+
+@functools.lru_cache(maxsize=1)
+def _encoder():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # tiktoken is optional; fall back to the usual ~4 characters per token
+        return None
+
+
+def tokenizer_name() -> str:
+    return "tiktoken" if _encoder() is not None else "~4 chars/token estimate"
+
+
+def count_tokens(text: str) -> int:
+    encoder = _encoder()
+    if encoder is None:
+        return max(1, round(len(text) / 4))
+    return len(encoder.encode(text))
+
+
+def system_prompt(backstory: str) -> str:
+    """The persona part of CrewAI's system prompt for an agent."""
+    return f"You are {role()}. {backstory}\nYour personal goal is: {goal()}"
+
+
+def token_report(tasks: dict) -> list:
+    """
+    Prompt tokens per task before and after assembly.
+
+    ``tasks`` maps task name to the text the task adds to the prompt
+    (description plus expected output).
+    """
+    rows = []
+    full = count_tokens(system_prompt(full_backstory()))
+    for name, task_text in tasks.items():
+        task_tokens = count_tokens(task_text)
+        compact = count_tokens(system_prompt(backstory_for(name)))
+        rows.append({"task": name, "before": full + task_tokens, "after": compact + task_tokens})
+    return rows
+
+
+def print_token_report(tasks: dict):
+    rows = token_report(tasks)
+    print(f"📏 Prompt tokens per task ({tokenizer_name()}); stable prefix {count_tokens(stable_prefix())} tokens")
+    print(f"{'task':<15}{'before':>8}{'after':>8}{'saved':>8}")
+    for row in rows:
+        saved = 1 - row["after"] / row["before"]
+        print(f"{row['task']:<15}{row['before']:>8}{row['after']:>8}{saved:>8.0%}")
+    before = sum(row["before"] for row in rows)
+    after = sum(row["after"] for row in rows)
+    print(f"{'total':<15}{before:>8}{after:>8}{1 - after / before:>8.0%}")
+
+
+def main():
+    # The task texts come from the real task factories, which need CrewAI
+    from main import SHOWCASE_TASKS, create_caroline_agent
+
+    agent = create_caroline_agent()
+    tasks = {}
+    for spec in SHOWCASE_TASKS:
+        task = spec.build(agent)
+        tasks[spec.name] = f"{task.description}\n{task.expected_output}"
+    print_token_report(tasks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Shared Speech Models for Caroline's Voice Agent
+Process-wide registry so each Whisper model is loaded once and reused.
+
+Models are keyed by (model size, device, int8). The first caller for a key loads
+it while later callers for the same key wait on that key's lock instead of
+loading a second copy; other keys can load at the same time. ``warm_up``
+starts the load on a daemon thread so the menu can appear immediately.
+"""
+
+import threading
+
+_models = {}
+_key_locks = {}
+_registry_lock = threading.Lock()
+
+
+def _lock_for(key):
+    """Return the lock that serializes loading for one registry key."""
+    with _registry_lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def quantize_int8(model, in_place: bool = False):
+    """
+    Return a CPU Whisper model with int8 dynamically quantized Linear layers.
+
+    The model is copied first unless ``in_place`` is set.
+
+    Whisper's Linear subclass only adds a dtype cast that is a no-op in fp32,
+    so its layers are turned back into plain ``nn.Linear`` for
+    ``quantize_dynamic`` to recognise them.
+    """
+    import copy
+
+    import torch
+    import whisper.model
+
+    model = (model if in_place else copy.deepcopy(model)).cpu()
+    for module in model.modules():
+        if type(module) is whisper.model.Linear:
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def get_whisper_model(size: str = "base", device: str = None, int8: bool = False):
+    """
+    Return the shared Whisper model for ``size``/``device``, loading it on first use.
+
+    With ``int8`` the model is an int8-quantized CPU copy of the fp32 one.
+    """
+    key = (size, device, int8)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock_for(key):
+        model = _models.get(key)
+        if model is None:
+            if int8:
+                # Quantize from the fp32 model without keeping it registered (and in memory)
+                # unless someone already loaded it for their own use
+                fp32 = _models.get((size, "cpu", False))
+                if fp32 is None:
+                    import whisper
+                    print(f"Loading speech recognition (Whisper {size})...")
+                    model = quantize_int8(whisper.load_model(size, device="cpu"), in_place=True)
+                else:
+                    model = quantize_int8(fp32)
+                print(f"✓ Quantized Whisper {size} to int8")
+            else:
+                # Imported here so text-only sessions never pay for torch/whisper
+                import whisper
+                print(f"Loading speech recognition (Whisper {size})...")
+                model = whisper.load_model(size, device=device)
+            _models[key] = model
+    return model
+
+
+def warm_up(size: str = "base", device: str = None, int8: bool = False) -> threading.Thread:
+    """Load a Whisper model on a background thread and return that thread."""
+    def load():
+        try:
+            get_whisper_model(size, device, int8)
+        except Exception as e:
+            # The next speech_to_text call retries the load and surfaces the error
+            print(f"⚠️ Whisper warm-up failed: {e}")
+
+    thread = threading.Thread(target=load, name=f"whisper-warmup-{size}", daemon=True)
+    thread.start()
+    return thread
+
+
+def is_loaded(size: str = "base", device: str = None, int8: bool = False) -> bool:
+    """Whether the model for ``size``/``device`` is already in memory."""
+    return (size, device, int8) in _models
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Speech-to-Text Service for Caroline's Voice Agent
+A pool of Whisper worker processes fed by a micro-batching dispatcher.
+
+Each worker process loads its model once and runs with its own torch
+thread count, so transcriptions use every core instead of queueing behind
+one model in one process. ``submit()`` returns a future at once. A
+dispatcher thread waits for an idle worker, takes the oldest pending
+utterance and gathers whatever else arrives within ``batch_window``
+seconds (up to ``max_batch``) into one batch; under load the queue already
+holds a full batch, so batching costs nothing, and when traffic is light
+it adds at most one window of latency. A worker decodes every clip that
+fits Whisper's 30 second window in one batched Whisper pass, alone or
+with company, so a clip's transcript (and its cache key) never depends on
+what it was batched with; longer clips go through ``transcribe`` with the
+profile's full options. A worker that dies, while decoding or while
+loading its model, fails only its own batch and is restarted; one that
+keeps dying before it is ready is given up like a worker that could not
+load.
+
+``metrics()`` reports the pending queue depth, batches in flight, batch
+sizes and time spent waiting for a worker.
+
+Usage: python stt_service.py CLIPS [--workers 4] [--threads 1] [--profile fast]
+                             [--window-ms 20] [--max-batch 8]
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import multiprocessing.connection
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from batch_transcribe import CHUNK_SECONDS, SAMPLE_RATE, decode_batch, find_audio
+from decoding_profiles import get_profile
+
+# A worker slot that dies this many times in a row before loading its model is given up
+MAX_LOAD_CRASHES = 3
+
+
+class WhisperEngine:
+    """What a worker process runs: one Whisper model and batched decoding."""
+
+    def __init__(self, profile="fast", device: str = None, threads: int = 1, language: str = "en"):
+        import torch
+
+        self.profile = get_profile(profile)
+        self.language = language
+        self.model = self.profile.load_model(device)
+        # The pool provides the parallelism; this overrides the profile's own thread count
+        torch.set_num_threads(threads)
+        self.options = self.profile.transcribe_options(language, self.model.device)
+
+    def transcribe_batch(self, clips: list) -> list:
+        import whisper
+
+        texts = [None] * len(clips)
+        short = []
+        for n, audio in enumerate(clips):
+            if len(audio) > CHUNK_SECONDS * SAMPLE_RATE:
+                texts[n] = self.model.transcribe(audio, **self.options)["text"].strip()
+            else:
+                short.append(n)
+        if short:
+            mels = [whisper.log_mel_spectrogram(whisper.pad_or_trim(clips[n]), n_mels=self.model.dims.n_mels).numpy()
+                    for n in short]
+            for n, text in zip(short, decode_batch(self.model, mels, self.language, self.profile.beam_size)):
+                texts[n] = text
+        return texts
+
+
+def _worker_main(slot: int, engine, options: dict, jobs, results):
+    """Worker process: load the engine once, then decode batches until told to stop."""
+    try:
+        engine = engine(**options)
+    except Exception as e:
+        results.send((slot, "failed", f"{type(e).__name__}: {e}"))
+        return
+    results.send((slot, "ready", os.getpid()))
+    while True:
+        batch = jobs.get()
+        if batch is None:
+            return
+        ids = [job_id for job_id, _ in batch]
+        started = time.perf_counter()
+        try:
+            texts = engine.transcribe_batch([audio for _, audio in batch])
+            error = None
+        except Exception as e:
+            texts, error = None, f"{type(e).__name__}: {e}"
+        results.send((slot, "done", (ids, texts, error, time.perf_counter() - started)))
+
+
+class STTService:
+    """Transcribes utterances on a pool of worker processes, in micro-batches."""
+
+    def __init__(self, workers: int = None, threads_per_worker: int = 1, profile="fast", device: str = None,
+                 language: str = "en", max_batch: int = 8, batch_window: float = 0.02, cache=None,
+                 engine=WhisperEngine):
+        """
+        Start ``workers`` processes (default: one per ``threads_per_worker`` cores).
+
+        ``engine`` is the class each worker instantiates with the profile,
+        device, thread count and language. With a ``cache``
+        (a TranscriptionCache) repeated audio never reaches a worker.
+        """
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.workers = workers or max(1, (os.cpu_count() or 1) // self.threads_per_worker)
+        self.profile = get_profile(profile)
+        self.device = device
+        self.language = language
+        self.max_batch = max(1, max_batch)
+        self.batch_window = batch_window
+        self.cache = cache
+        self._engine = engine
+        self._engine_options = {"profile": self.profile, "device": device,
+                                "threads": self.threads_per_worker, "language": language}
+
+        # Spawned, not forked: torch's thread pools don't survive a fork
+        self._context = multiprocessing.get_context("spawn")
+        # One results pipe per worker, written synchronously: a worker that dies
+        # mid-message can't leave a lock that its replacement needs held
+        self._results = [None] * self.workers
+        self._jobs = [self._context.Queue() for _ in range(self.workers)]
+        self._processes = [None] * self.workers
+        self._ready = [False] * self.workers
+        self._load_crashes = [0] * self.workers
+        self._in_flight = {}  # slot -> job ids of the batch it is decoding
+        self._futures = {}  # job id -> (future, cache key, time submitted)
+        self._pending = queue.Queue()
+        self._idle = queue.Queue()
+        self._idle_restarts = set()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._closed = False
+        self._stopping = False
+        self.load_error = None
+        self.stats = {"requests": 0, "cache_hits": 0, "completed": 0, "failed": 0, "batches": 0,
+                      "batched_requests": 0, "largest_batch": 0, "max_queue_depth": 0,
+                      "wait_seconds": 0.0, "decode_seconds": 0.0, "restarts": 0}
+
+        for slot in range(self.workers):
+            self._start_worker(slot)
+        self._dispatcher = threading.Thread(target=self._dispatch, name="stt-dispatcher", daemon=True)
+        self._collector = threading.Thread(target=self._collect, name="stt-collector", daemon=True)
+        self._dispatcher.start()
+        self._collector.start()
+        print(f"🎧 STT service: {self.workers} workers × {self.threads_per_worker} threads "
+              f"({self.profile.name} profile, batches of up to {self.max_batch})")
+
+    def _start_worker(self, slot: int):
+        if self._results[slot] is not None:
+            self._results[slot].close()
+        self._results[slot], writer = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_worker_main, name=f"stt-worker-{slot}", daemon=True,
+            args=(slot, self._engine, self._engine_options, self._jobs[slot], writer))
+        process.start()
+        writer.close()
+        self._processes[slot] = process
+
+    # --- requests ------------------------------------------------------
+
+    def decode_options(self, audio) -> dict:
+        """What a worker decodes ``audio`` with, as part of its cache key."""
+        if len(audio) > CHUNK_SECONDS * SAMPLE_RATE:
+            return self.profile.transcribe_options(self.language, self.device)
+        # decode_batch's options: no temperature fallback, no conditioning
+        return {"decoder": "batch", "language": self.language, "beam_size": self.profile.beam_size,
+                "fp16": self.profile.uses_fp16(self.device)}
+
+    def submit(self, audio) -> Future:
+        """Queue a 16 kHz float32 clip; the future resolves to its transcript."""
+        if self.profile.vad_trim:
+            from decoding_profiles import trim_silence
+
+            audio = trim_silence(audio, SAMPLE_RATE)
+        future = Future()
+        key = None
+        if self.cache is not None:
+            from transcription_cache import TranscriptionCache
+
+            key = TranscriptionCache.make_key(audio, self.profile.model_name, options=self.decode_options(audio))
+            text = self.cache.get(key)
+            if text is not None:
+                with self._lock:
+                    self.stats["requests"] += 1
+                    self.stats["cache_hits"] += 1
+                future.set_result(text)
+                return future
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("STTService is closed")
+            if self.load_error is not None:
+                raise RuntimeError(f"no STT worker could start: {self.load_error}")
+            job_id = next(self._ids)
+            self._futures[job_id] = (future, key, time.perf_counter())
+            self.stats["requests"] += 1
+            self._pending.put((job_id, audio))
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self._pending.qsize())
+        return future
+
+    def transcribe(self, audio, timeout: float = None) -> str:
+        return self.submit(audio).result(timeout)
+
+    async def transcribe_async(self, audio) -> str:
+        import asyncio
+
+        return await asyncio.wrap_future(self.submit(audio))
+
+    # --- dispatcher and collector ---------------------------------------
+
+    def _next_batch(self) -> list:
+        """The oldest pending clip plus whatever arrives within the batch window."""
+        first = self._pending.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._pending.get(timeout=remaining) if remaining > 0 else self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Closing: send what we have, then stop on the next call
+                self._pending.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _dispatch(self):
+        while True:
+            slot = self._idle.get()
+            if slot is None:
+                return
+            if self._processes[slot] is None:
+                # Given up while it waited in the idle queue
+                continue
+            batch = self._next_batch()
+            if batch is None:
+                return
+            now = time.perf_counter()
+            with self._lock:
+                self._in_flight[slot] = [job_id for job_id, _ in batch]
+                self.stats["batches"] += 1
+                self.stats["batched_requests"] += len(batch)
+                self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+                self.stats["wait_seconds"] += sum(now - self._futures[job_id][2] for job_id, _ in batch)
+            self._jobs[slot].put(batch)
+
+    def _collect(self):
+        while True:
+            # On every pass: under steady traffic some worker's pipe is never quiet for long
+            self._check_workers()
+            slots = {conn: slot for slot, conn in enumerate(self._results) if conn is not None}
+            ready = multiprocessing.connection.wait(list(slots), timeout=0.5)
+            if not ready and self._stopping:
+                return
+            for conn in ready:
+                try:
+                    message = conn.recv()
+                except EOFError:
+                    # The worker exited; _check_workers restarts it if it has to
+                    conn.close()
+                    self._results[slots[conn]] = None
+                    continue
+                self._handle(*message)
+
+    def _handle(self, slot: int, kind: str, payload):
+        if kind == "ready":
+            with self._lock:
+                self._ready[slot] = True
+                self._load_crashes[slot] = 0
+                self._changed.notify_all()
+            if slot in self._idle_restarts:
+                # It died while idle, so its slot is still in the idle queue
+                self._idle_restarts.discard(slot)
+            else:
+                self._idle.put(slot)
+        elif kind == "failed":
+            print(f"⚠️ STT worker {slot} could not load its model: {payload}")
+            self._give_up(slot, payload)
+        else:
+            self._finish(slot, *payload)
+            self._idle.put(slot)
+
+    def _finish(self, slot: int, ids: list, texts: list, error: str, seconds: float):
+        with self._lock:
+            self._in_flight.pop(slot, None)
+            self.stats["decode_seconds"] += seconds
+            done = [(self._futures.pop(job_id), text) for job_id, text in zip(ids, texts or [None] * len(ids))
+                    if job_id in self._futures]
+            self.stats["completed" if error is None else "failed"] += len(done)
+            self._changed.notify_all()
+        for (future, key, _), text in done:
+            if error is not None:
+                future.set_exception(RuntimeError(f"transcription failed: {error}"))
+                continue
+            if key is not None:
+                self.cache.put(key, text)
+            future.set_result(text)
+
+    def _check_workers(self):
+        """Restart workers that died, loaded or not; their batch fails, everything queued waits."""
+        for slot, process in enumerate(self._processes):
+            # Exit code 0 is a deliberate exit: its "failed" message is on the way
+            if process is None or process.is_alive() or process.exitcode == 0 or self._stopping:
+                continue
+            with self._lock:
+                ids = self._in_flight.get(slot)
+                was_ready = self._ready[slot]
+                self._ready[slot] = False
+            # Whether the slot is still waiting in the idle queue, so its next "ready" mustn't add it again
+            if ids is None and (was_ready or slot in self._idle_restarts):
+                self._idle_restarts.add(slot)
+            else:
+                self._idle_restarts.discard(slot)
+            error = f"worker exited with code {process.exitcode}"
+            self._finish(slot, ids or [], None, error, 0.0)
+            if not was_ready:
+                self._load_crashes[slot] += 1
+                if self._load_crashes[slot] >= MAX_LOAD_CRASHES:
+                    print(f"⚠️ STT worker {slot} exited ({process.exitcode}) while loading its model; giving up")
+                    self._give_up(slot, f"{error} while loading")
+                    continue
+            print(f"⚠️ STT worker {slot} exited ({process.exitcode}); restarting it")
+            with self._lock:
+                self.stats["restarts"] += 1
+            # A fresh queue: nothing meant for the dead worker is decoded twice
+            self._jobs[slot] = self._context.Queue()
+            self._start_worker(slot)
+
+    def _give_up(self, slot: int, error: str):
+        """Stop using a slot whose worker can't load; with none left, every request fails."""
+        with self._lock:
+            self._processes[slot] = None
+            if not any(self._processes):
+                self.load_error = error
+            self._changed.notify_all()
+        if self.load_error is not None:
+            self._fail_all()
+
+    def _fail_all(self):
+        with self._lock:
+            failed = list(self._futures.values())
+            self._futures.clear()
+            self.stats["failed"] += len(failed)
+            self._changed.notify_all()
+        for future, _, _ in failed:
+            future.set_exception(RuntimeError(f"no STT worker could start: {self.load_error}"))
+
+    # --- metrics and shutdown --------------------------------------------
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Wait until every worker has loaded its model (or failed to); False on timeout."""
+        with self._lock:
+            return self._changed.wait_for(
+                lambda: all(ready or process is None for ready, process in zip(self._ready, self._processes)),
+                timeout)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            in_flight = sum(len(ids) for ids in self._in_flight.values())
+        batches = stats.pop("batches")
+        batched = stats.pop("batched_requests")
+        wait = stats.pop("wait_seconds")
+        decode = stats.pop("decode_seconds")
+        return {"workers": self.workers, "threads_per_worker": self.threads_per_worker,
+                "ready_workers": sum(self._ready), "idle_workers": self._idle.qsize(),
+                "queue_depth": self._pending.qsize(), "in_flight": in_flight, "batches": batches,
+                "mean_batch_size": round(batched / batches, 2) if batches else 0.0,
+                "mean_wait_ms": round(wait / batched * 1000, 1) if batched else 0.0,
+                "mean_batch_decode_ms": round(decode / batches * 1000, 1) if batches else 0.0, **stats}
+
+    def close(self, timeout: float = None):
+        """Finish every queued clip, then stop the dispatcher and the workers."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending.put(None)
+            self._changed.wait_for(lambda: not self._futures, timeout)
+        self._idle.put(None)
+        self._dispatcher.join(timeout)
+        # Before the workers exit, so the collector doesn't restart them
+        self._stopping = True
+        for jobs, process in zip(self._jobs, self._processes):
+            if process is not None:
+                jobs.put(None)
+        for process in self._processes:
+            if process is not None:
+                process.join(timeout)
+        self._collector.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe clips on a pool of Whisper worker processes")
+    parser.add_argument("source", help="directory of audio files, or a .txt/.jsonl manifest")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: cores / threads)")
+    parser.add_argument("--threads", type=int, default=1, help="torch threads per worker")
+    parser.add_argument("--profile", default="fast", help="Whisper decoding profile")
+    parser.add_argument("--window-ms", type=float, default=20.0, help="how long a batch waits for company")
+    parser.add_argument("--max-batch", type=int, default=8)
+    args = parser.parse_args()
+
+    import whisper
+
+    clips = [whisper.load_audio(path) for path in find_audio(args.source)]
+    audio_seconds = sum(len(clip) for clip in clips) / SAMPLE_RATE
+    with STTService(args.workers, args.threads, args.profile, max_batch=args.max_batch,
+                    batch_window=args.window_ms / 1000) as service:
+        # Time from the first submit, not from the model loads
+        service.wait_ready()
+        start = time.perf_counter()
+        futures = [service.submit(clip) for clip in clips]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+        metrics = service.metrics()
+    print(f"✓ {len(clips)} clips ({audio_seconds:.1f}s of audio) in {elapsed:.1f}s: "
+          f"{audio_seconds / elapsed:.1f} audio-seconds per wall-second")
+    print(f"   {metrics['batches']} batches, mean size {metrics['mean_batch_size']}, "
+          f"mean wait {metrics['mean_wait_ms']}ms, deepest queue {metrics['max_queue_depth']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Retrieved Task Context for Caroline's CrewAI Agent
+Gives each crew task only the persona facts its description calls for.
+
+The backstory sections in the persona store are split into sentences and
+kept in a small knowledge index of their own. Just before a task is handed
+to its crew, its description and expected output are used as the query:
+the top-k sentences are taken best first while they fit the task's token
+budget, then appended to the task description in persona order. The agent
+itself only carries the stable prefix (who Caroline is and how she talks),
+so the system prompt stays identical across tasks and every remaining
+token is one the task asked for.
+
+Each retrieval is timed and ``print_context_report`` compares every
+task's prompt tokens with the full-backstory baseline.
+
+Usage: python task_context.py [-k 4] [--budget 200]
+"""
+
+import argparse
+import re
+import time
+
+from crew_runner import CrewTask
+from knowledge_index import KnowledgeIndex, get_embedder
+from persona_store import load_persona
+from prompt_assembly import (PREFIX_SECTIONS, count_tokens, full_backstory, stable_prefix, system_prompt,
+                             tokenizer_name)
+
+CONTEXT_HEADER = "Relevant facts about you (draw on these rather than anything else):"
+
+
+def persona_passages() -> dict:
+    """Every backstory sentence outside the stable prefix, keyed ``section/number`` in persona order."""
+    passages = {}
+    for section, text in load_persona().section("backstory").items():
+        if section in PREFIX_SECTIONS:
+            continue
+        for number, sentence in enumerate(re.split(r"(?<=[.!?])\s+", text.strip())):
+            passages[f"{section}/{number}"] = sentence
+    return passages
+
+
+class TaskContextRetriever:
+    """Picks the persona sentences a task needs, within a token budget."""
+
+    def __init__(self, k: int = 4, token_budget: int = 200, directory: str = "knowledge_index/persona",
+                 embedder=None):
+        self.k = k
+        self.token_budget = token_budget
+        self.index = KnowledgeIndex(directory, embedder)
+        passages = persona_passages()
+        self.index.update(passages)
+        self._position = {doc: n for n, doc in enumerate(passages)}
+        self.reports = {}
+
+    def select(self, query: str) -> list:
+        """Chunks for ``query``: best first while they fit the budget, returned in persona order."""
+        chosen = []
+        used = 0
+        for score, chunk in self.index.search(query, self.k):
+            tokens = count_tokens(chunk.text)
+            if used + tokens > self.token_budget:
+                continue
+            chosen.append(chunk)
+            used += tokens
+        return sorted(chosen, key=lambda chunk: self._position.get(chunk.doc, len(self._position)))
+
+    def context_for(self, name: str, task_text: str) -> str:
+        """The context block for one task; the retrieval is recorded for the report."""
+        start = time.perf_counter()
+        chunks = self.select(task_text)
+        context = "\n".join([CONTEXT_HEADER] + [f"- {chunk.text}" for chunk in chunks]) if chunks else ""
+        self.reports[name] = {"task": name, "task_text": task_text, "context": context,
+                              "facts": [chunk.doc for chunk in chunks],
+                              "ms": (time.perf_counter() - start) * 1000}
+        return context
+
+    def apply(self, name: str, task):
+        """Append the retrieved context to a built CrewAI Task's description."""
+        context = self.context_for(name, f"{task.description}\n{task.expected_output}")
+        if context:
+            task.description = f"{task.description}\n\n{context}"
+        return task
+
+
+def with_context(spec: CrewTask, retriever: TaskContextRetriever) -> CrewTask:
+    """The same CrewTask, with retrieved persona facts added when the Task is built."""
+    def build(agent):
+        return retriever.apply(spec.name, spec.build(agent))
+
+    return CrewTask(spec.name, build, spec.depends_on, spec.output_file)
+
+
+def context_report(retriever: TaskContextRetriever) -> list:
+    """Prompt tokens per retrieved task against sending the full backstory."""
+    full = count_tokens(system_prompt(full_backstory()))
+    compact = count_tokens(system_prompt(stable_prefix()))
+    rows = []
+    for report in retriever.reports.values():
+        task_tokens = count_tokens(report["task_text"])
+        context_tokens = count_tokens(report["context"]) if report["context"] else 0
+        rows.append({"task": report["task"], "before": full + task_tokens,
+                     "after": compact + task_tokens + context_tokens,
+                     "context": context_tokens, "facts": len(report["facts"]), "ms": report["ms"]})
+    return rows
+
+
+def print_context_report(retriever: TaskContextRetriever):
+    rows = context_report(retriever)
+    if not rows:
+        return
+    print(f"\n📏 Prompt tokens per task, full backstory vs retrieved facts ({tokenizer_name()}, "
+          f"top {retriever.k}, budget {retriever.token_budget}, {retriever.index.embedder.name})")
+    print(f"{'task':<15}{'full':>7}{'retrieved':>10}{'facts':>7}{'saved':>7}{'retrieval':>11}")
+    for row in rows:
+        saved = 1 - row["after"] / row["before"]
+        print(f"{row['task']:<15}{row['before']:>7}{row['after']:>10}{row['facts']:>7}{saved:>7.0%}"
+              f"{row['ms']:>9.2f}ms")
+    before = sum(row["before"] for row in rows)
+    after = sum(row["after"] for row in rows)
+    print(f"{'total':<15}{before:>7}{after:>10}{'':>7}{1 - after / before:>7.0%}"
+          f"{sum(row['ms'] for row in rows):>9.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the persona facts retrieved for each showcase task")
+    parser.add_argument("-k", type=int, default=4, help="sentences retrieved per task")
+    parser.add_argument("--budget", type=int, default=200, help="context tokens allowed per task")
+    parser.add_argument("--embedder", default=None, help='"hashing", a sentence-transformers model, or "auto"')
+    args = parser.parse_args()
+
+    # The task texts come from the real task factories, which need CrewAI
+    from main import SHOWCASE_TASKS, create_caroline_agent
+
+    retriever = TaskContextRetriever(args.k, args.budget, embedder=get_embedder(args.embedder))
+    agent = create_caroline_agent(backstory=stable_prefix())
+    for spec in SHOWCASE_TASKS:
+        with_context(spec, retriever).build(agent)
+        report = retriever.reports[spec.name]
+        print(f"\n📋 {spec.name}: {', '.join(report['facts']) or 'no facts'}")
+    print_context_report(retriever)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Streaming Task Output for Caroline's CrewAI Agent
+Shows each task's answer token by token instead of after the whole crew finishes.
+
+Every task's agent gets its own streaming LLM. CrewAI announces each chunk
+on its event bus with the LLM as the event source, so a ``StreamRouter``
+maps LLM instances to ``TaskStream`` writers. A writer skips the agent's
+"Thought / Action" scaffolding, passes everything after ``Final Answer:``
+to stdout and to the task's output file as it arrives, and notes when the
+first token showed up. The file is streamed under a temporary name and
+renamed into place when the task finishes, so a reader never sees a
+partial answer. If a model never streamed a final answer (native tool
+calling, or a cached response), the finished output is written once when
+the task completes, minus any scaffolding. Given the background file
+writer the agent's file tool queues on, a writer waits for the tool's queued write to its
+file before streaming into it, so the tool's copy never lands on top.
+"""
+
+import sys
+import threading
+import time
+
+from crew_runner import CrewTask
+from file_writer import AtomicFile
+
+FINAL_ANSWER = "Final Answer:"
+
+
+def event_api():
+    """CrewAI's event bus and the LLM events, wherever this CrewAI version keeps them."""
+    try:
+        from crewai.events.event_bus import crewai_event_bus
+        from crewai.events.types.llm_events import LLMCallStartedEvent, LLMStreamChunkEvent
+    except ImportError:
+        from crewai.utilities.events import crewai_event_bus
+        from crewai.utilities.events.llm_events import LLMCallStartedEvent, LLMStreamChunkEvent
+    return crewai_event_bus, LLMCallStartedEvent, LLMStreamChunkEvent
+
+
+def final_answer(text: str):
+    """What follows the last ``Final Answer:`` in ``text``, or None if it has none yet."""
+    marker = text.rfind(FINAL_ANSWER)
+    if marker < 0:
+        return None
+    return text[marker + len(FINAL_ANSWER):].lstrip()
+
+
+class TaskStream:
+    """Writes one task's final answer to stdout and a file as it streams in."""
+
+    def __init__(self, name: str, path: str = None, echo: bool = True, prefix: str = None, out=None,
+                 writer=None):
+        self.name = name
+        self.path = path
+        self.writer = writer
+        self.echo = echo
+        # With a prefix, stdout gets whole prefixed lines (for interleaved parallel tasks)
+        self.prefix = prefix
+        self.out = out or sys.stdout
+        self.first_chunk_at = None
+        self.chars = 0
+        self._lock = threading.Lock()
+        self._call_text = ""
+        self._answering = False
+        self._line = ""
+        self._file = None
+        self.finished = False
+
+    def start_call(self):
+        """A new LLM call began; only the call that gives the final answer is kept."""
+        with self._lock:
+            self._call_text = ""
+            if self._answering:
+                # The previous answer was rejected and is being regenerated
+                self._answering = False
+                self._restart()
+
+    def feed(self, chunk: str):
+        with self._lock:
+            if self.finished or not chunk:
+                return
+            if not self._answering:
+                self._call_text += chunk
+                chunk = final_answer(self._call_text)
+                if chunk is None:
+                    return
+                self._answering = True
+                self._call_text = ""
+                if not chunk:
+                    return
+            self._emit(chunk)
+
+    def _emit(self, text: str):
+        if self.first_chunk_at is None:
+            self.first_chunk_at = time.perf_counter()
+            if self.echo and not self.prefix:
+                self.out.write(f"\n📝 {self.name}: ")
+        self.chars += len(text)
+        if self.path:
+            if self._file is None:
+                if self.writer is not None:
+                    self.writer.flush(self.path)
+                self._file = AtomicFile(self.path)
+            self._file.write(text)
+        if self.echo:
+            if self.prefix:
+                self._line += text
+                *lines, self._line = self._line.split("\n")
+                for line in lines:
+                    self.out.write(f"{self.prefix}{line}\n")
+            else:
+                self.out.write(text)
+            self.out.flush()
+
+    def _restart(self):
+        self.chars = 0
+        self._line = ""
+        if self._file is not None:
+            self._file.truncate()
+
+    def finish(self, output=None):
+        """Task finished: flush, and write the output if nothing was streamed (Task callback)."""
+        with self._lock:
+            if self.finished:
+                return
+            if self.first_chunk_at is None and output is not None:
+                text = getattr(output, "raw", None) or str(output)
+                # A cached or tool-calling reply still carries the ReAct scaffolding
+                answer = final_answer(text)
+                self._emit(text if answer is None else answer)
+            if self.echo:
+                if self.prefix and self._line:
+                    self.out.write(f"{self.prefix}{self._line}\n")
+                elif not self.prefix and self.first_chunk_at is not None:
+                    self.out.write("\n")
+                self.out.flush()
+            if self._file is not None:
+                self._file.commit()
+                self._file = None
+            self.finished = True
+
+
+class StreamRouter:
+    """Routes CrewAI LLM stream events to the TaskStream registered for their LLM."""
+
+    def __init__(self):
+        self._streams = {}
+        self._bus = None
+        self._handlers = []
+
+    def register(self, llm, stream: TaskStream):
+        self._streams[id(llm)] = stream
+        inner = getattr(llm, "inner", None)
+        if inner is not None:
+            # Cached LLMs stream through the LLM they wrap
+            self._streams[id(inner)] = stream
+
+    def on_call_started(self, source, event):
+        stream = self._streams.get(id(source))
+        if stream is not None:
+            stream.start_call()
+
+    def on_chunk(self, source, event):
+        stream = self._streams.get(id(source))
+        if stream is not None:
+            stream.feed(event.chunk)
+
+    def start(self) -> "StreamRouter":
+        """Subscribe to the event bus; ``stop`` removes only this router's handlers."""
+        bus, call_started, chunk = event_api()
+        self._bus = bus
+        self._handlers = [(call_started, self.on_call_started), (chunk, self.on_chunk)]
+        for event_type, handler in self._handlers:
+            bus.on(event_type)(handler)
+        return self
+
+    def stop(self):
+        for event_type, handler in self._handlers:
+            _unsubscribe(self._bus, event_type, handler)
+        self._handlers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _unsubscribe(bus, event_type, handler):
+    """Remove one handler from the bus (``off`` on newer CrewAI, the handler table on older)."""
+    off = getattr(bus, "off", None)
+    if off is not None:
+        off(event_type, handler)
+        return
+    handlers = getattr(bus, "_handlers", {}).get(event_type, [])
+    if handler in handlers:
+        handlers.remove(handler)
+
+
+def with_stream(spec: CrewTask, stream: TaskStream) -> CrewTask:
+    """The same CrewTask, with the built Task reporting completion to ``stream``."""
+    def build(agent):
+        task = spec.build(agent)
+        task.callback = stream.finish
+        return task
+
+    return CrewTask(spec.name, build, spec.depends_on, spec.output_file)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for voice activity detection and utterance segmentation.
+"""
+
+import numpy as np
+
+from audio_capture import EnergyVAD, segment_utterance
+
+BLOCK = 480  # 30 ms at 16 kHz
+BLOCK_SECONDS = BLOCK / 16000
+
+
+def _silence(level=0.001):
+    return np.full(BLOCK, level, dtype=np.float32)
+
+
+def _speech():
+    return (0.3 * np.sin(np.linspace(0, 60 * np.pi, BLOCK))).astype(np.float32)
+
+
+def test_vad_learns_the_noise_floor():
+    vad = EnergyVAD(calibration_blocks=3)
+    for _ in range(3):
+        assert not vad.is_speech(_silence())
+    assert vad.is_speech(_speech())
+    assert not vad.is_speech(_silence(0.002))
+
+
+def test_utterance_includes_pre_roll_and_stops_on_silence():
+    stream = [_silence()] * 20 + [_speech()] * 10 + [_silence()] * 100
+    started = []
+    blocks = list(segment_utterance(iter(stream), EnergyVAD(), BLOCK_SECONDS,
+                                    silence_seconds=0.3, pre_roll_seconds=0.09,
+                                    on_speech_start=lambda: started.append(True)))
+
+    # 3 pre-roll blocks + 10 speech blocks + 10 blocks of trailing silence
+    assert len(blocks) == 3 + 10 + 10
+    assert started == [True]
+
+
+def test_utterance_is_capped_at_max_seconds():
+    stream = [_silence()] * 5 + [_speech()] * 1000
+    blocks = list(segment_utterance(iter(stream), EnergyVAD(), BLOCK_SECONDS,
+                                    pre_roll_seconds=0.0, max_seconds=1.5))
+    # No pre-roll: the utterance starts with the first speech block
+    assert len(blocks) == 50
+    assert all(block is stream[-1] for block in blocks)
+
+
+def test_gives_up_when_nobody_speaks():
+    stream = [_silence()] * 1000
+    blocks = list(segment_utterance(iter(stream), EnergyVAD(), BLOCK_SECONDS, no_speech_timeout=1.0))
+    assert blocks == []
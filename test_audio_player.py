@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for playback handles: every PortAudio stream is closed exactly once,
+and a stopped sequence plays nothing more.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+import audio_player
+from audio_player import PlaybackHandle, SequenceHandle
+
+
+class FakeStream:
+    """Records start/abort/close calls instead of opening an audio device."""
+
+    instances = []
+
+    def __init__(self, finished_callback=None, **options):
+        self.finished_callback = finished_callback
+        self.calls = []
+        FakeStream.instances.append(self)
+
+    def start(self):
+        self.calls.append("start")
+
+    def abort(self):
+        self.calls.append("abort")
+        self.finished_callback()
+
+    def close(self):
+        self.calls.append("close")
+
+
+def _handle(monkeypatch):
+    monkeypatch.setattr(audio_player.sd, "OutputStream", FakeStream)
+    return PlaybackHandle(np.zeros((160, 1), dtype=np.float32), 16000)
+
+
+def _closed(stream):
+    """How often the stream was closed, once the background close has had time to run."""
+    for _ in range(100):
+        if "close" in stream.calls:
+            break
+        time.sleep(0.01)
+    return stream.calls.count("close")
+
+
+def test_wait_then_stop_closes_once(monkeypatch):
+    handle = _handle(monkeypatch)
+    stream = FakeStream.instances[-1]
+    stream.finished_callback()  # playback ran to the end
+    assert handle.wait(1)
+    handle.stop()
+    assert _closed(stream) == 1
+    assert "abort" not in stream.calls
+
+
+def test_unwaited_handle_is_closed_when_it_finishes(monkeypatch):
+    handle = _handle(monkeypatch)
+    stream = FakeStream.instances[-1]
+    stream.finished_callback()
+    assert not handle.is_playing
+    assert _closed(stream) == 1
+
+
+def test_stop_aborts_and_closes_once(monkeypatch):
+    handle = _handle(monkeypatch)
+    stream = FakeStream.instances[-1]
+    handle.stop()
+    handle.stop()
+    assert handle.wait(0)
+    assert stream.calls.count("abort") == 1
+    assert _closed(stream) == 1
+
+
+class FakeHandle:
+    """A sound that plays for ``LENGTH`` seconds unless it is stopped."""
+
+    LENGTH = 0.2
+
+    def __init__(self, source):
+        self.source = source
+        self.stopped = threading.Event()
+
+    def wait(self, timeout=None):
+        self.stopped.wait(self.LENGTH if timeout is None else min(timeout, self.LENGTH))
+        return True
+
+    def stop(self):
+        self.stopped.set()
+
+
+class FakePlayer:
+    """Hands out FakeHandles; ``on_play`` runs inside play(), while the sequence is starting a sound."""
+
+    def __init__(self, on_play=None):
+        self.on_play = on_play
+        self.handles = []
+
+    def play(self, source):
+        if self.on_play:
+            self.on_play(source)
+        handle = FakeHandle(source)
+        self.handles.append(handle)
+        return handle
+
+
+def test_stop_between_segments_skips_the_rest():
+    sequence = []
+
+    def sources():
+        yield "first.mp3"
+        sequence[0].stop()  # barge-in after the first sentence finished
+        yield "second.mp3"
+
+    player = FakePlayer()
+    sequence.append(SequenceHandle(player, sources()))
+    assert sequence[0].wait(1)
+    assert sequence[0].played == ["first.mp3"]
+
+
+def test_stop_while_a_segment_starts_stops_that_segment():
+    stoppers = []
+
+    def stop_from_another_thread(source):
+        if source == "second.mp3":
+            stoppers.append(threading.Thread(target=sequence.stop))
+            stoppers[0].start()
+            time.sleep(0.05)  # stop() is now waiting for the segment to become current
+
+    def sources():
+        created.wait(1)
+        yield from ["second.mp3", "third.mp3"]
+
+    created = threading.Event()
+    player = FakePlayer(stop_from_another_thread)
+    sequence = SequenceHandle(player, sources())
+    created.set()
+    assert sequence.wait(1)
+    stoppers[0].join(1)
+    assert sequence.played == ["second.mp3"]
+    assert player.handles[0].stopped.is_set()
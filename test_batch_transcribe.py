@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for batch transcription: input discovery, resume and batching.
+"""
+
+import json
+
+import batch_transcribe
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+    return str(path)
+
+
+def test_directory_and_manifests_are_discovered(tmp_path):
+    wav = _touch(tmp_path / "clips" / "b.wav")
+    mp3 = _touch(tmp_path / "clips" / "nested" / "a.mp3")
+    _touch(tmp_path / "clips" / "notes.txt")
+    assert batch_transcribe.find_audio(str(tmp_path / "clips")) == sorted([wav, mp3])
+
+    (tmp_path / "list.txt").write_text("# questions\nclips/b.wav\n\n")
+    assert batch_transcribe.find_audio(str(tmp_path / "list.txt")) == [str(tmp_path / "clips" / "b.wav")]
+
+    (tmp_path / "list.jsonl").write_text(json.dumps({"path": mp3, "speaker": "x"}) + "\n")
+    assert batch_transcribe.find_audio(str(tmp_path / "list.jsonl")) == [mp3]
+
+
+def test_clips_are_batched_and_resumed(tmp_path, monkeypatch):
+    decoded = []
+
+    def prepare(path, n_mels=80):
+        if path.endswith("broken"):
+            return {"path": path, "error": "bad header"}
+        return {"path": path, "seconds": 2.0, "mel": path}
+
+    def decode(model, mels, language="en"):
+        decoded.append(list(mels))
+        return [f"text of {mel}" for mel in mels]
+
+    monkeypatch.setattr(batch_transcribe, "prepare_clip", prepare)
+    monkeypatch.setattr(batch_transcribe, "decode_batch", decode)
+    output = str(tmp_path / "out.jsonl")
+    paths = ["a", "b", "broken", "c", "d", "e"]
+
+    summary = batch_transcribe.transcribe_files(paths[:4], model=None, output=output, batch_size=2, workers=0)
+    assert decoded == [["a", "b"], ["c"]]
+    assert summary["files"] == 3 and summary["failed"] == 1
+    assert summary["audio_seconds"] == 6.0
+
+    # Simulate a crash mid-write, then resume with more input
+    with open(output, "a") as f:
+        f.write('{"path": "d", "te')
+    decoded.clear()
+    summary = batch_transcribe.transcribe_files(paths, model=None, output=output, batch_size=2, workers=0)
+    assert decoded == [["d", "e"]]
+    assert summary["skipped"] == 3 and summary["failed"] == 1
+
+    assert batch_transcribe.load_done(output) == {"a", "b", "c", "d", "e"}
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for sessions, backpressure and the chat endpoint of Caroline's server.
+"""
+
+import asyncio
+import types
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+import caroline_server
+from caroline_server import CarolineServer, percentiles
+from conversation_log import read_log
+
+
+def make_server(tmp_path, **options):
+    return CarolineServer(voice=False, conversation_log=str(tmp_path / "conversations.jsonl"), **options)
+
+
+def test_percentiles_use_nearest_rank():
+    samples = list(range(1, 101))
+    assert percentiles(samples) == {"p50": 51, "p99": 100}
+    assert percentiles([]) == {}
+
+
+def test_chat_sessions_are_isolated(tmp_path):
+    async def scenario():
+        server = make_server(tmp_path)
+        async with TestClient(TestServer(server.app())) as client:
+            first = await (await client.post("/chat", json={"message": "Tell me about your education"})).json()
+            second = await (await client.post("/chat", json={"message": "Hi Caroline!"})).json()
+            again = await (await client.post("/chat", json={"session": first["session"],
+                                                           "message": "What did you do at Tencent?"})).json()
+            metrics = await (await client.get("/metrics")).json()
+            return server, first, second, again, metrics
+
+    server, first, second, again, metrics = asyncio.run(scenario())
+    assert first["session"] != second["session"]
+    assert again["session"] == first["session"]
+    assert first["response"] and again["response"] != first["response"]
+    assert metrics["sessions"] == 2 and metrics["turns"] == 3
+    assert set(metrics["latency_ms"]["chat"]) == {"p50", "p99"}
+    # Every session's turns land in the one shared log, numbered per session
+    turns = [(record["session"], record["turn"]) for record in read_log(str(tmp_path / "conversations.jsonl"))]
+    assert sorted(turns) == sorted([(first["session"], 1), (second["session"], 1), (first["session"], 2)])
+
+
+def test_full_session_queue_is_rejected(tmp_path):
+    async def scenario():
+        server = make_server(tmp_path, queue_size=1, max_sessions=1)
+        release = asyncio.Event()
+
+        async def slow(session):
+            await release.wait()
+            return "answered"
+
+        session = server.session_for("kiosk")
+        running = await server.enqueue(session, slow)
+        await asyncio.sleep(0)  # the worker takes the first turn off the queue
+        waiting = await server.enqueue(session, slow)
+        with pytest.raises(web.HTTPTooManyRequests):
+            await server.enqueue(session, slow)
+        with pytest.raises(web.HTTPServiceUnavailable):
+            server.session_for("another kiosk")
+        release.set()
+        results = await asyncio.gather(running, waiting)
+        server._close_session(session)
+        return server, results
+
+    server, results = asyncio.run(scenario())
+    assert results == ["answered", "answered"]
+    assert server.rejected == 2 and not server.sessions
+
+
+def test_bad_requests_get_400(tmp_path, monkeypatch):
+    def unreadable(data):
+        raise RuntimeError("Error opening <_io.BytesIO object>: Format not recognised.")
+
+    monkeypatch.setattr(caroline_server, "decode_wav", unreadable)
+
+    async def scenario():
+        server = make_server(tmp_path)
+        server.demo = types.SimpleNamespace()  # voice "loaded"; the upload never gets past decoding
+        async with TestClient(TestServer(server.app())) as client:
+            statuses = [(await client.post("/chat", json=body)).status for body in ([], "hi", {"message": ""})]
+            statuses.append((await client.post("/voice", data=b"not a wav file")).status)
+            return statuses
+
+    assert asyncio.run(scenario()) == [400, 400, 400, 400]
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only JSONL conversation log.
+"""
+
+import time
+
+import conversation_log
+from conversation_log import ConversationLog, index_sessions, read_log, read_session
+
+
+def test_turns_are_on_disk_before_close(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    log = ConversationLog(path, session="a")
+    log.append({"user": "hi", "caroline": "hello"})
+    log.append({"user": "research?", "caroline": "cardiovascular"})
+
+    turns = list(read_log(path))
+    assert [t["turn"] for t in turns] == [1, 2]
+    assert turns[1]["session"] == "a"
+    assert turns[1]["caroline"] == "cardiovascular"
+    log.close()
+
+
+def test_memory_window_is_bounded(tmp_path):
+    log = ConversationLog(str(tmp_path / "log.jsonl"), window=3)
+    for i in range(10):
+        log.append({"user": str(i)})
+    log.close()
+
+    assert len(log) == 10
+    assert [t["user"] for t in log.recent] == ["7", "8", "9"]
+
+
+def test_sessions_are_indexed_and_read_back(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    for session, count in (("first", 2), ("second", 3)):
+        log = ConversationLog(path, session=session)
+        for i in range(count):
+            log.append({"timestamp": f"{session}-{i}", "user": str(i)})
+        log.close()
+
+    index = index_sessions(path)
+    assert list(index) == ["first", "second"]
+    assert index["second"]["turns"] == 3
+    assert index["second"]["start"] == "second-0"
+    assert index["second"]["end"] == "second-2"
+
+    turns = read_session(path, "second", index)
+    assert [t["user"] for t in turns] == ["0", "1", "2"]
+    assert [t["user"] for t in read_log(path, session="first")] == ["0", "1"]
+
+
+def test_half_written_last_line_is_skipped(tmp_path):
+    path = tmp_path / "log.jsonl"
+    log = ConversationLog(str(path), session="s")
+    log.append({"user": "complete"})
+    log.close()
+    with open(path, "a") as f:
+        f.write('{"session": "s", "user": "cut o')
+
+    assert [t["user"] for t in read_log(str(path))] == ["complete"]
+    assert index_sessions(str(path))["s"]["turns"] == 1
+
+
+def test_next_session_starts_on_a_fresh_line(tmp_path):
+    path = tmp_path / "log.jsonl"
+    path.write_text('{"session": "old", "user": "cut o')
+    log = ConversationLog(str(path), session="new")
+    log.append({"user": "hello"})
+    log.close()
+
+    assert [t["user"] for t in read_log(str(path))] == ["hello"]
+
+
+def test_idle_turns_are_synced_after_the_interval(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(conversation_log.os, "fsync", synced.append)
+    log = ConversationLog(str(tmp_path / "log.jsonl"), sync_every=100, sync_interval=0.05)
+    log.append({"user": "first"})
+    log.append({"user": "second"})
+    assert synced == []
+
+    # No further turn arrives, the timer syncs on its own
+    deadline = time.monotonic() + 5
+    while not synced and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(synced) == 1
+    log.close()
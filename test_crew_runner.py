@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the dependency-aware parallel task runner.
+"""
+
+import threading
+import time
+
+import pytest
+
+from crew_runner import CrewTask, run_graph
+
+
+def test_independent_tasks_overlap_and_keep_declared_order():
+    tasks = [CrewTask(name, None) for name in ("intro", "background", "research")]
+    delays = {"intro": 0.15, "background": 0.05, "research": 0.1}
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def execute(task, deps):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(delays[task.name])
+        with lock:
+            running[0] -= 1
+        return task.name.upper()
+
+    start = time.perf_counter()
+    results = run_graph(tasks, execute, max_workers=3)
+    wall = time.perf_counter() - start
+
+    assert [r.output for r in results] == ["INTRO", "BACKGROUND", "RESEARCH"]
+    assert peak[0] == 3
+    assert wall < sum(delays.values())
+
+
+def test_dependents_wait_for_and_receive_their_inputs():
+    order = []
+
+    def execute(task, deps):
+        order.append(task.name)
+        return "+".join([task.name] + [deps[name].output for name in task.depends_on])
+
+    tasks = [
+        CrewTask("summary", None, depends_on=("research", "leadership")),
+        CrewTask("research", None),
+        CrewTask("leadership", None),
+    ]
+    results = run_graph(tasks, execute, max_workers=2)
+
+    assert order[-1] == "summary"
+    assert results[0].output == "summary+research+leadership"
+
+
+def test_bad_graphs_are_rejected_before_running():
+    with pytest.raises(ValueError, match="unknown"):
+        run_graph([CrewTask("a", None, depends_on=("b",))], lambda task, deps: None)
+    with pytest.raises(ValueError, match="cycle"):
+        run_graph([CrewTask("a", None, depends_on=("b",)), CrewTask("b", None, depends_on=("a",))],
+                  lambda task, deps: None)
+
+
+def test_failures_propagate():
+    def execute(task, deps):
+        raise RuntimeError(f"{task.name} failed")
+
+    with pytest.raises(RuntimeError, match="only failed"):
+        run_graph([CrewTask("only", None)], execute)
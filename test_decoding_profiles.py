@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for Whisper decoding profiles and the word error rate used to compare them.
+"""
+
+import pytest
+
+from bench_stt_profiles import word_error_rate, word_errors
+from decoding_profiles import FALLBACK_TEMPERATURES, PROFILES, get_profile
+
+
+def test_profiles_translate_to_transcribe_options():
+    balanced = get_profile("balanced").transcribe_options(device="cpu")
+    assert balanced["temperature"] == FALLBACK_TEMPERATURES
+    assert "beam_size" not in balanced
+
+    accurate = get_profile("accurate").transcribe_options(device="cpu")
+    assert accurate["beam_size"] == 5
+
+    fast = get_profile("fast")
+    assert fast.transcribe_options(device="cpu")["temperature"] == 0.0
+    assert fast.model_name == "base-int8"
+    assert get_profile(fast) is fast
+
+
+def test_fp16_follows_the_device():
+    balanced = get_profile("balanced")
+    assert balanced.transcribe_options(device="cpu")["fp16"] is False
+    assert balanced.transcribe_options(device="cuda")["fp16"] is True
+    # int8 models always run on the CPU
+    assert get_profile("fast").transcribe_options(device="cuda")["fp16"] is False
+
+
+def test_unknown_profile_lists_the_choices():
+    with pytest.raises(ValueError) as error:
+        get_profile("turbo")
+    for name in PROFILES:
+        assert name in str(error.value)
+
+
+def test_word_errors_ignore_case_and_punctuation():
+    assert word_errors("Tell me about your research", "tell me about your research.") == 0
+    assert word_errors("what was your experience at tencent", "what was experience at ten cent") == 3
+    assert word_error_rate([("a b c d", "a b c d"), ("a b c d", "a x c")]) == pytest.approx(2 / 8)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the background file writer behind the agent's file tool.
+"""
+
+import os
+import threading
+
+import file_writer
+from file_writer import BackgroundFileWriter, queue_file_write
+
+
+def test_writes_land_atomically_and_leave_no_temp_files(tmp_path):
+    writer = BackgroundFileWriter(fsync=False)
+    path = writer.write(str(tmp_path / "out" / "caroline_research_capabilities.md"), "Research expertise")
+    assert writer.flush(timeout=5)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "Research expertise"
+    assert os.listdir(tmp_path / "out") == ["caroline_research_capabilities.md"]
+    writer.close()
+
+
+def test_repeated_writes_to_a_queued_path_are_coalesced(tmp_path, monkeypatch):
+    gate = threading.Event()
+    written = []
+
+    def slow_write(path, content, fsync=True):
+        gate.wait(5)
+        written.append((os.path.basename(path), content))
+
+    monkeypatch.setattr(file_writer, "write_atomic", slow_write)
+    writer = BackgroundFileWriter()
+    writer.write(str(tmp_path / "first.md"), "blocking")
+    for version in range(5):
+        writer.write(str(tmp_path / "leadership.md"), f"draft {version}")
+    assert writer.is_pending(str(tmp_path / "leadership.md"))
+    gate.set()
+    assert writer.flush(timeout=5)
+    assert written == [("first.md", "blocking"), ("leadership.md", "draft 4")]
+    assert writer.stats()["coalesced"] == 4
+    writer.close()
+
+
+def test_tool_returns_before_the_write_and_respects_overwrite(tmp_path):
+    writer = BackgroundFileWriter(fsync=False)
+    message = queue_file_write(writer, "impact.md", "v1", directory=str(tmp_path))
+    assert message.startswith("Content successfully written to")
+    refused = queue_file_write(writer, "impact.md", "v2", directory=str(tmp_path))
+    assert "already exists" in refused
+    queue_file_write(writer, "impact.md", "v3", directory=str(tmp_path), overwrite="True")
+    writer.close()
+    assert (tmp_path / "impact.md").read_text(encoding="utf-8") == "v3"
+
+
+def test_flush_reports_failed_writes(tmp_path, monkeypatch):
+    def failing_write(path, content, fsync=True):
+        if path.endswith("blocked.md"):
+            raise PermissionError("read-only")
+
+    monkeypatch.setattr(file_writer, "write_atomic", failing_write)
+    writer = BackgroundFileWriter()
+    ok = writer.write(str(tmp_path / "ok.md"), "fine")
+    blocked = writer.write(str(tmp_path / "blocked.md"), "lost")
+    assert writer.flush(ok, timeout=5)
+    assert not writer.flush(timeout=5)
+    assert list(writer.errors) == [blocked]
+    writer.close()
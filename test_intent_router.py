@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled intent router used by Caroline's agents.
+"""
+
+import intent_router
+from intent_router import INTENTS, IntentRouter, route, tokenize
+from interactive_demo import InteractiveCarolineAgent
+
+
+def test_tokenize_stems_common_suffixes():
+    assert tokenize("Organized STUDENTS, studying!") == ["organiz", "student", "study"]
+
+
+def test_keywords_match_whole_tokens_only():
+    router = IntentRouter({'ai': ['ai'], 'background': ['who']})
+    assert router.route("What she said was whole") is None
+    assert router.route("Tell me about AI") == 'ai'
+
+
+def test_inflected_words_match_without_the_stemmer_cache_growing():
+    router = IntentRouter({'education': ['study'], 'leadership': ['organize', 'students']})
+    assert router.scores("Organized STUDENTS, studying!") == {'education': 1.0, 'leadership': 2.0}
+    # Non-ASCII letters separate tokens, as in tokenize()
+    assert router.route("naïve-study") == 'education'
+    before = intent_router._stem.cache_info().currsize
+    router.route(" ".join(f"word{n}" for n in range(1000)))
+    assert intent_router._stem.cache_info().currsize == before
+    assert intent_router._stem.cache_info().maxsize is not None
+
+
+def test_phrases_and_weights():
+    router = IntentRouter({
+        'industry': {'work': 0.5},
+        'ai': {'machine learning': 2.0},
+    })
+    assert router.scores("machine learning work") == {'ai': 2.0, 'industry': 0.5}
+    assert router.route("I work on machine learning") == 'ai'
+    # The phrase needs both words in order
+    assert router.route("learning about machines") is None
+
+
+def test_ties_fall_back_to_declaration_order():
+    router = IntentRouter({'first': ['alpha'], 'second': ['beta']})
+    assert router.route("beta alpha") == 'first'
+
+
+def test_repeated_keywords_count_once():
+    router = IntentRouter({'research': ['research'], 'industry': {'tencent': 1.5}})
+    assert router.route("research research research at tencent") == 'industry'
+
+
+def test_interactive_agent_routes_questions():
+    agent = InteractiveCarolineAgent()
+    assert agent.respond_to_question("What did you study at Harvard?") == agent.responses['education']
+    assert agent.respond_to_question("Tell me about your Tencent internship") == agent.responses['industry']
+    assert agent.respond_to_question("What she said was nice") == agent.responses['default']
+
+
+def test_shared_route_covers_every_front_end_topic():
+    assert route("hey there") == 'greeting'
+    assert route("Hey, tell me about Harvard") == 'education'
+    assert route("Hi, what did you do at Tencent?") == 'industry'
+    assert route("Did you study genomic data?") == 'research'
+    assert route("Tell me about the Harvard Chan club") == 'leadership'
+    assert set(INTENTS) >= {'education', 'research', 'industry', 'technical', 'leadership', 'background'}
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for chunking, incremental indexing and search in the knowledge index.
+"""
+
+import numpy as np
+
+from knowledge_index import HashingEmbedder, KnowledgeIndex, chunk_text
+
+SOURCES = {
+    "mock/leadership": "As Chair of Marketing and Communication I organized workshops for 200+ participants "
+                       "and helped 30 students secure internships in biotechnology.",
+    "mock/research": "I build cardiovascular risk models with cooperative learning and survival analysis "
+                     "on genomic, cardiac MRI and clinical data.",
+    "voice/tencent": """At Tencent Healthcare I designed multimodal AI medical LLM
+            solutions and contributed to POC deals worth over 20 million yuan.""",
+}
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self):
+        super().__init__()
+        self.embedded = 0
+
+    def embed(self, texts):
+        self.embedded += len(texts)
+        return super().embed(texts)
+
+
+def test_chunks_drop_markdown_and_keep_headings_with_their_text():
+    text = "**Technical Skills:**\n- Python, R, SQL\n- TensorFlow\n\n# Impact\n\nShort paragraph."
+    assert chunk_text(text) == ["Technical Skills: Python, R, SQL TensorFlow", "Impact", "Short paragraph."]
+    long = " ".join(f"Sentence number {n} is here." for n in range(40))
+    assert all(len(chunk) <= 120 for chunk in chunk_text(long, max_chars=120))
+
+
+def test_search_finds_the_relevant_passage(tmp_path):
+    index = KnowledgeIndex(str(tmp_path), HashingEmbedder())
+    index.update(SOURCES)
+    score, chunk = index.search("How did students get internships?", k=3)[0]
+    assert chunk.doc == "mock/leadership"
+    assert index.answer("survival analysis of cardiac data").startswith("I build cardiovascular")
+    assert index.answer("zebra quantum pottery") is None
+    assert isinstance(index._vectors, np.memmap)
+
+
+def test_update_only_embeds_changed_chunks_and_persists(tmp_path):
+    embedder = CountingEmbedder()
+    index = KnowledgeIndex(str(tmp_path), embedder)
+    assert index.update(SOURCES)["embedded"] == 3
+    assert index.update(SOURCES)["embedded"] == 0
+
+    changed = dict(SOURCES, **{"mock/research": "I study spatial transcriptomics of neuroimmune stress."})
+    stats = index.update(changed)
+    assert (stats["embedded"], stats["reused"], stats["removed"]) == (1, 2, 1)
+    assert embedder.embedded == 4
+
+    reopened = KnowledgeIndex(str(tmp_path), CountingEmbedder())
+    assert [chunk.text for chunk in reopened.chunks] == [chunk.text for chunk in index.chunks]
+    assert reopened.update(changed)["embedded"] == 0
+    assert reopened.search("neuroimmune stress")[0][1].doc == "mock/research"
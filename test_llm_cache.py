@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent LLM response cache.
+"""
+
+import time
+
+from llm_cache import LLMCache
+
+MESSAGES = [
+    {"role": "system", "content": "You are Caroline's digital twin. Backstory: ..."},
+    {"role": "user", "content": "Introduce yourself to the MIT AI Studio class."},
+]
+
+
+def test_key_depends_on_everything_that_shapes_the_answer():
+    key = LLMCache.make_key("gpt-4o-mini", MESSAGES)
+    assert key == LLMCache.make_key("gpt-4o-mini", [dict(m) for m in MESSAGES])
+    assert key != LLMCache.make_key("gpt-4o", MESSAGES)
+    assert key != LLMCache.make_key("gpt-4o-mini", MESSAGES[:1])
+    assert key != LLMCache.make_key("gpt-4o-mini", MESSAGES, tools=[{"name": "file_writer"}])
+    assert key != LLMCache.make_key("gpt-4o-mini", MESSAGES, stop=["\nObservation:"])
+
+
+def test_responses_persist_across_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = LLMCache(path)
+    key = LLMCache.make_key("gpt-4o-mini", MESSAGES)
+    assert cache.get(key) is None
+    cache.put(key, "Hi everyone! I'm Caroline.")
+    cache.close()
+
+    reopened = LLMCache(path)
+    assert reopened.get(key) == "Hi everyone! I'm Caroline."
+    assert reopened.stats()["hits"] == 1
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite"), ttl_seconds=0.05)
+    cache.put("k", "answer")
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_size_budget_evicts_least_recently_used(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite"), max_bytes=25)
+    cache.put("a", "x" * 10)
+    time.sleep(0.01)
+    cache.put("b", "y" * 10)
+    time.sleep(0.01)
+    assert cache.get("a") == "x" * 10
+    time.sleep(0.01)
+    cache.put("c", "z" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["bytes"] <= 25
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the deterministic offline LLM stand-in.
+"""
+
+import json
+import urllib.request
+
+from offline_llm import OfflineLLMServer, complete
+
+# CrewAI's ReAct tool instructions, which themselves mention "Observation:"
+TOOLS_PROMPT = """
+You ONLY have access to the following tools, and should NEVER make up tools that are not listed here:
+
+Tool Name: File Writer Tool
+Tool Arguments: {'filename': {'type': 'str'}, 'directory': {'type': 'str'}, 'overwrite': {'type': 'str'}, 'content': {'type': 'str'}}
+Tool Description: A tool to write content to a specified file.
+
+IMPORTANT: Use the following format in your response:
+
+```
+Thought: you should always think about what to do
+Action: the action to take, only one name of [File Writer Tool], just the name, exactly as it's written.
+Action Input: the input to the action, just a simple JSON object, enclosed in curly braces, using \" to wrap keys and values.
+Observation: the result of the action
+```
+
+Once all necessary information is gathered, return the following format:
+
+```
+Thought: I now know the final answer
+Final Answer: the final answer to the original input question
+```"""
+SYSTEM = {"role": "system", "content": "You are Caroline." + TOOLS_PROMPT}
+
+
+def _task(description):
+    return {"role": "user", "content": f"\nCurrent Task: {description}\n\nThis is the expected criteria for your final answer: ..."}
+
+
+def _post(server, payload):
+    request = urllib.request.Request(server.base_url + "/chat/completions", data=json.dumps(payload).encode(),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return response.read().decode()
+
+
+def test_task_is_answered_with_its_canned_response():
+    reply = complete([SYSTEM, _task("Describe your leadership experience and the impact you've had on others.")])
+    assert reply["content"].startswith("Thought: I now can give a great answer\nFinal Answer: ")
+    assert "Harvard Chan Biotechnology Club" in reply["content"]
+    assert reply == complete([SYSTEM, _task("Describe your leadership experience and the impact you've had on others.")])
+
+
+def test_save_requests_call_the_file_writer_once():
+    task = _task("Explain the types of biostatistics and AI research tasks you can help with.\n"
+                 "7. Save this information to a file called 'caroline_research_capabilities.md'")
+    first = complete([SYSTEM, task])["content"]
+    assert "Action: File Writer Tool" in first
+    arguments = json.loads(first.split("Action Input: ", 1)[1])
+    assert arguments["filename"] == "caroline_research_capabilities.md"
+
+    after = complete([SYSTEM, task, {"role": "assistant", "content": first},
+                      {"role": "user", "content": "Observation: Content successfully written"}])
+    assert "Final Answer:" in after["content"]
+
+    # Without a system prompt CrewAI puts the tool instructions in the user message
+    inline = _task("Explain the types of biostatistics and AI research tasks you can help with.\n"
+                   "7. Save this information to a file called 'caroline_research_capabilities.md'")
+    inline["content"] = TOOLS_PROMPT + inline["content"]
+    assert "Action: File Writer Tool" in complete([inline])["content"]
+    assert "Final Answer:" in complete([inline, {"role": "assistant", "content": first + "\nObservation: done"}])["content"]
+
+    native = complete([task], tools=[{"type": "function", "function": {"name": "file_writer_tool"}}])
+    assert native["tool_call"]["name"] == "file_writer_tool"
+
+
+def test_native_tool_requests_get_plain_answers():
+    tools = [{"type": "function", "function": {"name": "file_writer_tool"}}]
+    reply = complete([SYSTEM, _task("Describe your leadership experience and the impact you've had on others.")],
+                     tools=tools)
+    assert "Harvard Chan Biotechnology Club" in reply["content"]
+    assert "Thought:" not in reply["content"] and "Final Answer:" not in reply["content"]
+
+    # After the native tool call, the answer is plain content too
+    task = _task("Explain the types of biostatistics and AI research tasks you can help with.\n"
+                 "7. Save this information to a file called 'caroline_research_capabilities.md'")
+    after = complete([task, {"role": "assistant", "content": None, "tool_calls": [{"id": "call_0"}]},
+                      {"role": "tool", "tool_call_id": "call_0", "content": "Content successfully written"}],
+                     tools=tools)
+    assert "tool_call" not in after and "Thought:" not in after["content"]
+
+
+def test_server_speaks_openai_json_and_sse():
+    with OfflineLLMServer() as server:
+        messages = [SYSTEM, _task("Introduce yourself to the MIT AI Studio class as Caroline Song.")]
+        body = json.loads(_post(server, {"model": "caroline-offline", "messages": messages}))
+        content = body["choices"][0]["message"]["content"]
+        assert "Caroline Song" in content
+        assert body["usage"]["completion_tokens"] > 0
+
+        stream = _post(server, {"model": "caroline-offline", "messages": messages, "stream": True})
+        events = [line[len("data: "):] for line in stream.splitlines() if line.startswith("data: ")]
+        assert events[-1] == "[DONE]"
+        streamed = "".join(json.loads(e)["choices"][0]["delta"].get("content") or "" for e in events[:-1])
+        assert streamed == content
+        assert server.requests == 2
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the canonical persona store and its binary snapshot.
+"""
+
+import json
+import os
+
+import pytest
+
+from persona_store import DEFAULT_SOURCE, PersonaSnapshot, compile_persona, load_persona, load_source
+
+SOURCE = {
+    "version": 1,
+    "facts": {"harvard_gpa": "3.96"},
+    "agent": {"role": "Researcher"},
+    "backstory": {"academic": "Harvard with a ${harvard_gpa} GPA.", "research": "Survival analysis."},
+    "profile": {"education": {"current": "Harvard (${harvard_gpa} GPA)"}, "languages": "English and Mandarin"},
+}
+
+
+def _write(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def test_snapshot_round_trips_in_source_order(tmp_path):
+    source = tmp_path / "persona.json"
+    _write(source, SOURCE)
+    compile_persona(str(source), str(tmp_path / "persona.snapshot"))
+    snapshot = PersonaSnapshot(str(tmp_path / "persona.snapshot"))
+
+    assert snapshot["backstory/academic"] == "Harvard with a 3.96 GPA."
+    assert list(snapshot.section("backstory")) == ["academic", "research"]
+    assert snapshot.tree("profile") == {"education": {"current": "Harvard (3.96 GPA)"},
+                                        "languages": "English and Mandarin"}
+    assert "agent/role" in snapshot and "agent/goal" not in snapshot
+    assert snapshot.get("agent/goal", "none") == "none"
+    with pytest.raises(KeyError):
+        snapshot["backstory/hobbies"]
+    snapshot.close()
+
+
+def test_unknown_fact_reference_is_rejected(tmp_path):
+    source = tmp_path / "persona.json"
+    _write(source, dict(SOURCE, agent={"role": "GPA ${sydney_gpa}"}))
+    with pytest.raises(ValueError, match="agent/role"):
+        load_source(str(source))
+
+
+def test_snapshot_is_recompiled_when_the_source_changes(tmp_path):
+    source = tmp_path / "persona.json"
+    _write(source, SOURCE)
+    first = load_persona(str(source))
+    assert first["agent/role"] == "Researcher"
+
+    _write(source, dict(SOURCE, agent={"role": "Biostatistics AI Researcher"}))
+    os.utime(source, ns=(1, 1))
+    assert load_persona(str(source))["agent/role"] == "Biostatistics AI Researcher"
+    # The stale snapshot's mapping is released, not left for the garbage collector
+    assert first._map.closed
+
+
+def test_shipped_persona_gives_one_gpa_per_school():
+    texts = load_source(DEFAULT_SOURCE)
+    assert texts["facts/harvard_gpa"] == "3.96" and texts["facts/sydney_gpa"] == "4.0"
+    for key, text in texts.items():
+        # Only the Sydney GPA is perfect; every GPA is quoted from the facts
+        assert "perfect GPA" not in text and "perfect GPAs" not in text, key
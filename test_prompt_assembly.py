@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Tests for per-task backstory assembly.
+"""
+
+import pytest
+
+import prompt_assembly
+from prompt_assembly import TASK_SECTIONS, backstory_for, build_backstory, sections, stable_prefix
+
+
+def test_every_task_shares_the_stable_prefix():
+    prefix = stable_prefix()
+    for task in TASK_SECTIONS:
+        assert backstory_for(task).startswith(prefix)
+
+
+def test_tasks_only_get_their_sections():
+    leadership = backstory_for("leadership")
+    assert "Chair of Marketing and Communication" in leadership
+    assert "spatial transcriptomics" not in leadership
+    assert "Python, R, TensorFlow" not in leadership
+    assert len(leadership) < len(prompt_assembly.full_backstory())
+
+
+def test_sections_follow_canonical_order_whatever_the_request_order():
+    assert build_backstory(("skills", "academic")) == build_backstory(("academic", "skills", "academic"))
+    with pytest.raises(ValueError):
+        build_backstory(("hobbies",))
+
+
+def test_unknown_task_falls_back_to_every_section():
+    everything = backstory_for(None)
+    for text in sections().values():
+        assert text in everything
+
+
+def test_report_shows_savings_for_every_task(monkeypatch):
+    monkeypatch.setattr(prompt_assembly, "_encoder", lambda: None)
+    rows = prompt_assembly.token_report({task: "Describe it." for task in TASK_SECTIONS})
+    assert [row["task"] for row in rows] == list(TASK_SECTIONS)
+    assert all(row["after"] < row["before"] for row in rows)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared Whisper model registry.
+"""
+
+import sys
+import threading
+import types
+
+import speech_models
+
+
+def _fake_whisper(calls):
+    """A stand-in whisper module that records every load_model call."""
+    module = types.ModuleType("whisper")
+
+    def load_model(size, device=None):
+        calls.append((size, device))
+        return object()
+
+    module.load_model = load_model
+    return module
+
+
+def test_concurrent_callers_share_one_load(monkeypatch):
+    calls = []
+    monkeypatch.setitem(sys.modules, "whisper", _fake_whisper(calls))
+    monkeypatch.setattr(speech_models, "_models", {})
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(speech_models.get_whisper_model("tiny")))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [("tiny", None)]
+    assert len({id(model) for model in results}) == 1
+
+
+def test_models_are_keyed_by_size_and_device(monkeypatch):
+    calls = []
+    monkeypatch.setitem(sys.modules, "whisper", _fake_whisper(calls))
+    monkeypatch.setattr(speech_models, "_models", {})
+
+    speech_models.warm_up("base", "cpu").join()
+    assert speech_models.is_loaded("base", "cpu")
+    assert not speech_models.is_loaded("base", None)
+    speech_models.get_whisper_model("base", "cpu")
+    speech_models.get_whisper_model("small", "cpu")
+    assert calls == [("base", "cpu"), ("small", "cpu")]
+
+
+def test_int8_models_do_not_keep_the_fp32_model(monkeypatch):
+    calls = []
+    quantized = []
+    monkeypatch.setitem(sys.modules, "whisper", _fake_whisper(calls))
+    monkeypatch.setattr(speech_models, "_models", {})
+    monkeypatch.setattr(speech_models, "quantize_int8",
+                        lambda model, in_place=False: quantized.append(in_place) or ("int8", model))
+
+    model = speech_models.get_whisper_model("tiny", int8=True)
+    assert model[0] == "int8" and calls == [("tiny", "cpu")]
+    assert quantized == [True]
+    assert not speech_models.is_loaded("tiny", "cpu")
+
+    # An fp32 model someone already loaded is copied, not converted under them
+    speech_models.get_whisper_model("base", "cpu")
+    speech_models.get_whisper_model("base", "cpu", int8=True)
+    assert quantized == [True, False]
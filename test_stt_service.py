@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the STT service: micro-batching, worker failures and metrics.
+"""
+
+import os
+
+import pytest
+
+from decoding_profiles import get_profile
+from stt_service import STTService
+
+
+class EchoEngine:
+    """Stands in for Whisper in the worker processes; a clip is a list whose first item is its text."""
+
+    def __init__(self, profile=None, device=None, threads=1, language="en"):
+        if device == "broken":
+            raise RuntimeError("no such device")
+        if device == "crash":
+            os._exit(4)
+        if device and device.endswith(".crash") and os.path.exists(device):
+            # Crash while loading once, the next time this marker file is there
+            os.remove(device)
+            os._exit(4)
+
+    def transcribe_batch(self, clips):
+        if any(clip[0] == "crash" for clip in clips):
+            os._exit(3)
+        if any(clip[0] == "bad" for clip in clips):
+            raise ValueError("undecodable clip")
+        return [f"{clip[0]} ({len(clips)})" for clip in clips]
+
+
+def test_pending_clips_are_batched():
+    with STTService(workers=1, profile="balanced", max_batch=4, batch_window=0.3, engine=EchoEngine) as service:
+        assert service.wait_ready(60)
+        futures = [service.submit([f"clip {n}"]) for n in range(6)]
+        texts = [future.result(30) for future in futures]
+        metrics = service.metrics()
+    assert texts == [f"clip {n} (4)" for n in range(4)] + ["clip 4 (2)", "clip 5 (2)"]
+    assert metrics["batches"] == 2 and metrics["largest_batch"] == 4 and metrics["mean_batch_size"] == 3.0
+    assert metrics["completed"] == 6 and metrics["queue_depth"] == 0 and metrics["in_flight"] == 0
+
+
+def test_failures_stay_with_their_batch():
+    with STTService(workers=2, profile="balanced", batch_window=0, engine=EchoEngine) as service:
+        assert service.wait_ready(60)
+        with pytest.raises(RuntimeError, match="undecodable"):
+            service.transcribe(["bad"], timeout=30)
+        with pytest.raises(RuntimeError, match="exited"):
+            service.transcribe(["crash"], timeout=30)
+        assert service.transcribe(["still here"], timeout=30) == "still here (1)"
+        assert service.wait_ready(60)
+        metrics = service.metrics()
+    assert metrics["failed"] == 2 and metrics["restarts"] == 1 and metrics["ready_workers"] == 2
+
+
+def test_workers_that_cannot_load_fail_requests():
+    service = STTService(workers=1, profile="balanced", device="broken", engine=EchoEngine)
+    try:
+        assert service.wait_ready(60)
+        with pytest.raises(RuntimeError, match="no such device"):
+            service.submit(["hello"])
+    finally:
+        service.close(5)
+
+
+def test_cache_keys_follow_the_decoder_a_clip_gets():
+    service = STTService(workers=1, profile="balanced", device="cpu", engine=EchoEngine)
+    try:
+        # Up to 30 s: the batched decoder, whether the clip is batched or alone
+        assert service.decode_options([0.0] * 16000) == {"decoder": "batch", "language": "en",
+                                                        "beam_size": get_profile("balanced").beam_size,
+                                                        "fp16": False}
+        assert service.decode_options([0.0] * 31 * 16000) == get_profile("balanced").transcribe_options("en", "cpu")
+    finally:
+        service.close(5)
+
+
+def test_workers_that_die_while_loading_are_restarted(tmp_path):
+    marker = tmp_path / "reload.crash"
+    with STTService(workers=1, profile="balanced", batch_window=0, device=str(marker), engine=EchoEngine) as service:
+        assert service.wait_ready(60)
+        marker.touch()
+        with pytest.raises(RuntimeError, match="exited"):
+            service.transcribe(["crash"], timeout=30)
+        # Waits for the worker that died reloading to be replaced, instead of hanging
+        assert service.transcribe(["after"], timeout=60) == "after (1)"
+        metrics = service.metrics()
+    assert metrics["restarts"] == 2 and not marker.exists()
+
+
+def test_workers_that_keep_dying_while_loading_are_given_up():
+    service = STTService(workers=1, profile="balanced", device="crash", engine=EchoEngine)
+    try:
+        assert service.wait_ready(60)
+        with pytest.raises(RuntimeError, match="no STT worker could start"):
+            service.submit(["hello"])
+    finally:
+        service.close(5)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for retrieving per-task persona facts for crew tasks.
+"""
+
+import types
+
+import prompt_assembly
+from crew_runner import CrewTask
+from knowledge_index import HashingEmbedder
+from task_context import CONTEXT_HEADER, TaskContextRetriever, context_report, persona_passages, with_context
+
+LEADERSHIP = ("Describe your leadership experience as Chair of Marketing and Communication at the "
+              "Harvard Chan Biotechnology Club and the workshops you organized.")
+
+
+def _retriever(tmp_path, **kwargs):
+    return TaskContextRetriever(directory=str(tmp_path), embedder=HashingEmbedder(), **kwargs)
+
+
+def test_passages_skip_the_stable_prefix():
+    passages = persona_passages()
+    assert passages and all(not doc.startswith("personality/") for doc in passages)
+    assert any(doc.startswith("leadership/") for doc in passages)
+
+
+def test_task_gets_relevant_facts_within_its_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(prompt_assembly, "_encoder", lambda: None)
+    retriever = _retriever(tmp_path, k=4, token_budget=60)
+    spec = CrewTask("leadership", lambda agent: types.SimpleNamespace(description=LEADERSHIP,
+                                                                      expected_output="A leadership overview"))
+    task = with_context(spec, retriever).build(agent=None)
+
+    assert task.description.startswith(LEADERSHIP)
+    assert CONTEXT_HEADER in task.description
+    report = retriever.reports["leadership"]
+    assert any(doc.startswith("leadership/") for doc in report["facts"])
+    chosen = [chunk.text for chunk in retriever.index.chunks if chunk.doc in report["facts"]]
+    assert sum(prompt_assembly.count_tokens(text) for text in chosen) <= 60
+
+
+def test_report_shows_savings_against_the_full_backstory(tmp_path, monkeypatch):
+    monkeypatch.setattr(prompt_assembly, "_encoder", lambda: None)
+    retriever = _retriever(tmp_path)
+    retriever.context_for("leadership", LEADERSHIP)
+    retriever.context_for("research", "Explain your cardiovascular risk modeling and survival analysis research.")
+    rows = context_report(retriever)
+    assert [row["task"] for row in rows] == ["leadership", "research"]
+    assert all(row["after"] < row["before"] and row["ms"] >= 0 for row in rows)
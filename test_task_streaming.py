@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming task output to the console and files.
+"""
+
+import io
+import os
+import types
+
+import task_streaming
+from task_streaming import StreamRouter, TaskStream
+
+
+def _feed(stream, text, size=5):
+    for i in range(0, len(text), size):
+        stream.feed(text[i:i + size])
+
+
+def test_only_the_final_answer_is_streamed_to_file_and_console(tmp_path):
+    path = tmp_path / "research.md"
+    out = io.StringIO()
+    stream = TaskStream("research", str(path), out=out)
+
+    stream.start_call()
+    _feed(stream, 'Thought: save first\nAction: File Writer Tool\nAction Input: {"filename": "x"}')
+    assert stream.first_chunk_at is None
+    stream.start_call()
+    _feed(stream, "Thought: I now can give a great answer\nFinal Answer: **Research Expertise**\n- survival analysis")
+    # Streamed under a temporary name until the task finishes
+    assert not path.exists()
+
+    stream.finish(types.SimpleNamespace(raw="ignored, already streamed"))
+    assert path.read_text() == "**Research Expertise**\n- survival analysis"
+    assert os.listdir(tmp_path) == ["research.md"]
+    assert "📝 research: **Research Expertise**" in out.getvalue()
+    assert "Thought" not in out.getvalue()
+
+
+def test_unstreamed_output_is_written_on_finish(tmp_path):
+    path = tmp_path / "leadership.md"
+    stream = TaskStream("leadership", str(path), out=io.StringIO())
+    stream.finish(types.SimpleNamespace(raw="Chair of Marketing and Communication"))
+    assert path.read_text() == "Chair of Marketing and Communication"
+
+
+def test_unstreamed_react_output_is_written_without_its_scaffolding(tmp_path):
+    path = tmp_path / "introduction.md"
+    out = io.StringIO()
+    stream = TaskStream("introduction", str(path), out=out)
+    stream.finish(types.SimpleNamespace(raw="Thought: I now can give a great answer\nFinal Answer: Hi everyone!"))
+    assert path.read_text() == "Hi everyone!"
+    assert out.getvalue() == "\n📝 introduction: Hi everyone!\n"
+
+
+def test_prefixed_streams_print_whole_lines():
+    out = io.StringIO()
+    stream = TaskStream("intro", prefix="[intro] ", out=out)
+    _feed(stream, "Final Answer: Hi everyone!\nI'm Caroline.", size=3)
+    assert out.getvalue() == "[intro] Hi everyone!\n"
+    stream.finish()
+    assert out.getvalue() == "[intro] Hi everyone!\n[intro] I'm Caroline.\n"
+
+
+def test_router_sends_chunks_to_the_stream_of_their_llm():
+    router = StreamRouter()
+    a, b = TaskStream("a", out=io.StringIO()), TaskStream("b", out=io.StringIO())
+    llm_a = object()
+    cached_b = types.SimpleNamespace(inner=object())
+    router.register(llm_a, a)
+    router.register(cached_b, b)
+
+    router.on_chunk(llm_a, types.SimpleNamespace(chunk="Final Answer: from a"))
+    router.on_chunk(cached_b.inner, types.SimpleNamespace(chunk="Final Answer: from b"))
+    router.on_chunk(object(), types.SimpleNamespace(chunk="Final Answer: stray"))
+
+    assert a.chars == len("from a") and b.chars == len("from b")
+
+
+class FakeBus:
+    """The handler table and ``on`` decorator of CrewAI's event bus."""
+
+    def __init__(self):
+        self._handlers = {}
+
+    def on(self, event_type):
+        def register(handler):
+            self._handlers.setdefault(event_type, []).append(handler)
+            return handler
+        return register
+
+
+def test_stopping_the_router_keeps_other_handlers(monkeypatch):
+    bus = FakeBus()
+    monkeypatch.setattr(task_streaming, "event_api", lambda: (bus, "started", "chunk"))
+    other = bus.on("chunk")(lambda source, event: None)
+
+    with StreamRouter() as router:
+        # Registered by someone else while the router runs, e.g. a tracing listener
+        late = bus.on("started")(lambda source, event: None)
+        assert router.on_chunk in bus._handlers["chunk"]
+
+    assert bus._handlers == {"chunk": [other], "started": [late]}
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the audio-fingerprint transcription cache.
+"""
+
+import os
+import time
+from array import array
+
+from transcription_cache import STALE_TEMP_SECONDS, TranscriptionCache
+
+
+def _pcm(*samples):
+    return array("f", samples)
+
+
+def test_key_covers_audio_model_and_options():
+    key = TranscriptionCache.make_key(_pcm(0.0, 0.5, -0.5), "base")
+    assert key == TranscriptionCache.make_key(_pcm(0.0, 0.5, -0.5), "base")
+    assert key != TranscriptionCache.make_key(_pcm(0.0, 0.5, -0.25), "base")
+    assert key != TranscriptionCache.make_key(_pcm(0.0, 0.5, -0.5), "small")
+    assert key != TranscriptionCache.make_key(_pcm(0.0, 0.5, -0.5), "base", language="zh")
+    assert key != TranscriptionCache.make_key(_pcm(0.0, 0.5, -0.5), "base", options={"beam_size": 5})
+
+
+def test_memory_hits_and_misses_are_counted(tmp_path):
+    cache = TranscriptionCache(str(tmp_path))
+    assert cache.get("a") is None
+    cache.put("a", "tell me about your research")
+    assert cache.get("a") == "tell me about your research"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["disk_hits"]) == (1, 1, 0)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_evicted_entries_spill_to_disk(tmp_path):
+    cache = TranscriptionCache(str(tmp_path), memory_entries=2)
+    for key in "abc":
+        cache.put(key, f"text {key}")
+
+    assert cache.stats()["memory_entries"] == 2
+    assert (tmp_path / "a.json").exists()
+    assert cache.get("a") == "text a"
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_flushed_entries_survive_a_restart_within_disk_bound(tmp_path):
+    cache = TranscriptionCache(str(tmp_path), disk_entries=2)
+    for key in "abc":
+        cache.put(key, f"text {key}")
+    cache.flush()
+
+    reopened = TranscriptionCache(str(tmp_path), disk_entries=2)
+    assert reopened.stats()["disk_entries"] == 2
+    assert reopened.get("c") == "text c"
+
+
+def test_only_stale_temp_files_are_cleaned_up(tmp_path):
+    fresh = tmp_path / "fresh.json.tmp"
+    stale = tmp_path / "stale.json.tmp"
+    fresh.write_text("another process is still writing this")
+    stale.write_text("left over from a crash")
+    os.utime(stale, (time.time() - 2 * STALE_TEMP_SECONDS,) * 2)
+    TranscriptionCache(str(tmp_path))
+    assert fresh.exists() and not stale.exists()
+
+
+def test_spilling_survives_files_removed_by_another_process(tmp_path, monkeypatch):
+    cache = TranscriptionCache(str(tmp_path), memory_entries=1)
+    cache.put("a", "text a")
+    cache.put("b", "text b")
+    assert cache.get("a") == "text a"  # back in memory, still listed on disk
+    os.remove(tmp_path / "a.json")  # evicted by the other process
+    cache.put("c", "text c")
+    assert (tmp_path / "a.json").exists()
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    cache.put("d", "text d")  # spilling "c" fails, the caller doesn't notice
+    assert cache.get("d") == "text d"
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "b.json"]
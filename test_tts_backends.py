@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the pluggable TTS backends and sentence streaming helpers.
+"""
+
+import wave
+
+import pytest
+
+from tts_backends import ToneTTSBackend, TTSBackend, get_backend, split_sentences
+
+
+def test_split_sentences_merges_short_fragments():
+    text = """Hi! I'm Caroline.   I research cardiovascular risk modeling at Harvard.
+        I also worked at Tencent Healthcare on multimodal AI. Thanks!"""
+    assert split_sentences(text) == [
+        "Hi! I'm Caroline. I research cardiovascular risk modeling at Harvard.",
+        "I also worked at Tencent Healthcare on multimodal AI. Thanks!",
+    ]
+
+
+def test_split_sentences_keeps_a_single_short_answer():
+    assert split_sentences("Hello there.") == ["Hello there."]
+
+
+def test_tone_backend_is_deterministic(tmp_path):
+    backend = ToneTTSBackend()
+    first, second = tmp_path / "a.wav", tmp_path / "b.wav"
+    backend.synthesize("Caroline studies biostatistics", str(first))
+    backend.synthesize("Caroline   studies biostatistics", str(second))
+
+    assert first.read_bytes() == second.read_bytes()
+    with wave.open(str(first)) as f:
+        assert f.getframerate() == ToneTTSBackend.SAMPLE_RATE
+        assert f.getnframes() == 3 * int(ToneTTSBackend.SAMPLE_RATE * ToneTTSBackend.WORD_SECONDS)
+
+
+def test_voice_id_separates_engines():
+    assert get_backend("tone").voice_id != get_backend("gtts").voice_id
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        get_backend("kokoro")
+
+
+def test_backends_must_implement_synthesize():
+    with pytest.raises(TypeError):
+        TTSBackend()
+
+    class Silent(TTSBackend):
+        name = "silent"
+
+    with pytest.raises(TypeError):
+        Silent()
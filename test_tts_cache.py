@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed TTS response cache.
+"""
+
+import os
+
+from tts_cache import TTSCache
+
+
+def _writer(payload):
+    def write(path):
+        with open(path, "wb") as f:
+            f.write(payload)
+    return write
+
+
+def test_key_ignores_whitespace_but_not_voice_settings():
+    key = TTSCache.make_key("Hello   there,\n    world")
+    assert key == TTSCache.make_key("Hello there, world")
+    assert key != TTSCache.make_key("Hello there, world", lang="zh-CN")
+    assert key != TTSCache.make_key("Hello there, world", voice="co.uk")
+    assert key != TTSCache.make_key("Hello there, world", speed="slow")
+
+
+def test_hit_skips_the_writer(tmp_path):
+    cache = TTSCache(str(tmp_path))
+    calls = []
+
+    def write(path):
+        calls.append(path)
+        _writer(b"audio")(path)
+
+    key = TTSCache.make_key("research answer")
+    first = cache.get_or_create(key, write)
+    second = cache.get_or_create(key, write)
+
+    assert first == second
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=10)
+    cache.put("a", _writer(b"1234"))
+    cache.put("b", _writer(b"1234"))
+    cache.get("a")
+    cache.put("c", _writer(b"1234"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["bytes"] == 8
+
+
+def test_failed_write_leaves_no_entry(tmp_path):
+    cache = TTSCache(str(tmp_path))
+
+    def broken(path):
+        raise RuntimeError("network down")
+
+    try:
+        cache.put("k", broken)
+    except RuntimeError:
+        pass
+    assert cache.get("k") is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_index_survives_restart(tmp_path):
+    TTSCache(str(tmp_path)).put("k", _writer(b"abc"))
+    reopened = TTSCache(str(tmp_path))
+    assert reopened.get("k").endswith("k.mp3")
+
+
+def test_only_stale_temp_files_are_cleaned_up(tmp_path):
+    stale = tmp_path / "abandoned.mp3.tmp"
+    in_flight = tmp_path / "writing.mp3.tmp"
+    stale.write_bytes(b"x")
+    in_flight.write_bytes(b"x")
+    os.utime(stale, (0, 0))
+
+    TTSCache(str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == ["writing.mp3.tmp"]
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the pre-rendered voice bank.
+"""
+
+import os
+
+from tts_cache import TTSCache
+from voice_bank import VoiceBank
+
+
+def _recording_synth(calls):
+    def synthesize(text, path):
+        calls.append(text)
+        with open(path, "w") as f:
+            f.write(text)
+    return synthesize
+
+
+def test_only_changed_entries_are_rebuilt(tmp_path):
+    calls = []
+    synthesize = _recording_synth(calls)
+    VoiceBank(str(tmp_path)).build({"research": "cardio", "greeting": "hi"}, TTSCache.make_key, synthesize)
+
+    bank = VoiceBank(str(tmp_path))
+    summary = bank.build({"research": "cardio v2", "greeting": "hi"}, TTSCache.make_key, synthesize)
+
+    assert sorted(calls) == ["cardio", "cardio v2", "hi"]
+    assert summary["built"] == 1 and summary["unchanged"] == 1
+    assert bank.lookup(TTSCache.make_key("cardio v2")).endswith("research.mp3")
+    assert bank.lookup(TTSCache.make_key("cardio")) is None
+
+
+def test_removed_entries_are_deleted(tmp_path):
+    bank = VoiceBank(str(tmp_path))
+    bank.build({"a": "one", "b": "two"}, TTSCache.make_key, _recording_synth([]))
+    summary = bank.build({"a": "one"}, TTSCache.make_key, _recording_synth([]))
+
+    assert summary["removed"] == 1
+    assert sorted(os.listdir(tmp_path)) == ["a.mp3", "manifest.json"]
+
+
+def test_failures_are_reported_not_recorded(tmp_path):
+    def flaky(text, path):
+        if text == "bad":
+            raise RuntimeError("tts offline")
+        _recording_synth([])(text, path)
+
+    bank = VoiceBank(str(tmp_path))
+    summary = bank.build({"ok": "good", "broken": "bad"}, TTSCache.make_key, flaky)
+
+    assert summary["failed"] == {"broken": "tts offline"}
+    assert "broken" not in bank.entries
+    assert bank.stale({"ok": "good", "broken": "bad"}, TTSCache.make_key) == {"broken": TTSCache.make_key("bad")}
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for in-memory transcription and recording archives in the voice demo.
+"""
+
+import numpy as np
+import pytest
+
+import caroline_interactive_with_speech as speech
+from caroline_interactive_with_speech import CarolineVoiceDemo
+
+
+class FakeWhisper:
+    """Records what it was asked to transcribe."""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **options):
+        self.calls.append(audio)
+        return {"text": " Tell me about your research "}
+
+
+def make_demo(tmp_path, monkeypatch, **options):
+    model = FakeWhisper()
+    monkeypatch.setattr(CarolineVoiceDemo, "whisper_model", property(lambda self: model))
+    # An explicit device, so the decoding options don't have to ask torch
+    demo = CarolineVoiceDemo(device="cpu", tts_backend="tone", tts_cache_dir=str(tmp_path / "tts"),
+                             voice_bank_dir=str(tmp_path / "bank"), stt_cache_dir=str(tmp_path / "stt"),
+                             conversation_log=str(tmp_path / "log.jsonl"), **options)
+    return demo, model
+
+
+def test_recordings_are_transcribed_from_memory(tmp_path, monkeypatch):
+    demo, model = make_demo(tmp_path, monkeypatch)
+    monkeypatch.setattr(speech.sf, "write", lambda *args, **kwargs: pytest.fail("wrote a WAV file"))
+    audio = (0.3 * np.sin(np.arange(16000) / 10)).astype(np.float32)
+
+    assert demo.speech_to_text(audio, verbose=False) == "Tell me about your research"
+    # The array goes to Whisper as is, without a file round-trip
+    assert len(model.calls) == 1 and model.calls[0] is audio
+    # The same samples again are answered from the transcription cache
+    assert demo.speech_to_text(audio.copy(), verbose=False) == "Tell me about your research"
+    assert len(model.calls) == 1
+
+
+def test_archive_dir_keeps_a_copy_of_recordings(tmp_path, monkeypatch):
+    demo, _ = make_demo(tmp_path, monkeypatch, archive_dir=str(tmp_path / "archive"))
+    recording = np.full((1600, 1), 0.25, dtype=np.float32)
+    monkeypatch.setattr(speech.sd, "rec", lambda frames, **kwargs: recording[:frames])
+    monkeypatch.setattr(speech.sd, "wait", lambda: None)
+    written = []
+    monkeypatch.setattr(speech.sf, "write", lambda path, audio, rate: written.append((path, audio, rate)))
+
+    audio = demo.record_audio(duration=0.1, archive_path=str(tmp_path / "archive" / "q.wav"))
+    demo.wait_for_archives()
+    assert audio.shape == (1600,)
+    assert [(path, rate) for path, _, rate in written] == [(str(tmp_path / "archive" / "q.wav"), 16000)]
+    assert written[0][1] is audio
+
+
+def test_spoken_turns_log_their_audio_files(tmp_path, monkeypatch):
+    demo, _ = make_demo(tmp_path, monkeypatch)
+    monkeypatch.setattr(demo, "speak", lambda text, wait=True: None)
+    answer = ("I build cardiovascular risk models at Harvard. "
+              "At Tencent Healthcare I designed multimodal medical AI solutions.")
+    files = demo.speech_files(answer)
+    assert len(files) == 2 and all(path.startswith(str(tmp_path / "tts")) for path in files)
+
+    # What speak() streams ends up exactly where speech_files said it would
+    assert [demo._audio_for(segment, announce=False) for segment in demo.speech_segments(answer)] == files
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for the pipelined voice conversation, driven by a scripted demo.
+"""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+
+from voice_pipeline import VoicePipeline
+
+BLOCK = 1600
+TEXTS = {1: "Tell me about your cardiovascular research", 2: "Goodbye Caroline"}
+
+
+class ScriptedRecorder:
+    """Hands out one scripted utterance per chunks() call, then silence until stopped."""
+
+    def __init__(self, utterances, blocks_per_utterance=20):
+        self.utterances = list(utterances)
+        self.blocks_per_utterance = blocks_per_utterance
+        self.stopped = threading.Event()
+
+    def chunks(self, on_speech_start=None, stop=None):
+        if not self.utterances:
+            while not stop.is_set():
+                time.sleep(0.01)
+            self.stopped.set()
+            return
+        number = self.utterances.pop(0)
+        on_speech_start()
+        for _ in range(self.blocks_per_utterance):
+            yield np.full(BLOCK, number, dtype=np.float32)
+
+
+class FakeHandle:
+    def wait(self, timeout=None):
+        return True
+
+
+class FakePlayer:
+    def __init__(self):
+        self.played = []
+
+    def play(self, path):
+        self.played.append(path)
+        return FakeHandle()
+
+    def stop(self):
+        pass
+
+
+class ScriptedDemo:
+    """The parts of CarolineVoiceDemo the pipeline uses."""
+
+    SAMPLE_RATE = 16000
+    barge_in = False
+
+    def __init__(self, utterances):
+        self.recorder = ScriptedRecorder(utterances)
+        self.player = FakePlayer()
+        self.logged = []
+        self.rendered = []
+
+    def speech_to_text(self, audio, verbose=True, cache=True):
+        return TEXTS[int(audio[0])]
+
+    def get_response(self, text):
+        return self.response_for_intent("research" if "research" in text.lower() else None)
+
+    def response_for_intent(self, intent):
+        return "I model cardiovascular risk. It uses survival analysis." if intent else "Goodbye!"
+
+    def speech_segments(self, text):
+        return [sentence.strip() for sentence in text.split(".") if sentence.strip()]
+
+    def _audio_for(self, text, announce=True):
+        self.rendered.append(text)
+        return f"{text}.wav"
+
+    def log_turn(self, entry):
+        self.logged.append(entry)
+        return entry
+
+
+def test_turns_flow_through_every_stage():
+    demo = ScriptedDemo([1, 2])
+    pipeline = VoicePipeline(demo, partial_interval=0)
+    turns = asyncio.run(asyncio.wait_for(pipeline.run(), 10))
+
+    assert [turn.transcript for turn in turns] == [TEXTS[1], TEXTS[2]]
+    assert demo.player.played == ["I model cardiovascular risk.wav", "It uses survival analysis.wav",
+                                  "Goodbye!.wav"]
+    assert [entry["user"] for entry in demo.logged] == [TEXTS[1], TEXTS[2]]
+    assert demo.logged[0]["response_audio"] == demo.player.played[:2]
+    assert {"stt", "route", "turn_latency"} <= set(demo.logged[0]["timings"])
+
+
+def test_capture_thread_stops_with_the_pipeline():
+    demo = ScriptedDemo([2])
+    before = {thread for thread in threading.enumerate() if thread.name == "pipeline-capture"}
+    asyncio.run(asyncio.wait_for(VoicePipeline(demo, partial_interval=0).run(), 10))
+
+    # run() returned only after the capture thread saw the stop flag and exited
+    assert demo.recorder.stopped.is_set()
+    assert {thread for thread in threading.enumerate() if thread.name == "pipeline-capture"} <= before
+
+
+def test_stable_partials_prefetch_the_answer():
+    demo = ScriptedDemo([1, 2])
+    demo.recorder.blocks_per_utterance = 40
+    pipeline = VoicePipeline(demo, partial_interval=0.1)
+    turns = asyncio.run(asyncio.wait_for(pipeline.run(), 10))
+
+    first = turns[0]
+    assert first.early_intent == "research"
+    assert first.prefetch is not None and first.prefetch.done()
+    assert "I model cardiovascular risk" in demo.rendered
@@ -0,0 +1,179 @@
+"""
+Transcription Cache for Caroline's Voice Agent
+Skips Whisper inference for audio that has been transcribed before.
+
+Entries are keyed by a hash of the decoded 16 kHz PCM together with the
+model name, language and decoding options, so the same recording played
+twice (the fixed demo questions, repeated test clips) is transcribed once
+per configuration. Recent entries live in an in-memory LRU; entries pushed
+out of it spill to one small JSON file each on disk, which is bounded too
+and evicts least recently used files first (recency is kept in file
+modification times, as in the TTS cache).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+TEMP_SUFFIX = ".tmp"
+# Temporary files older than this are leftovers of an interrupted write
+STALE_TEMP_SECONDS = 3600
+
+
+class TranscriptionCache:
+    """Two-level (memory, then disk) LRU cache of transcripts."""
+
+    def __init__(self, directory: str = "stt_cache", memory_entries: int = 256,
+                 disk_entries: int = 10000):
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self._lock = threading.Lock()
+        # key -> transcript, least recently used first
+        self._memory = OrderedDict()
+        # key -> None, least recently used first
+        self._disk = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(pcm, model: str, language: str = "en", options: dict = None) -> str:
+        """
+        Hash decoded audio plus everything that changes the transcript.
+
+        ``pcm`` is any buffer (normally a float32 numpy array); its raw
+        bytes are hashed without copying when it is contiguous.
+        """
+        data = memoryview(pcm)
+        if not data.c_contiguous:
+            data = memoryview(bytes(data))
+        digest = hashlib.sha256()
+        digest.update(json.dumps([model, language, data.format, options or {}], sort_keys=True).encode("utf-8"))
+        digest.update(data.cast("B"))
+        return digest.hexdigest()
+
+    def _load_index(self):
+        found = []
+        now = time.time()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                mtime = os.stat(path).st_mtime
+            except FileNotFoundError:
+                continue
+            if name.endswith(TEMP_SUFFIX):
+                # Unless it's recent enough to be another process (the voice demo
+                # and the server share the cache) still writing
+                if now - mtime > STALE_TEMP_SECONDS:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+            elif name.endswith(".json"):
+                found.append((mtime, name[:-len(".json")]))
+        for _, key in sorted(found):
+            self._disk[key] = None
+        self._evict_disk()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key: str):
+        """Return the cached transcript for ``key``, or None on a miss."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+            on_disk = key in self._disk
+
+        if on_disk:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    text = json.load(f)["text"]
+            except (OSError, ValueError, KeyError):
+                text = None
+            with self._lock:
+                if text is None:
+                    self._disk.pop(key, None)
+                else:
+                    self._disk.move_to_end(key)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self._remember(key, text)
+                    return text
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, text: str):
+        """Store a transcript in memory; it reaches disk when evicted or flushed."""
+        with self._lock:
+            self._remember(key, text)
+
+    def _remember(self, key: str, text: str):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            old_key, old_text = self._memory.popitem(last=False)
+            self._spill(old_key, old_text)
+
+    def _spill(self, key: str, text: str):
+        """Write an entry leaving memory to disk; a failed write only loses the cache entry."""
+        if key in self._disk:
+            try:
+                os.utime(self._path(key))
+                self._disk.move_to_end(key)
+                return
+            except FileNotFoundError:
+                # Evicted by another process sharing the directory: write it again
+                del self._disk[key]
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".json" + TEMP_SUFFIX)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"text": text}, f, ensure_ascii=False)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+            print(f"⚠️ Could not cache a transcript on disk: {e}")
+            return
+        self._disk[key] = None
+        self._evict_disk()
+
+    def _evict_disk(self):
+        while len(self._disk) > self.disk_entries:
+            key, _ = self._disk.popitem(last=False)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def flush(self):
+        """Write every in-memory entry to disk so the next session can use it."""
+        with self._lock:
+            for key, text in self._memory.items():
+                self._spill(key, text)
+
+    def stats(self) -> dict:
+        """Entry counts and hit/miss counters (disk_hits are included in hits)."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
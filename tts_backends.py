@@ -0,0 +1,169 @@
+"""
+Text-to-Speech Backends for Caroline's Voice Agent
+Interchangeable engines behind one small interface.
+
+- ``gtts``: Google TTS, natural voice, needs the network, writes MP3
+- ``pyttsx3``: the operating system's offline speech engine, writes WAV
+- ``tone``: deterministic offline stand-in that renders each word as a short
+  tone; useful for tests and latency benchmarks on air-gapped machines
+
+Every backend renders one piece of text to one file. ``split_sentences`` is
+what lets callers stream a long answer sentence by sentence and start
+playback as soon as the first sentence is ready.
+"""
+
+import abc
+import math
+import re
+import struct
+import threading
+import time
+import wave
+import zlib
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text: str, min_chars: int = 40) -> list:
+    """
+    Split text into sentences for streaming synthesis.
+
+    Fragments shorter than ``min_chars`` are merged into the next sentence
+    so playback doesn't stutter on things like "Hi!".
+    """
+    sentences = []
+    pending = ""
+    for sentence in _SENTENCE_END.split(" ".join(text.split())):
+        pending = f"{pending} {sentence}".strip()
+        if len(pending) >= min_chars:
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        if sentences and len(pending) < min_chars:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    return sentences
+
+
+class TTSBackend(abc.ABC):
+    """Interface every TTS engine implements."""
+
+    name = "base"
+    extension = ".wav"
+
+    def __init__(self, lang: str = "en", voice: str = "default", speed: str = "normal"):
+        self.lang = lang
+        self.voice = voice
+        self.speed = speed
+
+    @property
+    def voice_id(self) -> str:
+        """Voice identity for cache keys; includes the engine so engines never collide."""
+        return f"{self.name}:{self.voice}"
+
+    @abc.abstractmethod
+    def synthesize(self, text: str, output_path: str):
+        """Render text to an audio file at output_path."""
+
+
+class GTTSBackend(TTSBackend):
+    """Google Text-to-Speech (requires network access)."""
+
+    name = "gtts"
+    extension = ".mp3"
+
+    def __init__(self, lang: str = "en", voice: str = "com", speed: str = "normal"):
+        # For gTTS the "voice" is the Google domain (tld) that picks the accent
+        super().__init__(lang, voice, speed)
+
+    def synthesize(self, text: str, output_path: str):
+        from gtts import gTTS
+
+        tts = gTTS(text=" ".join(text.split()), lang=self.lang, tld=self.voice,
+                   slow=self.speed == "slow")
+        tts.save(output_path)
+
+
+class Pyttsx3Backend(TTSBackend):
+    """Offline synthesis through the platform speech engine (eSpeak, SAPI5, NSSpeech)."""
+
+    name = "pyttsx3"
+    extension = ".wav"
+
+    def __init__(self, lang: str = "en", voice: str = "default", speed: str = "normal"):
+        super().__init__(lang, voice, speed)
+        import pyttsx3
+
+        self._engine = pyttsx3.init()
+        if voice != "default":
+            self._engine.setProperty("voice", voice)
+        if speed == "slow":
+            self._engine.setProperty("rate", int(self._engine.getProperty("rate") * 0.75))
+        # pyttsx3 engines are not safe to drive from several threads at once
+        self._lock = threading.Lock()
+
+    def synthesize(self, text: str, output_path: str):
+        with self._lock:
+            self._engine.save_to_file(" ".join(text.split()), output_path)
+            self._engine.runAndWait()
+
+
+class ToneTTSBackend(TTSBackend):
+    """
+    Deterministic offline stand-in.
+
+    Each word becomes a short sine tone whose pitch is derived from the word,
+    so the same text always produces byte-identical audio. ``latency`` adds a
+    fixed delay per call and ``seconds_per_char`` one proportional to the text,
+    to mimic a real engine in benchmarks.
+    """
+
+    name = "tone"
+    extension = ".wav"
+    SAMPLE_RATE = 16000
+    WORD_SECONDS = 0.18
+
+    def __init__(self, lang: str = "en", voice: str = "default", speed: str = "normal",
+                 latency: float = 0.0, seconds_per_char: float = 0.0):
+        super().__init__(lang, voice, speed)
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+
+    def synthesize(self, text: str, output_path: str):
+        delay = self.latency + self.seconds_per_char * len(text)
+        if delay:
+            time.sleep(delay)
+
+        word_seconds = self.WORD_SECONDS * (1.5 if self.speed == "slow" else 1.0)
+        frames_per_word = int(self.SAMPLE_RATE * word_seconds)
+        samples = bytearray()
+        for word in text.split():
+            frequency = 180 + zlib.crc32(word.lower().encode("utf-8")) % 420
+            step = 2 * math.pi * frequency / self.SAMPLE_RATE
+            for i in range(frames_per_word):
+                # Short fade in/out so words don't click
+                envelope = min(1.0, i / 200, (frames_per_word - i) / 200)
+                samples += struct.pack("<h", int(8000 * envelope * math.sin(step * i)))
+
+        with wave.open(output_path, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(self.SAMPLE_RATE)
+            f.writeframes(bytes(samples))
+
+
+BACKENDS = {
+    GTTSBackend.name: GTTSBackend,
+    Pyttsx3Backend.name: Pyttsx3Backend,
+    ToneTTSBackend.name: ToneTTSBackend,
+}
+
+
+def get_backend(name: str = "gtts", **options) -> TTSBackend:
+    """Create a backend by name ("gtts", "pyttsx3" or "tone")."""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown TTS backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    return backend_class(**options)
@@ -0,0 +1,164 @@
+"""
+Text-to-Speech Response Cache for Caroline's Voice Agent
+Content-addressed on-disk cache so repeated answers skip synthesis.
+
+Entries are keyed by a hash of (text, language, voice, speed) and stored as
+``<key><extension>`` in one directory. Files are written to a temporary name
+and renamed into place, so a crash never leaves a half-written entry behind.
+The cache is bounded by total size and evicts the least recently used files
+first; recency is kept in file modification times so it survives restarts.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+TEMP_SUFFIX = ".tmp"
+# Temp files younger than this may be another process's write in progress
+STALE_TEMP_SECONDS = 3600
+
+
+class TTSCache:
+    """Size-bounded LRU cache of synthesized audio files."""
+
+    def __init__(self, directory: str = "tts_cache", max_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (filename, size), least recently used first
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(text: str, lang: str = "en", voice: str = "com", speed: str = "normal") -> str:
+        """Hash the inputs that change the audio; whitespace differences don't."""
+        normalized = " ".join(text.split())
+        payload = json.dumps([normalized, lang, voice, speed], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load_index(self):
+        """Rebuild the in-memory index from the files already on disk."""
+        found = []
+        now = time.time()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if name.endswith(TEMP_SUFFIX):
+                # Left over from an interrupted write, unless it's recent enough to be
+                # another process (the voice demo and the server share the cache) still writing
+                if now - stat.st_mtime > STALE_TEMP_SECONDS:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                continue
+            if not os.path.isfile(path):
+                continue
+            found.append((stat.st_mtime, os.path.splitext(name)[0], name, stat.st_size))
+
+        for _, key, name, size in sorted(found):
+            self._entries[key] = (name, size)
+            self._total_bytes += size
+        self._evict()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def path_for(self, key: str, extension: str = ".mp3") -> str:
+        """Where ``put`` stores (or stored) the entry for ``key``."""
+        return self._path(key + extension)
+
+    def get(self, key: str):
+        """Return the cached file path for ``key``, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            path = self._path(entry[0])
+            if not os.path.exists(path):
+                # Deleted behind our back
+                del self._entries[key]
+                self._total_bytes -= entry[1]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        os.utime(path)
+        return path
+
+    def put(self, key: str, write, extension: str = ".mp3") -> str:
+        """
+        Store a new entry and return its path.
+
+        ``write`` is called with a temporary path and must write the audio
+        there; the file is then renamed into place atomically.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=extension + TEMP_SUFFIX)
+        os.close(fd)
+        try:
+            write(temp_path)
+            name = key + extension
+            final_path = self._path(name)
+            os.replace(temp_path, final_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        size = os.path.getsize(final_path)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+            self._entries[key] = (name, size)
+            self._total_bytes += size
+            self._evict(keep=key)
+        return final_path
+
+    def get_or_create(self, key: str, write, extension: str = ".mp3") -> str:
+        """Return the cached path for ``key``, synthesizing it with ``write`` on a miss."""
+        path = self.get(key)
+        if path is None:
+            path = self.put(key, write, extension)
+        return path
+
+    def _evict(self, keep: str = None):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            if key == keep:
+                # A single entry larger than the whole budget still gets served
+                if len(self._entries) == 1:
+                    break
+                self._entries.move_to_end(key)
+                continue
+            name, size = self._entries.pop(key)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        """Entry count, bytes used and hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Precomputed Voice Bank for Caroline's Voice Agent
+Pre-renders every canned answer so playback never waits on synthesis.
+
+Each entry is synthesized once into ``<directory>/<name><extension>`` and
+recorded in ``manifest.json`` together with the TTS cache key of its text.
+Rebuilding only re-synthesizes entries whose key changed, so editing one
+answer costs one synthesis call. Unlike the TTS cache, bank entries are
+never evicted.
+
+Usage: python voice_bank.py [--workers 4] [--force] [--backend gtts]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+class VoiceBank:
+    """Named, pre-rendered audio files indexed by the TTS cache key of their text."""
+
+    def __init__(self, directory: str = "voice_bank"):
+        self.directory = directory
+        self._lock = threading.Lock()
+        # name -> {"key": ..., "file": ..., "chars": ...}
+        self.entries = {}
+        self._by_key = {}
+        self._load_manifest()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_NAME)
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable voice bank manifest: {e}")
+            return
+        if manifest.get("version") != MANIFEST_VERSION:
+            return
+        self.entries = manifest.get("entries", {})
+        self._by_key = {entry["key"]: os.path.join(self.directory, entry["file"])
+                        for entry in self.entries.values()}
+
+    def _save_manifest(self):
+        """Write the manifest atomically so readers never see half of it."""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".json.tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+
+    def lookup(self, key: str):
+        """Return the pre-rendered file for a TTS cache key, or None."""
+        path = self._by_key.get(key)
+        if path and os.path.exists(path):
+            return path
+        return None
+
+    def stale(self, texts: dict, make_key) -> dict:
+        """Return ``{name: key}`` for entries that are missing or whose text changed."""
+        stale = {}
+        for name, text in texts.items():
+            key = make_key(text)
+            entry = self.entries.get(name)
+            if entry is None or entry["key"] != key or self.lookup(key) is None:
+                stale[name] = key
+        return stale
+
+    def build(self, texts: dict, make_key, synthesize, extension: str = ".mp3",
+              workers: int = 4, force: bool = False) -> dict:
+        """
+        Bring the bank in line with ``texts`` (``{name: text}``).
+
+        ``make_key(text)`` must return the same key the caller uses for TTS
+        cache lookups, and ``synthesize(text, path)`` must write audio to
+        ``path``. Stale entries are rendered in parallel on ``workers``
+        threads; entries no longer in ``texts`` are removed.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        todo = {name: make_key(text) for name, text in texts.items()} if force else self.stale(texts, make_key)
+        removed = [name for name in self.entries if name not in texts]
+        start = time.perf_counter()
+
+        def render(name, key):
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=extension + ".tmp")
+            os.close(fd)
+            try:
+                synthesize(texts[name], temp_path)
+                filename = name + extension
+                os.replace(temp_path, os.path.join(self.directory, filename))
+            except BaseException:
+                os.remove(temp_path)
+                raise
+            return {"key": key, "file": filename, "chars": len(texts[name])}
+
+        failed = {}
+        if todo:
+            print(f"🔊 Rendering {len(todo)} voice bank entries on {workers} threads...")
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(render, name, key): name for name, key in todo.items()}
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        entry = future.result()
+                    except Exception as e:
+                        failed[name] = str(e)
+                        print(f"⚠️ Could not render '{name}': {e}")
+                        continue
+                    with self._lock:
+                        old = self.entries.get(name)
+                        if old is not None:
+                            self._by_key.pop(old["key"], None)
+                            if old["file"] != entry["file"]:
+                                # e.g. the backend changed from .mp3 to .wav
+                                stale_path = os.path.join(self.directory, old["file"])
+                                if os.path.exists(stale_path):
+                                    os.remove(stale_path)
+                        self.entries[name] = entry
+                        self._by_key[entry["key"]] = os.path.join(self.directory, entry["file"])
+
+        with self._lock:
+            for name in removed:
+                entry = self.entries.pop(name)
+                self._by_key.pop(entry["key"], None)
+                path = os.path.join(self.directory, entry["file"])
+                if os.path.exists(path):
+                    os.remove(path)
+            if todo or removed:
+                self._save_manifest()
+
+        summary = {
+            "built": len(todo) - len(failed),
+            "unchanged": len(texts) - len(todo),
+            "removed": len(removed),
+            "failed": failed,
+            "seconds": time.perf_counter() - start,
+        }
+        print(f"✓ Voice bank ready: {summary['built']} built, {summary['unchanged']} unchanged, "
+              f"{summary['removed']} removed in {summary['seconds']:.1f}s")
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render Caroline's canned answers")
+    parser.add_argument("--workers", type=int, default=4, help="parallel synthesis threads")
+    parser.add_argument("--force", action="store_true", help="re-render every entry")
+    parser.add_argument("--backend", default="gtts", help="TTS backend: gtts, pyttsx3 or tone")
+    args = parser.parse_args()
+
+    from caroline_interactive_with_speech import CarolineVoiceDemo
+
+    demo = CarolineVoiceDemo(tts_backend=args.backend)
+    demo.build_voice_bank(workers=args.workers, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Pipelined Voice Conversation for Caroline's Voice Agent
+Hands-free turns where capture, STT, routing, TTS and playback overlap.
+
+Each stage is an asyncio task, and bounded queues connect the stages:
+
+    capture -> stt -> route -> tts -> playback
+
+- capture streams microphone blocks on a background thread while the
+  speaker is still talking
+- stt transcribes the growing utterance every ``partial_interval`` seconds
+  (partial transcripts) and once more when the utterance ends
+- route routes every partial; once two partials agree on an intent,
+  that answer's first sentence is synthesized speculatively
+- tts renders the answer sentence by sentence and hands each file on
+- playback starts on the first sentence while later ones render
+
+Blocking work (Whisper, TTS, waiting on audio) runs in worker threads so the
+event loop stays responsive. Every turn records a timestamp per stage
+boundary, and a latency breakdown is printed after each turn and for the
+whole session.
+"""
+
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+
+import numpy as np
+
+from intent_router import TOKEN_PATTERN, route
+
+EXIT_WORDS = {"goodbye", "bye", "quit", "exit", "stop"}
+
+# (label, start mark, end mark) for the per-turn latency breakdown
+STAGE_SPANS = [
+    ("speech", "speech_start", "speech_end"),
+    ("stt", "speech_end", "stt_done"),
+    ("route", "stt_done", "routed"),
+    ("tts_first", "routed", "first_audio"),
+    ("to_playback", "first_audio", "playback_start"),
+    ("turn_latency", "speech_end", "playback_start"),
+    ("playback", "playback_start", "playback_end"),
+]
+
+
+class Turn:
+    """One user utterance and Caroline's answer, with per-stage timestamps."""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.marks = {}
+        self.partials = []
+        self.early_intent = None
+        self.prefetch = None
+        self.transcript = ""
+        self.response = None
+        self.final = False
+        self.interrupted = False
+        self.audio = []
+
+    def mark(self, event: str):
+        self.marks.setdefault(event, time.perf_counter())
+
+    def timings(self) -> dict:
+        """Seconds spent in each stage span that completed."""
+        return {label: self.marks[end] - self.marks[start]
+                for label, start, end in STAGE_SPANS
+                if start in self.marks and end in self.marks}
+
+
+class VoicePipeline:
+    """Continuous, pipelined voice conversation around a CarolineVoiceDemo."""
+
+    def __init__(self, demo, queue_size: int = 8, block_queue_size: int = 256,
+                 partial_interval: float = 1.0, max_turns: int = None):
+        self.demo = demo
+        self.queue_size = queue_size
+        self.block_queue_size = block_queue_size
+        self.partial_interval = partial_interval
+        self.max_turns = max_turns
+        self.turns = []
+        self._stop_requested = threading.Event()
+        # Whisper calls run one at a time, so a partial never races the final
+        self._stt_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-stt")
+
+    async def run(self) -> list:
+        """Converse until the user says goodbye (or max_turns); returns the turns."""
+        self.loop = asyncio.get_running_loop()
+        self._done = asyncio.Event()
+        blocks = asyncio.Queue(self.block_queue_size)
+        transcripts = asyncio.Queue(self.queue_size)
+        responses = asyncio.Queue(self.queue_size)
+        audio = asyncio.Queue(self.queue_size)
+
+        print("\n🎙️ Hands-free mode: just talk. Say 'goodbye' to finish.")
+        self._stop_requested.clear()
+        capture = threading.Thread(target=self._capture, args=(blocks,), name="pipeline-capture", daemon=True)
+        capture.start()
+        tasks = [
+            asyncio.create_task(self._stt(blocks, transcripts)),
+            asyncio.create_task(self._route(transcripts, responses)),
+            asyncio.create_task(self._tts(responses, audio)),
+            asyncio.create_task(self._playback(audio)),
+        ]
+        try:
+            await self._done.wait()
+        finally:
+            self._stop_requested.set()
+            tasks += [turn.prefetch for turn in self.turns if turn.prefetch is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # The capture thread sees the stop flag at its next block or queue wait;
+            # it must be gone before this loop is, since it schedules work on it
+            await asyncio.to_thread(capture.join)
+            self.demo.player.stop()
+            self._stt_executor.shutdown(wait=False)
+        self.print_summary()
+        return self.turns
+
+    def stop(self):
+        """Ask the pipeline to finish; safe to call from any thread."""
+        self._stop_requested.set()
+        self.loop.call_soon_threadsafe(self._done.set)
+
+    # -- capture (background thread) ---------------------------------------
+
+    def _capture(self, out: asyncio.Queue):
+        """Record utterance after utterance, pushing blocks into the event loop."""
+        def put(item):
+            # Blocks this thread while the queue is full: backpressure on capture
+            future = asyncio.run_coroutine_threadsafe(out.put(item), self.loop)
+            while not self._stop_requested.is_set():
+                try:
+                    future.result(timeout=0.1)
+                    return
+                except FutureTimeout:
+                    continue
+            future.cancel()
+
+        number = 0
+        while not self._stop_requested.is_set():
+            number += 1
+            turn = Turn(number)
+
+            def speech_started():
+                turn.mark("speech_start")
+                self.loop.call_soon_threadsafe(self._barge_in, turn)
+
+            heard = False
+            for block in self.demo.recorder.chunks(on_speech_start=speech_started, stop=self._stop_requested):
+                if self._stop_requested.is_set():
+                    return
+                heard = True
+                put((turn, block))
+            if self._stop_requested.is_set():
+                return
+            if heard:
+                turn.mark("speech_end")
+                put((turn, None))
+            else:
+                number -= 1
+
+    def _barge_in(self, new_turn: Turn):
+        """The user started talking: cut off the answer that is still playing."""
+        if not self.demo.barge_in:
+            return
+        for turn in self.turns:
+            if turn.number < new_turn.number and "playback_end" not in turn.marks:
+                turn.interrupted = True
+        self.demo.player.stop()
+
+    # -- stt ----------------------------------------------------------------
+
+    async def _transcribe(self, audio: np.ndarray, cache: bool = True) -> str:
+        return await self.loop.run_in_executor(
+            self._stt_executor, lambda: self.demo.speech_to_text(audio, verbose=False, cache=cache))
+
+    async def _partial(self, turn: Turn, audio: np.ndarray, out: asyncio.Queue):
+        # Partials are never heard twice, so they would only churn the cache
+        text = await self._transcribe(audio, cache=False)
+        if text and not turn.final:
+            await out.put((turn, "partial", text))
+
+    async def _stt(self, inp: asyncio.Queue, out: asyncio.Queue):
+        partial_samples = int(self.partial_interval * self.demo.SAMPLE_RATE)
+        turn, blocks, samples, next_partial, partial = None, [], 0, partial_samples, None
+        while True:
+            block_turn, block = await inp.get()
+            if block_turn is not turn:
+                turn, blocks, samples, next_partial = block_turn, [], 0, partial_samples
+                self.turns.append(turn)
+
+            if block is not None:
+                blocks.append(block)
+                samples += len(block)
+                if self.partial_interval and samples >= next_partial and (partial is None or partial.done()):
+                    next_partial = samples + partial_samples
+                    partial = asyncio.create_task(self._partial(turn, np.concatenate(blocks), out))
+                continue
+
+            # End of utterance: late partials for this turn are dropped
+            turn.final = True
+            text = await self._transcribe(np.concatenate(blocks))
+            turn.mark("stt_done")
+            await out.put((turn, "final", text))
+
+    # -- route --------------------------------------------------------------
+
+    async def _prefetch(self, text: str):
+        """Render an answer's first piece ahead of the final transcript."""
+        first = self.demo.speech_segments(text)[0]
+        await asyncio.to_thread(self.demo._audio_for, first, False)
+
+    async def _route(self, inp: asyncio.Queue, out: asyncio.Queue):
+        while True:
+            turn, kind, text = await inp.get()
+            if kind == "partial":
+                intent = route(text)
+                turn.partials.append((text, intent))
+                print(f"   … {text}")
+                stable = len(turn.partials) >= 2 and turn.partials[-2][1] == intent
+                if intent and stable and turn.early_intent is None:
+                    turn.early_intent = intent
+                    # Keep a reference: the loop only holds tasks weakly
+                    turn.prefetch = asyncio.create_task(self._prefetch(self.demo.response_for_intent(intent)))
+                continue
+
+            turn.transcript = text
+            turn.response = self.demo.get_response(text)
+            turn.mark("routed")
+            print(f"\nYou said: {text}")
+            print(f"💭 Caroline: {turn.response}\n")
+            await out.put(turn)
+
+    # -- tts ----------------------------------------------------------------
+
+    async def _tts(self, inp: asyncio.Queue, out: asyncio.Queue):
+        while True:
+            turn = await inp.get()
+            for piece in self.demo.speech_segments(turn.response):
+                if turn.interrupted:
+                    break
+                path = await asyncio.to_thread(self.demo._audio_for, piece, False)
+                turn.mark("first_audio")
+                await out.put((turn, path))
+            await out.put((turn, None))
+
+    # -- playback -----------------------------------------------------------
+
+    async def _playback(self, inp: asyncio.Queue):
+        while True:
+            turn, path = await inp.get()
+            if path is None:
+                turn.mark("playback_end")
+                self._finish_turn(turn)
+                continue
+            if turn.interrupted:
+                continue
+            turn.mark("playback_start")
+            handle = self.demo.player.play(path)
+            turn.audio.append(path)
+            await asyncio.to_thread(handle.wait)
+
+    def _finish_turn(self, turn: Turn):
+        self.demo.log_turn({
+            "timestamp": datetime.now().isoformat(),
+            "user": turn.transcript,
+            "caroline": turn.response,
+            "response_audio": turn.audio,
+            "timings": turn.timings(),
+        })
+        timings = turn.timings()
+        breakdown = "  ".join(f"{label} {seconds:.2f}s" for label, seconds in timings.items())
+        early = f"  (early route: {turn.early_intent})" if turn.early_intent else ""
+        flag = "  [interrupted]" if turn.interrupted else ""
+        print(f"⏱️ Turn {turn.number}: {breakdown}{early}{flag}")
+
+        words = set(TOKEN_PATTERN.findall(turn.transcript.lower()))
+        done_turns = sum(1 for t in self.turns if "playback_end" in t.marks)
+        if words & EXIT_WORDS or (self.max_turns and done_turns >= self.max_turns):
+            self.stop()
+
+    # -- reporting ----------------------------------------------------------
+
+    def print_summary(self):
+        """Print median and worst latency for every stage over the session."""
+        finished = [turn.timings() for turn in self.turns if "playback_end" in turn.marks]
+        if not finished:
+            return
+        print("\n📊 Pipeline latency over", len(finished), "turns")
+        print(f"{'stage':<14}{'median':>10}{'max':>10}")
+        for label, _, _ in STAGE_SPANS:
+            values = [timings[label] for timings in finished if label in timings]
+            if values:
+                print(f"{label:<14}{statistics.median(values):>9.2f}s{max(values):>9.2f}s")